@@ -1,10 +1,216 @@
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import master_scraper
-import subprocess
+from utils.result_cache import ScrapeCache
+from utils.event_store import event_key
+from utils.dedupe import dedupe_events
+from utils.event_index import EventIndex, SORT_FIELDS, STATUSES
+from utils.enrichment import DetailFetchError, apply_details, missing_fields
+from utils.scheduler import SourceScheduler
+from utils.jobs import JobManager, QueueFull
+from utils.work_queue import QueuedScraper, SQLiteWorkQueue
+from utils.serialization import ENCODINGS, compress, dumps, loads, msgpack, packb
+from utils.instrumentation import configure_logging, get_logger, METRICS, DRIVER_POOL_DRIVERS, HTTP_REQUEST_SECONDS, SCRAPE_JOBS, WORK_QUEUE_TASKS
+from datetime import datetime, timezone
+import atexit
+import concurrent.futures
+import hashlib
 import os
-import json
+import time
+
+configure_logging()
+log = get_logger(__name__)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() through utils.serialization: orjson when installed, and EventRecords serialise directly."""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        return self._app.response_class(dumps(self._prepare_response_obj(args, kwargs)) + b"\n", mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+
+COMPRESS_MIN_BYTES = int(os.environ.get("SCRAPER_COMPRESS_MIN_BYTES", 1024))
+
+if os.environ.get("SCRAPER_WARM_POOL"):
+    master_scraper.DRIVER_POOL.warm_up()
+
+event_index = EventIndex()
+
+SOURCE_COSTS = {spec.name: spec.cost(master_scraper.USE_DIRECT_FETCH) for spec in master_scraper.REGISTRY}
+
+WORK_QUEUE_PATH = os.environ.get("SCRAPER_WORK_QUEUE")
+if WORK_QUEUE_PATH:
+    # Scrapes run in `python -m worker` processes; this process only enqueues tasks and reads their results.
+    work_queue = SQLiteWorkQueue(
+        WORK_QUEUE_PATH,
+        max_attempts=int(os.environ.get("SCRAPER_WORK_QUEUE_ATTEMPTS", 3)),
+        result_ttl=int(os.environ.get("SCRAPER_WORK_QUEUE_TTL", 3600)),
+    )
+    run_scrape = QueuedScraper(work_queue, master_scraper.SOURCE_NAMES, priorities=SOURCE_COSTS,
+                               timeout=int(os.environ.get("SCRAPER_WORK_QUEUE_TIMEOUT", 600))).runscraper
+else:
+    work_queue = None
+    run_scrape = master_scraper.runscraper
+
+scrape_cache = ScrapeCache(
+    lambda source_name: run_scrape(sources=[source_name]),
+    master_scraper.SOURCE_NAMES,
+    combine=dedupe_events if os.environ.get("SCRAPER_DEDUPE", "1") != "0" else None,
+    on_update=event_index.update, # every landed scrape re-indexes just that source
+    default_ttl=int(os.environ.get("SCRAPER_CACHE_TTL", 600)),
+    stale_ttl=int(os.environ.get("SCRAPER_CACHE_STALE_TTL", 3600)),
+    retry_after=int(os.environ.get("SCRAPER_CACHE_RETRY_AFTER", 60)),
+    ttls={
+        name: int(os.environ[f"SCRAPER_CACHE_TTL_{name.upper()}"])
+        for name in master_scraper.SOURCE_NAMES
+        if f"SCRAPER_CACHE_TTL_{name.upper()}" in os.environ
+    },
+)
+
+SNAPSHOT_PATH = os.environ.get("SCRAPER_SNAPSHOT_PATH")
+if SNAPSHOT_PATH:
+    log.info("Loaded %d cached sources from %s", scrape_cache.load_snapshot(SNAPSHOT_PATH), SNAPSHOT_PATH)
+
+def refresh_for_scheduler(source_name):
+    scrape_cache.refresh(source_name).wait()
+    return scrape_cache.last_refresh(source_name)
+
+def save_snapshot(source_name):
+    if SNAPSHOT_PATH:
+        scrape_cache.save_snapshot(SNAPSHOT_PATH)
+
+# Refresh a little before the cache TTL runs out so /scrape keeps serving fresh entries.
+scheduler = SourceScheduler(
+    refresh_for_scheduler,
+    master_scraper.SOURCE_NAMES,
+    intervals={
+        name: int(os.environ.get(f"SCRAPER_SCHEDULE_INTERVAL_{name.upper()}",
+                                 os.environ.get("SCRAPER_SCHEDULE_INTERVAL", scrape_cache.ttl_for(name) * 0.9)))
+        for name in master_scraper.SOURCE_NAMES
+    },
+    retry_base=int(os.environ.get("SCRAPER_SCHEDULE_RETRY", 60)),
+    max_backoff=int(os.environ.get("SCRAPER_SCHEDULE_MAX_BACKOFF", 3600)),
+    on_success=save_snapshot,
+    # Cheap HTTP sources refresh first; browser-backed ones queue behind them when slots are limited.
+    costs=SOURCE_COSTS,
+    max_concurrent=int(os.environ.get("SCRAPER_SCHEDULE_CONCURRENCY", 0)) or None,
+)
+atexit.register(scheduler.stop)
+
+scrape_jobs = JobManager(
+    lambda sources, on_event, on_source_done: run_scrape(
+        sources=sources, on_event=on_event, on_source_done=on_source_done),
+    max_workers=int(os.environ.get("SCRAPER_JOB_WORKERS", 2)),
+    max_queue=int(os.environ.get("SCRAPER_JOB_QUEUE", 16)),
+    result_ttl=int(os.environ.get("SCRAPER_JOB_TTL", 900)),
+    max_results=int(os.environ.get("SCRAPER_JOB_MAX_RESULTS", 100)),
+)
+atexit.register(scrape_jobs.shutdown)
+
+@app.before_request
+def start_scheduler():
+    # Started on the first request rather than at import, so the reloader's parent process never scrapes.
+    if os.environ.get("SCRAPER_SCHEDULER", "1") != "0":
+        scheduler.start()
+
+@app.before_request
+def start_request_timer():
+    request.environ['scraper.started'] = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    started = request.environ.get('scraper.started')
+    if started is not None:
+        # Streaming responses are timed to the first byte, not to the end of the stream.
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=request.url_rule.rule if request.url_rule else "unmatched",
+                                     method=request.method, status=response.status_code)
+    return response
+
+@app.after_request
+def compress_response(response):
+    """gzip/br the body when the client accepts it; streams and small or non-2xx bodies are sent as is."""
+    if response.is_streamed or response.direct_passthrough or not 200 <= response.status_code < 300 \
+            or 'Content-Encoding' in response.headers:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if not encoding or response.content_length is None or response.content_length < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def isoformat(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp else None
+
+def parse_iso(value):
+    """ISO 8601 date or timestamp -> aware datetime; times without an offset are read as UTC."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def parse_since(value):
+    """Accept unix seconds or an ISO 8601 timestamp (UTC unless it has an offset)."""
+    try:
+        return float(value)
+    except ValueError:
+        return parse_iso(value).timestamp()
+
+def parse_window_bound(value):
+    """ISO date or timestamp -> ISO 8601 in UTC, comparable with the normalised starts_at/ends_at."""
+    return parse_iso(value).astimezone(timezone.utc).isoformat()
+
+def list_arg(name):
+    return [value.strip() for value in request.args.get(name, '').split(',') if value.strip()]
+
+def requested_sources():
+    names = [name.strip().lower() for name in request.args.get('sources', '').split(',') if name.strip()]
+    return [name for name in master_scraper.SOURCE_NAMES if name.lower() in names] or None
+
+def payload_response(payload):
+    """JSON, or MessagePack when the client prefers application/msgpack and msgpack is installed."""
+    if msgpack is not None and request.accept_mimetypes.best_match(('application/json', 'application/msgpack')) == 'application/msgpack':
+        response = app.response_class(packb(payload), mimetype='application/msgpack')
+    else:
+        response = jsonify(payload)
+    response.vary.add('Accept')
+    return response
+
+def stream_scraped_events(stream_format, max_workers=None):
+    """Scrape live and flush each event as it is parsed, then a summary record per source."""
+    records = master_scraper.stream_scrape(requested_sources(), scrape=run_scrape, max_workers=max_workers)
+    if stream_format == 'sse':
+        body = (b"event: " + record['type'].encode('utf-8') + b"\ndata: " + dumps(record) + b"\n\n" for record in records)
+        mimetype = 'text/event-stream'
+    else:
+        body = (dumps(record) + b"\n" for record in records)
+        mimetype = 'application/x-ndjson'
+    response = app.response_class(stream_with_context(body), mimetype=mimetype)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no" # stop reverse proxies from buffering the stream
+    return response
+
+def event_keys(event):
+    """Store keys of an event, including every listing folded into a merged cross-source event."""
+    if 'source_urls' in event:
+        return {event_key({'source': source, 'url': url}) for source, url in event['source_urls'].items()}
+    return {event_key(event)}
+
+def without_stage_timings(payload):
+    """Drop the per-stage span timings, which are only sent with ?timings=1."""
+    sources = {
+        name: {key: value for key, value in meta.items() if key != 'stages'}
+        for name, meta in payload.get('timings', {}).get('sources', {}).items()
+    }
+    return dict(payload, timings=dict(payload.get('timings', {}), sources=sources))
 
 @app.route('/')
 def home():
@@ -12,23 +218,194 @@ def home():
 
 @app.route('/scrape', methods=['GET'])
 def get_scraped_events():
-    print("Received request for /api/scrape_events")
+    stream_format = request.args.get('stream')
+    if not stream_format and 'text/event-stream' in request.headers.get('Accept', ''):
+        stream_format = 'sse'
+    max_workers = request.args.get('workers', type=int)
+    if 'workers' in request.args and not (max_workers and max_workers >= 1):
+        return jsonify({"error": "Invalid 'workers' value. Use a positive integer."}), 400
+    if stream_format:
+        if stream_format not in ('ndjson', 'sse'):
+            return jsonify({"error": "Invalid 'stream' value. Use 'ndjson' or 'sse'."}), 400
+        return stream_scraped_events(stream_format, max_workers)
+    if max_workers:
+        # Cached reads refresh every source on its own, so there is no multi-source scrape to size.
+        return jsonify({"error": "'workers' only applies to live scrapes; combine it with 'stream'."}), 400
+
     try:
-        print("Calling master_scraper_module.runscraper()...")
-        scrape_results = master_scraper.runscraper()
+        cached = scrape_cache.get(requested_sources(), force_refresh=request.args.get('refresh') == '1',
+                                  combine=request.args.get('dedupe') != '0')
+        scrape_results = cached["payload"]
         
         if scrape_results.get("error"):
-             print(f"Scraping function reported an error: {scrape_results['error']}")
+             log.error("Scraping function reported an error: %s", scrape_results['error'])
              return jsonify(scrape_results), 500 # Internal server error from scraper
 
-        print(f"Successfully scraped {scrape_results['total_events']} events. Sending JSON response.")
-        return jsonify(scrape_results), 200
+        if request.args.get('since'):
+            try:
+                since = parse_since(request.args['since'])
+            except ValueError:
+                return jsonify({"error": "Invalid 'since' value. Use unix seconds or an ISO 8601 timestamp."}), 400
+            changed_keys = master_scraper.event_store().changed_since(since)
+            events = [event for event in scrape_results['events'] if not changed_keys.isdisjoint(event_keys(event))]
+            scrape_results = dict(scrape_results, events=events, total_events=len(events), since=since,
+                                  message=f"Found {len(events)} new or changed events.")
+            if cached["etag"]:
+                cached = dict(cached, etag=hashlib.sha1(f"{cached['etag']}:{since}".encode('utf-8')).hexdigest())
+
+        if cached["etag"] and request.if_none_match.contains_weak(cached["etag"]):
+            response = app.response_class(status=304)
+        else:
+            log.debug("Serving %d events", scrape_results['total_events'])
+            response = payload_response(scrape_results if request.args.get('timings') == '1' else without_stage_timings(scrape_results))
+        if cached["etag"]:
+            response.set_etag(cached["etag"], weak=True) # weak: the same events go out as gzip, br, identity, JSON or MessagePack
+        response.headers["Cache-Control"] = f"public, max-age={cached['max_age']}, stale-while-revalidate={cached['stale_ttl']}"
+        return response
         
     except Exception as e:
-        import traceback
-        print(f"Error during API call to scraper: {str(e)}")
-        traceback.print_exc()
+        log.exception("Error during API call to scraper: %s", e)
         return jsonify({"error": "An internal server error occurred while calling the scraper.", "details": str(e)}), 500
 
+@app.route('/events', methods=['GET'])
+def query_events():
+    sort = request.args.get('sort', 'ends_at')
+    modes = [mode.lower() for mode in list_arg('mode')]
+    statuses = [status.lower() for status in list_arg('status')]
+    if sort.lstrip('-') not in SORT_FIELDS:
+        return jsonify({"error": f"Invalid 'sort' value. Use one of {', '.join(SORT_FIELDS)}, optionally prefixed with '-'."}), 400
+    if not set(modes) <= {'online', 'in-person', 'hybrid'}:
+        return jsonify({"error": "Invalid 'mode' value. Use online, in-person or hybrid."}), 400
+    if not set(statuses) <= set(STATUSES):
+        return jsonify({"error": f"Invalid 'status' value. Use {', '.join(STATUSES)}."}), 400
+    try:
+        limit = int(request.args.get('limit', 50))
+        prize_min, prize_max = (float(request.args[name]) if request.args.get(name) else None for name in ('prize_min', 'prize_max'))
+        date_from, date_to = (parse_window_bound(request.args[name]) if request.args.get(name) else None for name in ('from', 'to'))
+    except ValueError:
+        return jsonify({"error": "Invalid 'limit', 'prize_min', 'prize_max', 'from' or 'to' value."}), 400
+    if not 1 <= limit <= 500:
+        return jsonify({"error": "'limit' must be between 1 and 500."}), 400
+
+    sources = requested_sources()
+    cache_status = scrape_cache.ensure_fresh(sources)
+    etag = hashlib.sha1(f"{event_index.version}:{request.query_string.decode('utf-8', 'replace')}".encode('utf-8')).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    try:
+        result = event_index.query(
+            sources=sources, modes=modes, tags=list_arg('tag'), text=request.args.get('q'), statuses=statuses,
+            prize_min=prize_min, prize_max=prize_max, currency=request.args.get('currency'),
+            date_from=date_from, date_to=date_to, sort=sort.lstrip('-'), descending=sort.startswith('-'),
+            cursor=request.args.get('cursor'), limit=limit, fields=list_arg('fields'),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = payload_response(dict(result, count=len(result['events']), cache=cache_status))
+    response.set_etag(etag, weak=True)
+    return response
+
+def enrich_indexed_event(event_id, event):
+    """Fill the event's placeholder fields from its detail page now; returns (event, enrichment status)."""
+    spec = master_scraper.REGISTRY.get(event['source']) if event.get('source') in master_scraper.REGISTRY else None
+    if not spec or not spec.detail_parser:
+        return event, "unsupported"
+    if not missing_fields(event) or not event.get('url'):
+        return event, "complete"
+    try:
+        fields, outcome = master_scraper.DETAIL_FETCHER.submit(event['url'], spec.detail_parser).result(timeout=30)
+    except (DetailFetchError, concurrent.futures.TimeoutError) as e:
+        log.warning("Enriching %s failed: %s", event['url'], e)
+        return event, "failed"
+    stored = {key: value for key, value in event.items() if key != 'id'}
+    enriched = apply_details(stored, fields)
+    event_index.replace(event_id, enriched)
+    return dict(enriched, id=event_id), outcome
+
+@app.route('/events/<event_id>', methods=['GET'])
+def get_event(event_id):
+    event = event_index.get(event_id)
+    if event is None:
+        return jsonify({"error": "Unknown event id."}), 404
+    if request.args.get('enrich') == '1':
+        event, enrichment = enrich_indexed_event(event_id, event)
+        event = dict(event, enrichment=enrichment)
+    return jsonify(event), 200
+
+@app.route('/scrape/jobs', methods=['POST'])
+def create_scrape_job():
+    body = request.get_json(silent=True) or {}
+    if not isinstance(body, dict):
+        return jsonify({"error": "Expected a JSON object body."}), 400
+    if body.get('sources') is not None and not (
+            isinstance(body['sources'], list) and all(isinstance(name, str) for name in body['sources'])):
+        return jsonify({"error": "Invalid 'sources' value. Use a list of source names."}), 400
+    if body.get('sources'):
+        wanted = {name.lower() for name in body['sources']}
+        sources = [name for name in master_scraper.SOURCE_NAMES if name.lower() in wanted]
+        if not sources:
+            return jsonify({"error": "No known sources requested.", "known_sources": list(master_scraper.SOURCE_NAMES)}), 400
+    else:
+        sources = requested_sources() or list(master_scraper.SOURCE_NAMES)
+
+    try:
+        job, coalesced = scrape_jobs.submit(sources)
+    except QueueFull as e:
+        response = jsonify({"error": "Too many scrape jobs queued; retry later.", "details": str(e)})
+        response.headers["Retry-After"] = "30"
+        return response, 429
+    response = jsonify({"job_id": job.id, "status": job.status, "sources": job.sources, "coalesced": coalesced})
+    response.headers["Location"] = f"/scrape/jobs/{job.id}"
+    return response, 202
+
+@app.route('/scrape/jobs/<job_id>', methods=['GET'])
+def get_scrape_job(job_id):
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+    except ValueError:
+        return jsonify({"error": "Invalid 'offset' value."}), 400
+    job = scrape_jobs.describe(job_id, offset)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job id."}), 404
+    for timestamp in ('created', 'started', 'finished'):
+        job[timestamp] = isoformat(job[timestamp])
+    return jsonify(job), 200
+
+@app.route('/scrape/status', methods=['GET'])
+def get_scrape_status():
+    sources = {}
+    for source_name, entry in scheduler.status().items():
+        sources[source_name] = {
+            "last_success": isoformat(entry.get('last_success')),
+            "last_duration_seconds": entry.get('last_duration'),
+            "event_count": entry.get('event_count'),
+            "next_run": isoformat(entry.get('next_run')),
+            "interval_seconds": entry['interval'],
+            "running": entry['running'],
+            "consecutive_failures": entry['consecutive_failures'],
+            "cost": entry['cost'],
+            "waiting_for_slot": entry['waiting'],
+            "last_error": entry.get('last_error'),
+        }
+    status = {"scheduler_running": scheduler.is_running(), "sources": sources}
+    if work_queue:
+        status["work_queue"] = work_queue.stats()
+    return jsonify(status), 200
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    pool = master_scraper.DRIVER_POOL.stats()
+    for state in ('size', 'created', 'idle'):
+        DRIVER_POOL_DRIVERS.set(pool[state], state=state)
+    for status, count in scrape_jobs.stats().items():
+        SCRAPE_JOBS.set(count, status=status)
+    if work_queue:
+        for status, count in work_queue.stats().items():
+            WORK_QUEUE_TASKS.set(count, status=status)
+    return app.response_class(METRICS.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,159 @@
+"""
+Offline benchmark for the listing-page parsers.
+
+Runs every parser over the synthetic fixtures (100, 1k and 10k cards) and
+reports cards/sec, peak traced memory, blocks kept alive by the returned
+events, and gen-0 garbage collections (a proxy for allocation churn).
+Results can be saved as a baseline and later runs compared against it:
+
+    python benchmarks/bench_parsers.py --save-baseline
+    python benchmarks/bench_parsers.py --threshold 0.15   # exits 1 on a >15% throughput drop
+
+`--backend` picks the BeautifulSoup parsers (bs4), the lxml ones (lxml) or
+both; `--verify` only checks that the two backends return identical events
+for every fixture and exits 1 on any difference.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fast_parsers  # noqa: E402
+import parsers  # noqa: E402
+from make_fixtures import SIZES, load_fixture  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+BACKENDS = {"bs4": parsers.PARSERS, "lxml": fast_parsers.PARSERS}
+
+
+def quiet(parse, html_content):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return parse(html_content)
+
+
+def measure(parse, html_content, min_time=1.0, max_runs=20):
+    """Best-of-N wall time, then one traced run for memory and allocation figures."""
+    quiet(parse, html_content) # warm-up
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_runs and (not timings or time.perf_counter() - started < min_time):
+        run_started = time.perf_counter()
+        events = quiet(parse, html_content)
+        timings.append(time.perf_counter() - run_started)
+
+    gc.collect()
+    collections_before = gc.get_stats()[0]['collections']
+    tracemalloc.start()
+    blocks_before = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    events = quiet(parse, html_content)
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect() # parse trees are cyclic; count only what the returned events keep alive
+    blocks_after = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    collections = gc.get_stats()[0]['collections'] - collections_before
+
+    best = min(timings)
+    return {
+        "cards": len(events),
+        "runs": len(timings),
+        "best_seconds": round(best, 5),
+        "cards_per_sec": round(len(events) / best, 1) if best else None,
+        "peak_memory_kib": round(peak / 1024, 1),
+        "retained_blocks": blocks_after - blocks_before,
+        "gc_gen0_collections": collections,
+    }
+
+
+def run_benchmarks(sizes, sources, backends):
+    results = {}
+    for backend in backends:
+        for source_name in sources:
+            for count in sizes:
+                html_content = load_fixture(source_name.lower(), count)
+                key = f"{backend}/{source_name}/{count}"
+                results[key] = measure(BACKENDS[backend][source_name], html_content)
+                row = results[key]
+                print(f"{key:<21} {row['cards']:>6} cards  {row['cards_per_sec']:>10,.0f} cards/s  "
+                      f"peak {row['peak_memory_kib']:>9,.0f} KiB  retained {row['retained_blocks']:>8,} blocks  "
+                      f"gen0 gc {row['gc_gen0_collections']:>5}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, row in results.items():
+        reference = baseline.get(key)
+        if not reference or not reference.get('cards_per_sec') or not row.get('cards_per_sec'):
+            continue
+        change = row['cards_per_sec'] / reference['cards_per_sec'] - 1
+        marker = "REGRESSION" if change < -threshold else ""
+        print(f"{key:<21} {change:+7.1%} vs baseline {marker}")
+        if change < -threshold:
+            regressions.append(key)
+    return regressions
+
+
+def verify(sizes, sources):
+    """Return the fixtures on which the lxml parsers disagree with the BeautifulSoup ones."""
+    mismatches = []
+    for source_name in sources:
+        for count in sizes:
+            html_content = load_fixture(source_name.lower(), count)
+            expected = quiet(parsers.PARSERS[source_name], html_content)
+            actual = quiet(fast_parsers.PARSERS[source_name], html_content)
+            key = f"{source_name}/{count}"
+            same = expected == actual
+            print(f"{key:<16} {len(expected):>6} events  {'identical' if same else 'MISMATCH'}")
+            if not same:
+                mismatches.append(key)
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark listing-page parsers on recorded fixtures.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--sources', nargs='+', choices=list(parsers.PARSERS), default=list(parsers.PARSERS))
+    parser.add_argument('--backend', choices=[*BACKENDS, 'both'], default='both')
+    parser.add_argument('--verify', action='store_true', help="Only check that both backends return identical events")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Write this run's results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed throughput drop before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.verify:
+        mismatches = verify(args.sizes, args.sources)
+        if mismatches:
+            print(f"lxml output differs from bs4 for: {', '.join(mismatches)}")
+            return 1
+        return 0
+
+    backends = list(BACKENDS) if args.backend == 'both' else [args.backend]
+    results = run_benchmarks(args.sizes, args.sources, backends)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Throughput dropped by more than {args.threshold:.0%} for: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
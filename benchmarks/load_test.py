@@ -0,0 +1,357 @@
+"""
+End-to-end load test of the API against local stand-in sites.
+
+Starts the three stand-in listing sites (fixtures/standin_sites.py), starts
+app.py in a child process pointed at them, and drives the chosen endpoints
+from `--concurrency` client threads. Reports p50/p95/p99 latency,
+requests/sec and status codes, plus the Chrome process count and resident
+memory of the app's process tree, sampled throughout the run:
+
+    python benchmarks/load_test.py --concurrency 4 --requests 40
+    python benchmarks/load_test.py --path '/scrape?sources=devpost,unstop&refresh=1' --latency 200 --challenge-rate 0.1
+    python benchmarks/load_test.py --env SCRAPER_DIRECT_FETCH=0 --env SCRAPER_DRIVER_POOL_SIZE=2
+
+The app runs with the scheduler and detail-page enrichment off (Devfolio's
+synthetic cards link to real subdomains) and a throwaway event store. Results
+can be saved as a baseline and later runs compared against it, like
+bench_parsers.py:
+
+    python benchmarks/load_test.py --save-baseline
+    python benchmarks/load_test.py --threshold 0.2   # exits 1 when p95 or req/s is >20% worse
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'fixtures'))
+
+from standin_sites import site_urls, start_sites  # noqa: E402
+
+try:
+    import psutil
+except ImportError: # optional; /proc is read directly on Linux without it
+    psutil = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'load_baseline.json')
+APP_ENV = {
+    "SCRAPER_SCHEDULER": "0",
+    "SCRAPER_ENRICH_LIMIT": "0",
+    "SCRAPER_LOG_LEVEL": "WARNING",
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values) + 0.5) - 1))]
+
+
+def _proc_tree(root_pid):
+    """(pid, name, rss bytes) of `root_pid` and all its descendants."""
+    if psutil is not None:
+        try:
+            root = psutil.Process(root_pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+        tree = []
+        for process in processes:
+            try:
+                tree.append((process.pid, process.name(), process.memory_info().rss))
+            except psutil.NoSuchProcess:
+                pass
+        return tree
+
+    children = {}
+    names = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The name is in parentheses and may contain spaces; the parent pid is the second field after it.
+        names[int(entry)] = stat[stat.index('(') + 1:stat.rindex(')')]
+        children.setdefault(int(stat[stat.rindex(')') + 2:].split()[1]), []).append(int(entry))
+    tree, pending = [], [root_pid]
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    while pending:
+        pid = pending.pop()
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                rss = int(f.read().split()[1]) * page_size
+        except OSError:
+            continue
+        tree.append((pid, names.get(pid, '?'), rss))
+        pending.extend(children.get(pid, ()))
+    return tree
+
+
+def process_stats(root_pid):
+    tree = _proc_tree(root_pid)
+    chrome = [(name, rss) for _, name, rss in tree if 'chrome' in name.lower() and 'chromedriver' not in name.lower()]
+    return {
+        "processes": len(tree),
+        "chrome_processes": len(chrome),
+        "chromedriver_processes": sum(1 for _, name, _ in tree if 'chromedriver' in name.lower()),
+        "rss_mb": round(sum(rss for _, _, rss in tree) / 1e6, 1),
+        "chrome_rss_mb": round(sum(rss for _, rss in chrome) / 1e6, 1),
+    }
+
+
+class ProcessSampler:
+    """Samples process_stats() on a background thread and keeps the peaks."""
+
+    def __init__(self, pid, interval=0.5):
+        self.pid = pid
+        self.interval = interval
+        self.peak = {}
+        self.last = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="load-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def sample(self):
+        self.last = process_stats(self.pid)
+        for key, value in self.last.items():
+            self.peak[key] = max(self.peak.get(key, 0), value)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def start_app(port, extra_env, work_dir):
+    """Run app.py on `port` with its event store and output (access log included) under `work_dir`."""
+    env = dict(os.environ, **APP_ENV)
+    env["SCRAPER_DB_PATH"] = os.path.join(work_dir, "events.db")
+    env.pop("SCRAPER_SNAPSHOT_PATH", None)
+    env.update(extra_env)
+    with open(os.path.join(work_dir, "app.log"), 'wb') as log_file:
+        return subprocess.Popen(
+            [sys.executable, '-c', f"import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)"],
+            cwd=ROOT, env=env, stdout=log_file, stderr=subprocess.STDOUT,
+        )
+
+
+def wait_until_up(url, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"app exited with status {process.returncode} during startup")
+        try:
+            requests.get(url, timeout=2)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"app did not answer on {url} within {timeout}s")
+
+
+def stop_app(process):
+    # SIGINT rather than SIGTERM so atexit handlers run and the driver pool quits its browsers.
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def drive(base_url, paths, concurrency, total_requests, duration, timeout):
+    """Issue requests from `concurrency` threads; returns (latencies, statuses, errors, wall seconds)."""
+    latencies, statuses, errors = [], {}, []
+    lock = threading.Lock()
+    issued = [0]
+    deadline = time.time() + duration if duration else None
+
+    def next_path():
+        with lock:
+            if (deadline is None and issued[0] >= total_requests) or (deadline is not None and time.time() >= deadline):
+                return None
+            path = paths[issued[0] % len(paths)]
+            issued[0] += 1
+            return path
+
+    def worker():
+        session = requests.Session()
+        while True:
+            path = next_path()
+            if path is None:
+                return
+            started = time.perf_counter()
+            try:
+                response = session.get(base_url + path, timeout=timeout)
+                response.content
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            except requests.RequestException as e:
+                with lock:
+                    errors.append(str(e))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, name=f"load-{index}") for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, errors, time.perf_counter() - started
+
+
+def summarize(latencies, statuses, errors, wall_seconds):
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies) + len(errors),
+        "errors": len(errors),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": round(wall_seconds, 2),
+        "requests_per_sec": round(len(latencies) / wall_seconds, 2) if wall_seconds else None,
+        "latency_ms": {
+            name: round(value * 1000, 1) if value is not None else None
+            for name, value in (("p50", percentile(ordered, 0.50)), ("p95", percentile(ordered, 0.95)),
+                                ("p99", percentile(ordered, 0.99)), ("max", ordered[-1] if ordered else None))
+        },
+    }
+
+
+def compare(result, baseline, threshold):
+    regressions = []
+    checks = (
+        ("p95 latency", result["latency_ms"]["p95"], baseline.get("latency_ms", {}).get("p95"), True),
+        ("requests/sec", result["requests_per_sec"], baseline.get("requests_per_sec"), False),
+    )
+    for name, value, reference, lower_is_better in checks:
+        if not value or not reference:
+            continue
+        change = value / reference - 1
+        worse = change > threshold if lower_is_better else change < -threshold
+        print(f"{name:<13} {change:+7.1%} vs baseline {'REGRESSION' if worse else ''}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API against local stand-in sites.")
+    parser.add_argument('--path', action='append', dest='paths',
+                        help="Endpoint to request (repeatable, used round-robin); default /scrape?refresh=1")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=20, help="Total requests (ignored with --duration)")
+    parser.add_argument('--duration', type=float, help="Run for this many seconds instead of a fixed request count")
+    parser.add_argument('--warmup', type=int, default=1, help="Requests sent (and not measured) before the run")
+    parser.add_argument('--timeout', type=float, default=300, help="Per-request timeout in seconds")
+    parser.add_argument('--cards', type=int, default=200, help="Cards per stand-in listing")
+    parser.add_argument('--batch', type=int, default=24, help="Cards per scroll / Load more on the stand-ins")
+    parser.add_argument('--latency', type=float, default=0, help="Milliseconds the stand-ins add to every response")
+    parser.add_argument('--jitter', type=float, default=0)
+    parser.add_argument('--challenge-rate', type=float, default=0, help="Share of listing requests answered with a bot challenge")
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help="Extra environment for the app")
+    parser.add_argument('--app-url', help="Test an already running app instead (process stats need --app-pid)")
+    parser.add_argument('--app-pid', type=int)
+    parser.add_argument('--sample-interval', type=float, default=0.5)
+    parser.add_argument('--output', help="Also write the results as JSON to this file")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Write this run's results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed p95 / throughput change before failing")
+    args = parser.parse_args()
+    paths = args.paths or ['/scrape?refresh=1']
+
+    servers = start_sites(cards=args.cards, batch=args.batch, latency=args.latency / 1000,
+                          jitter=args.jitter / 1000, challenge_rate=args.challenge_rate)
+    process = sampler = None
+    if args.app_url:
+        base_url, pid = args.app_url.rstrip('/'), args.app_pid
+    else:
+        port = free_port()
+        extra_env = dict(site_urls(servers), **dict(setting.split('=', 1) for setting in args.env))
+        work_dir = tempfile.mkdtemp(prefix="load-test-")
+        process = start_app(port, extra_env, work_dir)
+        base_url, pid = f"http://127.0.0.1:{port}", process.pid
+
+    try:
+        wait_until_up(base_url + '/', process)
+        for index in range(args.warmup):
+            requests.get(base_url + paths[index % len(paths)], timeout=args.timeout)
+        if pid:
+            sampler = ProcessSampler(pid, args.sample_interval)
+            sampler.start()
+        latencies, statuses, errors, wall_seconds = drive(
+            base_url, paths, args.concurrency, args.requests, args.duration, args.timeout)
+        if sampler:
+            sampler.stop()
+    finally:
+        if process is not None:
+            stop_app(process)
+        for server in servers.values():
+            server.shutdown()
+
+    result = summarize(latencies, statuses, errors, wall_seconds)
+    result.update(paths=paths, concurrency=args.concurrency, cards=args.cards, latency=args.latency,
+                  challenge_rate=args.challenge_rate, env=args.env)
+    if sampler:
+        result.update(peak=sampler.peak, final=sampler.last)
+    result["sites"] = {name: server.site.counts for name, server in servers.items()}
+
+    latency = result["latency_ms"]
+    print(f"{result['requests']} requests ({result['errors']} errors, statuses {result['statuses']}) in {result['seconds']}s "
+          f"at concurrency {args.concurrency}: {result['requests_per_sec']} req/s")
+    print(f"latency p50 {latency['p50']} ms  p95 {latency['p95']} ms  p99 {latency['p99']} ms  max {latency['max']} ms")
+    if sampler:
+        peak = sampler.peak
+        print(f"peak: {peak['chrome_processes']} Chrome processes ({peak['chrome_rss_mb']} MB), "
+              f"{peak['processes']} processes and {peak['rss_mb']} MB RSS in the app's tree")
+    print(f"stand-in traffic: {result['sites']}")
+    if errors:
+        print(f"first error: {errors[0]}")
+    if process is not None:
+        print(f"app output: {os.path.join(work_dir, 'app.log')}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(result, baseline, args.threshold)
+    if regressions:
+        print(f"Worse than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Generate the synthetic listing pages used by the parser benchmarks.
+
+The card markup mirrors what the Devfolio, Devpost and Unstop listing pages
+render (the same classes and nesting the parsers select on), repeated with
+varied text up to the requested card count. A few cards per page are
+deliberately malformed (duplicates, missing titles or sections, alternative
+id formats) so the fixtures also exercise the parsers' skip paths. Output is
+deterministic, so the
+checked-in fixtures can be regenerated byte for byte:
+
+    python benchmarks/make_fixtures.py
+"""
+import argparse
+import gzip
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SIZES = (100, 1000, 10000)
+
+WORDS = ("Hack", "Build", "Code", "Quantum", "Green", "Open", "Health", "Fin", "Edu", "Civic", "Climate", "AI", "Web3", "Space")
+THEMES = ("Machine Learning/AI", "Web", "Beginner Friendly", "Social Good", "Blockchain", "Health", "Education", "Fintech")
+PAGE = '<!DOCTYPE html><html><head><title>{title}</title></head><body><div id="root">{body}</div></body></html>'
+
+
+def _title(rng, i):
+    return f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+
+
+def devfolio_cards(count, rng):
+    cards = []
+    for i in range(count):
+        statuses = ''.join(
+            f'<p class="sc-hKgILt ifkmYk">{text}</p>'
+            for text in rng.sample(("Online", "Offline", "Open", "Starts 12/11/26", "  Applications   open  "), 2)
+        )
+        href = f"https://hack-{i - 1 if i % 97 == 96 else i}.devfolio.co/" # every 97th card repeats a URL
+        title = '' if i % 89 == 88 else f'<h3 class="sc-fubCzh">  {_title(rng, i)} </h3>'
+        card_class = 'sc-bdnxRM' if i % 53 == 52 else f'CompactHackathonCard__Card-sc-{i % 7}f3a sc-bdnxRM'
+        cards.append(
+            f'<div class="{card_class}">'
+            f'<div class="sc-gtsrHT"><a class="sc-dlnjwi bnxtME" href="{href}">{title}</a>'
+            f'<div class="sc-jSgupP">{statuses}</div></div></div>'
+        )
+    return cards
+
+
+def devpost_cards(count, rng):
+    tiles = []
+    for i in range(count):
+        online = rng.random() < 0.6
+        icon = 'fas fa-globe' if online else 'fas fa-map-marker-alt'
+        location = 'Online' if online else rng.choice(("Bengaluru, India", "Berlin, Germany", "Austin, TX"))
+        themes = ''.join(f'<span class="theme-label mr-2 mb-2" title="{t}">{t}</span>' for t in rng.sample(THEMES, 3))
+        if i % 83 == 82: # tile without side info and with a hybrid location icon
+            tiles.append(
+                f'<div class="hackathon-tile clearfix open mb-5"><a class="flex-row tile-anchor" href="/hack-{i}">'
+                f'<div class="flex-row main-content"><div class="content"><h3 class="mb-4">{_title(rng, i)}</h3>'
+                f'<div class="flex-row"><div class="info-with-icon"><i class="fas fa-building"></i><span>Hybrid</span></div></div>'
+                f'</div></div></a></div>'
+            )
+            continue
+        if i % 73 == 72: # tile without a tile-anchor link (e.g. a sponsored slot)
+            tiles.append('<div class="hackathon-tile"><div class="sponsored">Sponsored</div></div>')
+            continue
+        if i % 79 == 78: # tile whose title is missing
+            tiles.append(f'<div class="hackathon-tile"><a class="tile-anchor" href="/untitled-{i}"><div class="main-content">'
+                         f'<div class="content"><h3 class="mt-2"></h3></div></div></a></div>')
+            continue
+        tiles.append(
+            f'<div class="hackathon-tile clearfix open mb-5">'
+            f'<a class="flex-row tile-anchor" href="https://hack-{i}.devpost.com/?ref_feature=challenge&amp;ref_medium=discover">'
+            f'<div class="flex-row main-content"><div class="hackathon-thumbnail"><img src="/thumb/{i}.png"></div>'
+            f'<div class="content"><h3 class="mb-4">{_title(rng, i)}</h3>'
+            f'<div class="flex-row"><div class="status-label open">{rng.randint(1, 40)} days left</div>'
+            f'<div class="info-with-icon"><i class="{icon}"></i><div class="info"><span>{location}</span></div></div></div>'
+            f'<div class="prizes-and-participants"><div class="prize"><span class="prize-amount">$<span data-currency-value>'
+            f'{rng.randint(1, 200) * 500:,}</span></span> in prizes</div>'
+            f'<div class="participants"><strong>{rng.randint(10, 9000):,}</strong> participants</div></div></div></div>'
+            f'<div class="side-info"><span class="host-label" title="Host Org {i}">Host Org {i}</span>'
+            f'<div class="submission-period">Oct {rng.randint(1, 28):02d} - Nov {rng.randint(1, 28):02d}, 2026</div>'
+            f'<div class="themes">{themes}</div></div></a></div>'
+        )
+    return tiles
+
+
+def unstop_cards(count, rng):
+    listings = []
+    for i in range(count):
+        comp_id = 1000000 + i
+        chips = ''.join(f'<span class="chip_text">{t}</span>' for t in rng.sample(THEMES, 2))
+        if i % 71 == 70: # id only available through the opp_<id> class, and no detail boxes
+            listings.append(
+                f'<app-competition-listing><div class="single_profile opp_{comp_id}"><div class="content">'
+                f'<h2 class="double-wrap">{_title(rng, i)}</h2><p>  Org   {i} </p></div></div></app-competition-listing>'
+            )
+            continue
+        listings.append(
+            f'<app-competition-listing><div id="i_{comp_id}_1" class="single_profile opp_{comp_id} cursor-pointer">'
+            f'<div class="content"><h2 class="double-wrap">{_title(rng, i)}</h2><p>College {i}, India</p>'
+            f'<div class="other_fields">'
+            f'<div class="seperate_box prize"><img alt="Prize money"> 🏆 ₹{rng.randint(1, 100) * 1000:,} </div>'
+            f'<div class="seperate_box"><img alt="group">{rng.randint(1, 5000):,} Registered</div>'
+            f'<div class="seperate_box"><img alt="schedule">{rng.randint(1, 30)} days left</div>'
+            f'</div><div class="skills"><un-chip-items>{chips}</un-chip-items></div></div></div></app-competition-listing>'
+        )
+    return listings
+
+
+# source -> (card generator, page title, element the cards sit in)
+LAYOUTS = {
+    "devfolio": (devfolio_cards, "Hackathons | Devfolio", ''),
+    "devpost": (devpost_cards, "Hackathons | Devpost", 'div class="challenge-results"'),
+    "unstop": (unstop_cards, "Hackathons | Unstop", 'div class="user_list"'),
+}
+
+
+def listing_page(source, count, rng):
+    generate, title, container = LAYOUTS[source]
+    cards = ''.join(generate(count, rng))
+    return PAGE.format(title=title, body=f'<{container}>{cards}</{container.split()[0]}>' if container else cards)
+
+
+def fixture_path(source, count):
+    return os.path.join(FIXTURE_DIR, f"{source}_{count}.html.gz")
+
+
+def load_fixture(source, count):
+    with gzip.open(fixture_path(source, count), 'rt', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_fixtures(sizes=SIZES):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for source in LAYOUTS:
+        for count in sizes:
+            html = listing_page(source, count, random.Random(f"{source}-{count}"))
+            # mtime=0 keeps the gzip header, and so the checked-in file, reproducible.
+            with open(fixture_path(source, count), 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+                f.write(html.encode('utf-8'))
+            print(f"Wrote {fixture_path(source, count)} ({len(html) / 1024:.0f} KiB uncompressed)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate synthetic listing-page fixtures.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    write_fixtures(parser.parse_args().sizes)
@@ -0,0 +1,303 @@
+"""
+In-browser listing extraction.
+
+Instead of pulling the whole serialised DOM over the WebDriver wire with
+`page_source` and parsing it again in Python, one injected script walks the
+listing cards inside the page and returns only the raw field values as a
+compact JSON string. The `build_*` functions then turn those rows into the
+same event dicts the HTML parsers produce (same cleaning, placeholders,
+de-duplication and drop reasons).
+
+The scripts only use DOM calls with direct XPath equivalents in
+fast_parsers.py (tag + class lookups in document order, direct children,
+ancestor checks) and read text the way `fast_parsers._text` does, skipping
+text directly inside script/style/template. SCRAPER_VERIFY_EXTRACTION=1
+also parses page_source and reports any difference.
+"""
+import re
+from collections import Counter
+from urllib.parse import urljoin
+
+from utils.cleaner import clean_text
+from utils.instrumentation import get_logger, record_parse
+from utils.serialization import loads
+
+log = get_logger(__name__)
+
+# Shared helpers, prepended to every extraction script.
+_PRELUDE = r"""
+const SKIP_TEXT = {SCRIPT: true, STYLE: true, TEMPLATE: true};
+function rawText(el) {
+  let out = '';
+  for (const node of el.childNodes) {
+    if (node.nodeType === 3) { if (!SKIP_TEXT[el.tagName]) out += node.nodeValue; }
+    else if (node.nodeType === 1) out += rawText(node);
+  }
+  return out;
+}
+// Collapsing ASCII whitespace runs is safe (clean_text splits on all whitespace) and keeps the payload small.
+function text(el) { return rawText(el).replace(/[ \t\n\r\f]+/g, ' '); }
+function first(el, tag, cls) {
+  if (!el) return null;
+  for (const found of el.getElementsByTagName(tag)) {
+    if (!cls || found.classList.contains(cls)) return found;
+  }
+  return null;
+}
+function all(el, tag, cls) {
+  return Array.prototype.filter.call(el.getElementsByTagName(tag), found => found.classList.contains(cls));
+}
+function hasAncestor(el, tagName) {
+  for (let parent = el.parentElement; parent; parent = parent.parentElement) {
+    if (parent.tagName === tagName) return true;
+  }
+  return false;
+}
+function textOf(el) { return el ? text(el) : null; }
+"""
+
+# Row: [href, title text | null, [status texts]] or null when the link has no card container.
+DEVFOLIO_SCRIPT = _PRELUDE + r"""
+const PREFIXES = ['CompactHackathonCard__Card-sc-', 'sc-'];
+function card(link) {
+  for (const prefix of PREFIXES) {
+    for (let parent = link.parentElement; parent; parent = parent.parentElement) {
+      if (parent.tagName === 'DIV' && Array.prototype.some.call(parent.classList, cls => cls.startsWith(prefix))) return parent;
+    }
+  }
+  return null;
+}
+return JSON.stringify(all(document, 'a', 'bnxtME').map(link => {
+  const container = card(link);
+  if (!container) return null;
+  return [link.getAttribute('href'), textOf(first(link, 'h3')), all(container, 'p', 'ifkmYk').map(text)];
+}));
+"""
+
+# Row: [href | null, body, side]. body is null without div.main-content > div.content, else [title, info, prizes]:
+# info = [status, location] | null, location = [span text, icon classes] | null, prizes = [prize, participants] | null.
+# side = [host title attr, host text, host found, period, [theme titles]] | null.
+DEVPOST_SCRIPT = _PRELUDE + r"""
+return JSON.stringify(all(document, 'div', 'hackathon-tile').map(tile => {
+  const anchor = first(tile, 'a', 'tile-anchor');
+  if (!anchor) return [null, null, null];
+  const href = anchor.getAttribute('href');
+  const content = first(first(anchor, 'div', 'main-content'), 'div', 'content');
+  let body = null;
+  if (content) {
+    const info = first(content, 'div', 'flex-row');
+    let infoRow = null;
+    if (info) {
+      const place = first(info, 'div', 'info-with-icon');
+      const icon = first(place, 'i'), span = first(place, 'span');
+      infoRow = [textOf(first(info, 'div', 'status-label')), icon && span ? [text(span), Array.from(icon.classList)] : null];
+    }
+    const pnp = first(content, 'div', 'prizes-and-participants');
+    body = [textOf(first(content, 'h3', 'mb-4')), infoRow,
+            pnp ? [textOf(first(pnp, 'span', 'prize-amount')), textOf(first(first(pnp, 'div', 'participants'), 'strong'))] : null];
+  }
+  const side = first(anchor, 'div', 'side-info');
+  let sideRow = null;
+  if (side) {
+    const host = first(side, 'span', 'host-label');
+    sideRow = [host ? host.getAttribute('title') : null, textOf(host), !!host, textOf(first(side, 'div', 'submission-period')),
+               all(side, 'span', 'theme-label').map(tag => tag.getAttribute('title')).filter(title => title !== null)];
+  }
+  return [href, body, sideRow];
+}));
+"""
+
+# Row: [id attr, [classes], body] with body null without div.content, else
+# [title | null, org | null, boxes | null, chips | null]; box = [text, [classes], img alt | ''].
+UNSTOP_SCRIPT = _PRELUDE + r"""
+return JSON.stringify(all(document, 'div', 'single_profile').filter(div => hasAncestor(div, 'APP-COMPETITION-LISTING')).map(profile => {
+  const content = first(profile, 'div', 'content');
+  let body = null;
+  if (content) {
+    const other = first(content, 'div', 'other_fields');
+    const skills = first(content, 'div', 'skills');
+    body = [
+      textOf(first(content, 'h2', 'double-wrap')),
+      textOf(first(content, 'p')),
+      other ? Array.prototype.filter.call(other.children, box => box.tagName === 'DIV' && box.classList.contains('seperate_box'))
+        .map(box => { const img = first(box, 'img'); return [text(box), Array.from(box.classList), img && img.getAttribute('alt') !== null ? img.getAttribute('alt') : '']; })
+        : null,
+      skills ? all(skills, 'span', 'chip_text').filter(chip => hasAncestor(chip, 'UN-CHIP-ITEMS')).map(text) : null,
+    ];
+  }
+  return [profile.getAttribute('id') || '', Array.from(profile.classList), body];
+}));
+"""
+
+
+def build_devfolio(rows, base_url="https://devfolio.co/", on_event=None):
+    all_hackathons = []
+    processed_urls = set()
+    dropped = Counter()
+    errors = 0
+
+    for row in rows:
+        if row is None: dropped['no_card'] += 1; continue
+        event_data = {'source': 'Devfolio'}
+        try:
+            raw_url, title, statuses = row
+            if not raw_url: dropped['no_url'] += 1; continue
+            event_data['url'] = urljoin(base_url, raw_url)
+            if event_data['url'] in processed_urls: dropped['duplicate'] += 1; continue
+            processed_urls.add(event_data['url'])
+
+            event_data['title'] = clean_text(title) if title is not None else 'N/A'
+            if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+            statuses = [status for status in (clean_text(text) for text in statuses) if status]
+            event_data['status_mode'] = ', '.join(statuses) if statuses else 'N/A'
+            event_data['prize_info'] = 'N/A (Details on event page)'
+            event_data['participants_count'] = 'N/A (Details on event page)'
+            event_data['host_name'] = 'N/A (Details on event page)'
+            event_data['dates'] = 'N/A (Details on event page)'
+            event_data['themes_tags'] = 'N/A (Details on event page)'
+            event_data['location_mode'] = 'Online/Offline (Check Status/Mode)'
+
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Devfolio card (URL: %s): %s", event_data.get('url', 'Unknown'), e)
+    record_parse('Devfolio', len(rows), dropped, errors)
+    return all_hackathons
+
+
+def build_devpost(rows, base_url="https://devpost.com/", on_event=None):
+    all_hackathons = []
+    processed_urls = set()
+    dropped = Counter()
+    errors = 0
+
+    for row in rows:
+        event_data = {'source': 'Devpost'}
+        try:
+            href, body, side = row
+            if href is None: dropped['no_url'] += 1; continue
+            event_data['url'] = urljoin(base_url, href.split('?')[0])
+            if event_data['url'] in processed_urls: dropped['duplicate'] += 1; continue
+            processed_urls.add(event_data['url'])
+
+            event_data.update({field: 'N/A' for field in (
+                'title', 'status_label', 'location_mode', 'prize_info', 'participants_count', 'host_name', 'dates', 'themes_tags')})
+            if body is not None:
+                title, info, prizes = body
+                event_data['title'] = clean_text(title) if title is not None else 'N/A'
+                if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+                if info is not None:
+                    status, location = info
+                    event_data['status_label'] = clean_text(status) if status is not None else 'N/A'
+                    location_text = mode_text = 'N/A'
+                    if location is not None:
+                        location_text = clean_text(location[0])
+                        icon_classes = location[1]
+                        mode_text = 'Online' if 'fa-globe' in icon_classes else \
+                                    ('In-Person' if 'fa-map-marker-alt' in icon_classes else 'Hybrid/Unknown')
+                    event_data['location_mode'] = f"{mode_text} - {location_text}" if location_text != 'N/A' else mode_text
+
+                if prizes is not None:
+                    prize, participants = prizes
+                    event_data['prize_info'] = clean_text(prize) if prize is not None else 'N/A'
+                    event_data['participants_count'] = clean_text(participants) if participants is not None else 'N/A'
+
+            if side is not None:
+                host_title, host_text, host_found, period, themes = side
+                if not host_found:
+                    event_data['host_name'] = 'N/A'
+                elif host_title is not None:
+                    event_data['host_name'] = clean_text(host_title)
+                else:
+                    event_data['host_name'] = clean_text(host_text)
+                event_data['dates'] = clean_text(period) if period is not None else 'N/A'
+                themes_list = [clean_text(theme) for theme in themes]
+                event_data['themes_tags'] = ', '.join(themes_list) if themes_list else 'N/A'
+
+            event_data['status_mode'] = f"{event_data['status_label']} ({event_data['location_mode']})"
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Devpost tile (URL: %s): %s", event_data.get('url', 'Unknown'), e)
+    record_parse('Devpost', len(rows), dropped, errors)
+    return all_hackathons
+
+
+UNSTOP_ID_RE = re.compile(r'i_(\d+)_')
+UNSTOP_TROPHY_RE = re.compile(r'^\s*🏆\s*')
+UNSTOP_REGISTERED_RE = re.compile(r'([\d,]+)\s+Registered')
+
+
+def build_unstop(rows, base_url="https://unstop.com/", on_event=None):
+    all_hackathons = []
+    processed_ids = set()
+    dropped = Counter()
+    errors = 0
+
+    for row in rows:
+        event_data = {'source': 'Unstop'}
+        try:
+            element_id, classes, body = row
+            comp_id = None
+            comp_id_match = UNSTOP_ID_RE.search(element_id)
+            if comp_id_match: comp_id = comp_id_match.group(1)
+            else:
+                for cls in classes:
+                    if cls.startswith('opp_') and cls.split('_')[-1].isdigit():
+                        comp_id = cls.split('_')[-1]; break
+            if not comp_id or comp_id in processed_ids: dropped['duplicate' if comp_id else 'no_id'] += 1; continue
+            processed_ids.add(comp_id)
+            event_data['url'] = urljoin(base_url, f"o/{comp_id}")
+
+            if body is None: dropped['no_content'] += 1; continue
+            title, org, boxes, chips = body
+            event_data['title'] = clean_text(title) if title is not None else 'N/A'
+            if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+            event_data['host_name'] = clean_text(org) if org is not None else 'N/A'
+
+            event_data['prize_info'] = 'N/A'
+            event_data['participants_count'] = 'N/A'
+            event_data['dates'] = 'N/A'
+            event_data['themes_tags'] = 'N/A'
+            event_data['status_mode'] = 'Online (typically)' # Unstop is mostly online
+            event_data['location_mode'] = 'Online (typically)'
+
+            for raw_text, box_classes, img_alt in boxes or ():
+                box_text = clean_text(raw_text)
+                if not box_text: continue
+                if 'prize' in box_classes or 'Prize money' in img_alt:
+                    prize_text_cleaned = UNSTOP_TROPHY_RE.sub('', box_text).strip()
+                    event_data['prize_info'] = prize_text_cleaned if prize_text_cleaned else box_text
+                elif img_alt == 'group' or 'Registered' in box_text:
+                    match = UNSTOP_REGISTERED_RE.search(box_text)
+                    event_data['participants_count'] = match.group(1).replace(',', '') if match else box_text
+                elif img_alt == 'schedule' or any(k in box_text for k in ('ago', 'left', 'day')):
+                    event_data['dates'] = box_text # This is "time left" or similar
+
+            if chips:
+                event_data['themes_tags'] = ', '.join(clean_text(chip) for chip in chips)
+
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Unstop listing (ID: %s): %s", event_data.get('url', 'Unknown').split('/')[-1], e)
+    record_parse('Unstop', len(rows), dropped, errors)
+    return all_hackathons
+
+
+EXTRACTORS = {
+    "Devfolio": (DEVFOLIO_SCRIPT, build_devfolio),
+    "Devpost": (DEVPOST_SCRIPT, build_devpost),
+    "Unstop": (UNSTOP_SCRIPT, build_unstop),
+}
+
+
+def extract_rows(driver, script):
+    """Run an extraction script; returns (rows, bytes transferred)."""
+    payload = driver.execute_script(script)
+    return loads(payload), len(payload.encode('utf-8'))
@@ -0,0 +1,169 @@
+"""
+Event detail-page parsers, used to fill fields the listing pages leave as placeholders.
+
+Each parser takes the detail page HTML and returns a dict with any of the
+listing fields it could read (`prize_info`, `participants_count`,
+`host_name`, `dates`, `themes_tags`, `location_mode`), formatted the way
+the listing parsers format them so utils.normalize reads both alike.
+Fields it cannot find are simply absent.
+"""
+import json
+from datetime import datetime
+
+from lxml import etree
+
+from utils.cleaner import clean_text
+from utils.instrumentation import get_logger
+
+log = get_logger(__name__)
+
+_HTML_PARSER = etree.HTMLParser()
+JSON_LD_SCRIPTS = etree.XPath("//script[@type='application/ld+json']/text()", smart_strings=False)
+NEXT_DATA_SCRIPT = etree.XPath("//script[@id='__NEXT_DATA__']/text()", smart_strings=False)
+META_CONTENT = etree.XPath("//meta[@property=$name or @name=$name]/@content", smart_strings=False)
+
+
+def _iso_date(value):
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def format_dates(start, end):
+    """ISO timestamps -> 'Oct 01, 2026 - Nov 15, 2026', the listing style utils.normalize parses."""
+    start, end = _iso_date(start), _iso_date(end)
+    if not start or not end:
+        return None
+    return f"{start:%b %d, %Y} - {end:%b %d, %Y}"
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_amount(amount, currency=None):
+    amount = _number(amount)
+    if amount is None:
+        return None
+    text = f"{int(amount):,}" if amount.is_integer() else f"{amount:,.2f}"
+    return f"{text} {currency.upper()}" if currency else text
+
+
+def _json_ld_event(root):
+    for text in JSON_LD_SCRIPTS(root):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            items = data.get('@graph', [data])
+        elif isinstance(data, list):
+            items = data
+        else:
+            continue # a scalar root is not a schema.org document
+        for item in items if isinstance(items, list) else [items]:
+            if isinstance(item, dict) and str(item.get('@type', '')).endswith('Event'):
+                return item
+    return None
+
+
+def _find_hackathon(data):
+    """The first object in a __NEXT_DATA__ tree that looks like a hackathon record."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if 'starts_at' in node and 'ends_at' in node and 'name' in node:
+                return node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
+def _from_json_ld(event):
+    fields = {}
+    organizer = event.get('organizer')
+    if isinstance(organizer, dict) and organizer.get('name'):
+        fields['host_name'] = clean_text(str(organizer['name']))
+    dates = format_dates(event.get('startDate'), event.get('endDate'))
+    if dates:
+        fields['dates'] = dates
+    location = event.get('location')
+    if isinstance(location, dict):
+        if location.get('@type') == 'VirtualLocation':
+            fields['location_mode'] = 'Online'
+        elif location.get('name'):
+            fields['location_mode'] = f"In-Person - {clean_text(str(location['name']))}"
+    # offers.price is the ticket or entry price, not a prize, so it is deliberately not read.
+    return fields
+
+
+def _from_next_data(hackathon):
+    fields = {}
+    dates = format_dates(hackathon.get('starts_at'), hackathon.get('ends_at'))
+    if dates:
+        fields['dates'] = dates
+    prizes = hackathon.get('prizes') if isinstance(hackathon.get('prizes'), list) else []
+    prizes = [prize for prize in prizes if isinstance(prize, dict) and _number(prize.get('amount'))] # skips "TBA" amounts
+    if prizes:
+        total = sum(_number(prize['amount']) for prize in prizes)
+        currency = prizes[0].get('currency')
+        fields['prize_info'] = format_amount(total, currency if isinstance(currency, str) else None)
+    themes = hackathon.get('themes') if isinstance(hackathon.get('themes'), list) else []
+    themes = [(theme['theme'] if isinstance(theme.get('theme'), dict) else theme).get('name')
+              for theme in themes if isinstance(theme, dict)]
+    if any(themes):
+        fields['themes_tags'] = ', '.join(clean_text(str(name)) for name in themes if name)
+    if isinstance(hackathon.get('participants_count'), int):
+        fields['participants_count'] = f"{hackathon['participants_count']:,}"
+    if hackathon.get('is_online') is True:
+        fields['location_mode'] = 'Online'
+    elif hackathon.get('location'):
+        fields['location_mode'] = f"In-Person - {clean_text(str(hackathon['location']))}"
+    setting = hackathon.get('hackathon_setting')
+    organizer = hackathon.get('organizer') or (setting.get('organizer_name') if isinstance(setting, dict) else None)
+    if isinstance(organizer, dict):
+        organizer = organizer.get('name')
+    if organizer:
+        fields['host_name'] = clean_text(str(organizer))
+    return fields
+
+
+def parse_devfolio_detail(html_content):
+    """
+    Devfolio hackathon pages are rendered by Next.js: the page's
+    __NEXT_DATA__ JSON carries the hackathon record, and a schema.org Event
+    (JSON-LD) is used for anything it lacks.
+    """
+    if not html_content:
+        return {}
+    root = etree.fromstring(html_content, _HTML_PARSER)
+    if root is None:
+        return {}
+    fields = {}
+    event = _json_ld_event(root)
+    if event:
+        fields.update(_from_json_ld(event))
+    for text in NEXT_DATA_SCRIPT(root):
+        try:
+            hackathon = _find_hackathon(json.loads(text))
+        except ValueError as e:
+            log.debug("Unreadable __NEXT_DATA__ on Devfolio page: %s", e)
+            continue
+        if hackathon:
+            fields.update(_from_next_data(hackathon))
+    if 'host_name' not in fields:
+        site_name = META_CONTENT(root, name='og:site_name')
+        if site_name and clean_text(site_name[0]) not in ('', 'Devfolio'):
+            fields['host_name'] = clean_text(site_name[0])
+    return {field: value for field, value in fields.items() if value}
+
+
+DETAIL_PARSERS = {
+    "Devfolio": parse_devfolio_detail,
+}
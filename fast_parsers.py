@@ -0,0 +1,316 @@
+"""
+lxml-based listing-page parsers.
+
+Drop-in replacements for the BeautifulSoup parsers in parsers.py: same
+signature, same event dicts (verified against the benchmark fixtures with
+`python benchmarks/bench_parsers.py --verify`). All selectors and regexes are
+compiled once at import, and each card is read with XPath lookups scoped to
+that card's subtree instead of generic tree searches.
+"""
+import re
+from collections import Counter
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from utils.cleaner import clean_text
+from utils.instrumentation import get_logger, record_parse
+
+log = get_logger(__name__)
+
+_HTML_PARSER = etree.HTMLParser()
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _first(expression):
+    """Compile `descendant::<expression>[1]` and return a lookup giving the first match or None."""
+    compiled = etree.XPath(f"descendant::{expression}[1]")
+
+    def find(element):
+        found = compiled(element)
+        return found[0] if found else None
+    return find
+
+
+# BeautifulSoup's get_text() skips script/style/template strings; keep that behaviour.
+_TEXT_NODES = etree.XPath(".//text()[not(parent::script or parent::style or parent::template)]", smart_strings=False)
+
+
+def _text(element):
+    return ''.join(_TEXT_NODES(element))
+
+
+def _classes(element):
+    return (element.get('class') or '').split()
+
+
+def _parse(html_content):
+    if not html_content:
+        return None
+    return etree.fromstring(html_content, _HTML_PARSER)
+
+
+DEVFOLIO_LINKS = etree.XPath(f"//a[{_has_class('bnxtME')}]")
+DEVFOLIO_STATUS_TAGS = etree.XPath(f"descendant::p[{_has_class('ifkmYk')}]")
+DEVFOLIO_TITLE = _first("h3")
+DEVFOLIO_CARD_PREFIXES = ('CompactHackathonCard__Card-sc-', 'sc-')
+
+
+def _devfolio_card(link_tag):
+    for prefix in DEVFOLIO_CARD_PREFIXES:
+        for ancestor in link_tag.iterancestors('div'):
+            if any(cls.startswith(prefix) for cls in _classes(ancestor)):
+                return ancestor
+    return None
+
+
+def parse_devfolio(html_content, base_url="https://devfolio.co/", on_event=None):
+    """Extract Devfolio events from a fully loaded listing page's HTML."""
+    all_hackathons = []
+    processed_urls = set()
+    root = _parse(html_content)
+    hackathon_links = DEVFOLIO_LINKS(root) if root is not None else []
+    log.debug("Found %d potential Devfolio listings.", len(hackathon_links))
+    dropped = Counter()
+    errors = 0
+
+    for link_tag in hackathon_links:
+        card = _devfolio_card(link_tag)
+        if card is None: dropped['no_card'] += 1; continue
+
+        event_data = {'source': 'Devfolio'}
+
+        try:
+            raw_url = link_tag.get('href')
+            if not raw_url: dropped['no_url'] += 1; continue
+            event_data['url'] = urljoin(base_url, raw_url)
+            if event_data['url'] in processed_urls: dropped['duplicate'] += 1; continue
+            processed_urls.add(event_data['url'])
+
+            title_tag = DEVFOLIO_TITLE(link_tag)
+            event_data['title'] = clean_text(_text(title_tag)) if title_tag is not None else 'N/A'
+            if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+            statuses = [status for status in (clean_text(_text(tag)) for tag in DEVFOLIO_STATUS_TAGS(card)) if status]
+            event_data['status_mode'] = ', '.join(statuses) if statuses else 'N/A'
+
+            event_data['prize_info'] = 'N/A (Details on event page)'
+            event_data['participants_count'] = 'N/A (Details on event page)'
+            event_data['host_name'] = 'N/A (Details on event page)'
+            event_data['dates'] = 'N/A (Details on event page)'
+            event_data['themes_tags'] = 'N/A (Details on event page)'
+            event_data['location_mode'] = 'Online/Offline (Check Status/Mode)'
+
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Devfolio card (URL: %s): %s", event_data.get('url', 'Unknown'), e)
+    record_parse('Devfolio', len(hackathon_links), dropped, errors)
+    return all_hackathons
+
+
+DEVPOST_TILES = etree.XPath(f"//div[{_has_class('hackathon-tile')}]")
+DEVPOST_ANCHOR = _first(f"a[{_has_class('tile-anchor')}]")
+DEVPOST_MAIN_CONTENT = _first(f"div[{_has_class('main-content')}]")
+DEVPOST_CONTENT = _first(f"div[{_has_class('content')}]")
+DEVPOST_TITLE = _first(f"h3[{_has_class('mb-4')}]")
+DEVPOST_INFO_ROW = _first(f"div[{_has_class('flex-row')}]")
+DEVPOST_STATUS = _first(f"div[{_has_class('status-label')}]")
+DEVPOST_LOCATION = _first(f"div[{_has_class('info-with-icon')}]")
+DEVPOST_ICON = _first("i")
+DEVPOST_SPAN = _first("span")
+DEVPOST_PRIZES_PARTICIPANTS = _first(f"div[{_has_class('prizes-and-participants')}]")
+DEVPOST_PRIZE = _first(f"span[{_has_class('prize-amount')}]")
+DEVPOST_PARTICIPANTS = _first(f"div[{_has_class('participants')}]")
+DEVPOST_STRONG = _first("strong")
+DEVPOST_SIDE_INFO = _first(f"div[{_has_class('side-info')}]")
+DEVPOST_HOST = _first(f"span[{_has_class('host-label')}]")
+DEVPOST_SUBMISSION_PERIOD = _first(f"div[{_has_class('submission-period')}]")
+DEVPOST_THEMES = etree.XPath(f"descendant::span[{_has_class('theme-label')}]")
+
+
+def parse_devpost(html_content, base_url="https://devpost.com/", on_event=None):
+    """Extract Devpost events from a fully loaded listing page's HTML."""
+    all_hackathons = []
+    processed_urls = set()
+    root = _parse(html_content)
+    hackathon_tiles = DEVPOST_TILES(root) if root is not None else []
+    log.debug("Found %d potential Devpost tiles.", len(hackathon_tiles))
+    dropped = Counter()
+    errors = 0
+
+    for tile in hackathon_tiles:
+        event_data = {'source': 'Devpost'}
+
+        try:
+            anchor = DEVPOST_ANCHOR(tile)
+            if anchor is None or anchor.get('href') is None: dropped['no_url'] += 1; continue
+
+            event_data['url'] = urljoin(base_url, anchor.get('href').split('?')[0])
+            if event_data['url'] in processed_urls: dropped['duplicate'] += 1; continue
+            processed_urls.add(event_data['url'])
+
+            event_data['title'] = 'N/A'
+            event_data['status_label'] = 'N/A'
+            event_data['location_mode'] = 'N/A'
+            event_data['prize_info'] = 'N/A'
+            event_data['participants_count'] = 'N/A'
+            event_data['host_name'] = 'N/A'
+            event_data['dates'] = 'N/A'
+            event_data['themes_tags'] = 'N/A'
+
+            main_content = DEVPOST_MAIN_CONTENT(anchor)
+            content_div = DEVPOST_CONTENT(main_content) if main_content is not None else None
+            if content_div is not None:
+                title_tag = DEVPOST_TITLE(content_div)
+                event_data['title'] = clean_text(_text(title_tag)) if title_tag is not None else 'N/A'
+                if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+                info_row = DEVPOST_INFO_ROW(content_div)
+                if info_row is not None:
+                    status_tag = DEVPOST_STATUS(info_row)
+                    event_data['status_label'] = clean_text(_text(status_tag)) if status_tag is not None else 'N/A'
+
+                    location_text = 'N/A'
+                    mode_text = 'N/A'
+                    location_icon_div = DEVPOST_LOCATION(info_row)
+                    if location_icon_div is not None:
+                        icon = DEVPOST_ICON(location_icon_div)
+                        info_span = DEVPOST_SPAN(location_icon_div)
+                        if icon is not None and info_span is not None:
+                            location_text = clean_text(_text(info_span))
+                            icon_classes = _classes(icon)
+                            mode_text = 'Online' if 'fa-globe' in icon_classes else \
+                                        ('In-Person' if 'fa-map-marker-alt' in icon_classes else 'Hybrid/Unknown')
+                    event_data['location_mode'] = f"{mode_text} - {location_text}" if location_text != 'N/A' else mode_text
+
+                pnp_div = DEVPOST_PRIZES_PARTICIPANTS(content_div)
+                if pnp_div is not None:
+                    prize_tag = DEVPOST_PRIZE(pnp_div)
+                    event_data['prize_info'] = clean_text(_text(prize_tag)) if prize_tag is not None else 'N/A'
+                    partic_tag = DEVPOST_PARTICIPANTS(pnp_div)
+                    strong_tag = DEVPOST_STRONG(partic_tag) if partic_tag is not None else None
+                    event_data['participants_count'] = clean_text(_text(strong_tag)) if strong_tag is not None else 'N/A'
+
+            side_info = DEVPOST_SIDE_INFO(anchor)
+            if side_info is not None:
+                host_tag = DEVPOST_HOST(side_info)
+                if host_tag is None:
+                    event_data['host_name'] = 'N/A'
+                elif host_tag.get('title') is not None:
+                    event_data['host_name'] = clean_text(host_tag.get('title'))
+                else:
+                    event_data['host_name'] = clean_text(_text(host_tag))
+                sub_period_tag = DEVPOST_SUBMISSION_PERIOD(side_info)
+                event_data['dates'] = clean_text(_text(sub_period_tag)) if sub_period_tag is not None else 'N/A'
+                themes_list = [clean_text(tag.get('title')) for tag in DEVPOST_THEMES(side_info) if tag.get('title') is not None]
+                event_data['themes_tags'] = ', '.join(themes_list) if themes_list else 'N/A'
+
+            event_data['status_mode'] = f"{event_data['status_label']} ({event_data['location_mode']})"
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Devpost tile (URL: %s): %s", event_data.get('url', 'Unknown'), e)
+    record_parse('Devpost', len(hackathon_tiles), dropped, errors)
+    return all_hackathons
+
+
+# One document scan with an ancestor test; "//app-competition-listing//div" makes libxml2 merge a node set per listing.
+UNSTOP_LISTINGS = etree.XPath(f"//div[{_has_class('single_profile')}][ancestor::app-competition-listing]")
+UNSTOP_CONTENT = _first(f"div[{_has_class('content')}]")
+UNSTOP_TITLE = _first(f"h2[{_has_class('double-wrap')}]")
+UNSTOP_ORG = _first("p")
+UNSTOP_OTHER_FIELDS = _first(f"div[{_has_class('other_fields')}]")
+UNSTOP_BOXES = etree.XPath(f"div[{_has_class('seperate_box')}]")
+UNSTOP_IMG = _first("img")
+UNSTOP_SKILLS = _first(f"div[{_has_class('skills')}]")
+UNSTOP_CHIPS = etree.XPath(f"descendant::span[{_has_class('chip_text')}][ancestor::un-chip-items]")
+UNSTOP_ID_RE = re.compile(r'i_(\d+)_')
+UNSTOP_TROPHY_RE = re.compile(r'^\s*🏆\s*')
+UNSTOP_REGISTERED_RE = re.compile(r'([\d,]+)\s+Registered')
+
+
+def parse_unstop(html_content, base_url="https://unstop.com/", on_event=None):
+    """Extract Unstop events from a fully loaded listing page's HTML."""
+    all_hackathons = []
+    processed_ids = set()
+    root = _parse(html_content)
+    listings = UNSTOP_LISTINGS(root) if root is not None else []
+    log.debug("Found %d potential Unstop listings.", len(listings))
+    dropped = Counter()
+    errors = 0
+
+    for profile_div in listings:
+        event_data = {'source': 'Unstop'}
+
+        try:
+            comp_id = None
+            comp_id_match = UNSTOP_ID_RE.search(profile_div.get('id', ''))
+            if comp_id_match: comp_id = comp_id_match.group(1)
+            else:
+                for cls in _classes(profile_div):
+                    if cls.startswith('opp_') and cls.split('_')[-1].isdigit():
+                        comp_id = cls.split('_')[-1]; break
+            if not comp_id or comp_id in processed_ids: dropped['duplicate' if comp_id else 'no_id'] += 1; continue
+            processed_ids.add(comp_id)
+            event_data['url'] = urljoin(base_url, f"o/{comp_id}")
+
+            content_div = UNSTOP_CONTENT(profile_div)
+            if content_div is None: dropped['no_content'] += 1; continue
+
+            title_tag = UNSTOP_TITLE(content_div)
+            event_data['title'] = clean_text(_text(title_tag)) if title_tag is not None else 'N/A'
+            if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+            org_tag = UNSTOP_ORG(content_div)
+            event_data['host_name'] = clean_text(_text(org_tag)) if org_tag is not None else 'N/A'
+
+            event_data['prize_info'] = 'N/A'
+            event_data['participants_count'] = 'N/A'
+            event_data['dates'] = 'N/A'
+            event_data['themes_tags'] = 'N/A'
+            event_data['status_mode'] = 'Online (typically)' # Unstop is mostly online
+            event_data['location_mode'] = 'Online (typically)'
+
+            other_fields_div = UNSTOP_OTHER_FIELDS(content_div)
+            if other_fields_div is not None:
+                for box in UNSTOP_BOXES(other_fields_div):
+                    box_text = clean_text(_text(box))
+                    if not box_text: continue
+
+                    img = UNSTOP_IMG(box)
+                    img_alt = img.get('alt') if img is not None and img.get('alt') is not None else ''
+
+                    if 'prize' in _classes(box) or 'Prize money' in img_alt:
+                        prize_text_cleaned = UNSTOP_TROPHY_RE.sub('', box_text).strip()
+                        event_data['prize_info'] = prize_text_cleaned if prize_text_cleaned else box_text
+                    elif img_alt == 'group' or 'Registered' in box_text:
+                        match = UNSTOP_REGISTERED_RE.search(box_text)
+                        event_data['participants_count'] = match.group(1).replace(',', '') if match else box_text
+                    elif img_alt == 'schedule' or any(k in box_text for k in ('ago', 'left', 'day')):
+                        event_data['dates'] = box_text # This is "time left" or similar
+
+            skills_div = UNSTOP_SKILLS(content_div)
+            if skills_div is not None:
+                tags_list = [clean_text(_text(tag)) for tag in UNSTOP_CHIPS(skills_div)]
+                if tags_list: event_data['themes_tags'] = ', '.join(tags_list)
+
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Unstop listing (ID: %s): %s", event_data.get('url', 'Unknown').split('/')[-1], e)
+    record_parse('Unstop', len(listings), dropped, errors)
+    return all_hackathons
+
+
+PARSERS = {
+    "Devfolio": parse_devfolio,
+    "Devpost": parse_devpost,
+    "Unstop": parse_unstop,
+}
@@ -0,0 +1,57 @@
+"""
+Local stand-in for the Devpost and Unstop listing APIs, serving the recorded
+JSON pages in fixtures/api/. Point the scraper at it with, for example:
+
+    python fixtures/standin_server.py --port 8765
+    SCRAPER_DEVPOST_URL=http://127.0.0.1:8765/ SCRAPER_UNSTOP_URL=http://127.0.0.1:8765/ python master_scraper.py
+"""
+import argparse
+import os
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api')
+ROUTES = {
+    '/api/hackathons': 'devpost_hackathons_page{page}.json',
+    '/api/public/opportunity/search-result': 'unstop_hackathons_page{page}.json',
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, like the real sites
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        template = ROUTES.get(parsed.path)
+        page = parse_qs(parsed.query).get('page', ['1'])[0]
+        file_path = os.path.join(API_DIR, template.format(page=int(page))) if template and page.isdigit() else None
+
+        if not file_path or not os.path.exists(file_path):
+            self._send(404, b'{"error": "not found"}')
+            return
+        with open(file_path, 'rb') as f:
+            self._send(200, f.read())
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=0):
+    return ThreadingHTTPServer((host, port), StandInHandler)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    server = make_server(args.host, args.port)
+    print(f"Serving recorded listing JSON on http://{args.host}:{server.server_port}/")
+    server.serve_forever()
@@ -0,0 +1,254 @@
+"""
+Local stand-ins for the Devfolio, Devpost and Unstop listing sites, for load
+tests that must not touch the real ones.
+
+Each site runs on its own port (base port + 0/1/2) and serves `/hackathons`
+with the synthetic cards from benchmarks/make_fixtures.py. Only the first
+batch is in the initial HTML; the rest arrives like on the real pages:
+Devfolio and Unstop append the next batch when the page is scrolled to the
+bottom, Devpost when its "Load more" link is clicked. Devpost and Unstop
+also answer their listing APIs (the HTTP fast path in utils/direct_fetch.py)
+from generated records. Every response can be delayed, and a share of
+listing requests can be answered with a Cloudflare-style interstitial:
+
+    python fixtures/standin_sites.py --cards 500 --latency 150 --challenge-rate 0.05
+    SCRAPER_DEVFOLIO_URL=http://127.0.0.1:8770/ SCRAPER_DEVPOST_URL=http://127.0.0.1:8771/ \\
+        SCRAPER_UNSTOP_URL=http://127.0.0.1:8772/ python master_scraper.py
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from make_fixtures import LAYOUTS, PAGE, THEMES, _title  # noqa: E402
+
+SITES = ("devfolio", "devpost", "unstop")
+API_ROUTES = {
+    "devpost": '/api/hackathons',
+    "unstop": '/api/public/opportunity/search-result',
+}
+API_PAGE_SIZES = {"devpost": 9, "unstop": 18}
+
+# Cards have no stylesheet here, so give them some height: the page must be taller than the window to scroll.
+STYLE = '<style>#cards > * { display: block; min-height: 160px; }</style>'
+LOAD_MORE = '<a class="load-more-challenges" href="#">Load more</a>'
+SCRIPT = """<script>
+(function () {
+    var offset = %(shown)d, total = %(total)d, batch = %(batch)d, loading = false;
+    var list = document.getElementById('cards'), more = document.querySelector('a.load-more-challenges');
+    function load() {
+        if (loading || offset >= total) return;
+        loading = true;
+        fetch('/cards?offset=' + offset + '&limit=' + batch).then(function (response) { return response.text(); }).then(function (html) {
+            list.insertAdjacentHTML('beforeend', html);
+            offset += batch;
+            loading = false;
+            if (offset >= total && more) more.remove();
+        }, function () { loading = false; });
+    }
+    if (more) {
+        more.addEventListener('click', function (event) { event.preventDefault(); load(); });
+    } else {
+        window.addEventListener('scroll', function () {
+            if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) load();
+        });
+    }
+})();
+</script>"""
+CHALLENGE_PAGE = (
+    '<!DOCTYPE html><html><head><title>Just a moment...</title></head><body><div id="cf-wrapper">'
+    '<h1>Checking your browser before accessing the site.</h1>'
+    '<p>This process is automatic. Your browser will redirect to your requested content shortly.</p>'
+    '<p>Performance &amp; security by Cloudflare</p></div></body></html>'
+)
+
+
+def devpost_records(count, rng):
+    records = []
+    for i in range(count):
+        online = rng.random() < 0.6
+        records.append({
+            "id": 20000 + i,
+            "title": _title(rng, i),
+            "url": f"https://hack-{i}.devpost.com/?ref_feature=challenge&ref_medium=discover",
+            "displayed_location": {"icon": "globe" if online else "map-marker-alt",
+                                   "location": "Online" if online else rng.choice(("Bengaluru, India", "Austin, TX"))},
+            "open_state": "open",
+            "time_left_to_submission": f"{rng.randint(1, 40)} days left",
+            "submission_period_dates": f"Oct {rng.randint(1, 28):02d} - Nov {rng.randint(1, 28):02d}, 2026",
+            "themes": [{"id": index, "name": name} for index, name in enumerate(rng.sample(THEMES, 2))],
+            "prize_amount": f"$<span data-currency-value>{rng.randint(1, 200) * 500:,}</span>",
+            "registrations_count": rng.randint(10, 9000),
+            "organization_name": f"Host Org {i}",
+        })
+    return records
+
+
+def unstop_records(count, rng):
+    return [{
+        "id": 1000000 + i,
+        "title": _title(rng, i),
+        "organisation": {"name": f"College {i}, India"},
+        "prizes": [{"cash": rng.randint(1, 100) * 1000, "currency": "₹"}],
+        "registerCount": rng.randint(1, 5000),
+        "regnRequirements": {"remain_days": f"{rng.randint(1, 30)} days left"},
+        "required_skills": [{"skill_name": name} for name in rng.sample(THEMES, 2)],
+    } for i in range(count)]
+
+
+RECORD_GENERATORS = {"devpost": devpost_records, "unstop": unstop_records}
+
+
+class StandInSite:
+    """Generated content and behaviour of one stand-in site."""
+
+    def __init__(self, name, cards=200, batch=24, latency=0.0, jitter=0.0, challenge_rate=0.0, seed=0):
+        self.name = name
+        self.batch = batch
+        self.latency = latency
+        self.jitter = jitter
+        self.challenge_rate = challenge_rate
+        generate, self.title, self.container = LAYOUTS[name]
+        self.cards = generate(cards, random.Random(f"{name}-{seed}"))
+        self.records = RECORD_GENERATORS[name](cards, random.Random(f"{name}-api-{seed}")) if name in RECORD_GENERATORS else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {"pages": 0, "batches": 0, "api": 0, "challenges": 0}
+
+    def delay(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                extra = self._rng.uniform(0, self.jitter)
+            time.sleep(self.latency + extra)
+
+    def challenged(self):
+        with self._lock:
+            hit = self._rng.random() < self.challenge_rate
+            if hit:
+                self.counts["challenges"] += 1
+        return hit
+
+    def count(self, kind):
+        with self._lock:
+            self.counts[kind] += 1
+
+    def listing_page(self):
+        shown = self.cards[:self.batch]
+        tag = self.container.split()[0] if self.container else 'div'
+        container = f'<{self.container or "div"} id="cards">{"".join(shown)}</{tag}>'
+        more = LOAD_MORE if self.name == 'devpost' and len(self.cards) > self.batch else ''
+        script = SCRIPT % {"shown": len(shown), "total": len(self.cards), "batch": self.batch}
+        return PAGE.format(title=self.title, body=STYLE + container + more + script).encode('utf-8')
+
+    def card_batch(self, offset, limit):
+        return ''.join(self.cards[offset:offset + limit]).encode('utf-8')
+
+    def api_page(self, params):
+        page = max(1, int(params.get('page', ['1'])[0]))
+        per_page = int(params.get('per_page', [API_PAGE_SIZES[self.name]])[0])
+        records = self.records[(page - 1) * per_page:page * per_page]
+        last_page = max(1, -(-len(self.records) // per_page))
+        if self.name == 'devpost':
+            body = {"hackathons": records, "meta": {"total_count": len(self.records), "per_page": per_page}}
+        else:
+            body = {"data": {"current_page": page, "last_page": last_page, "per_page": per_page,
+                             "total": len(self.records), "data": records}}
+        return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+
+class StandInSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, like the real sites
+
+    def do_GET(self):
+        site = self.server.site
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        site.delay()
+        try:
+            if parsed.path in ('/hackathons', '/hackathons/'):
+                if site.challenged():
+                    self._send(403, CHALLENGE_PAGE.encode('utf-8'), 'text/html; charset=utf-8',
+                               {'Server': 'cloudflare', 'cf-mitigated': 'challenge'})
+                    return
+                site.count("pages")
+                self._send(200, site.listing_page(), 'text/html; charset=utf-8')
+            elif parsed.path == '/cards':
+                site.count("batches")
+                offset = int(params.get('offset', ['0'])[0])
+                limit = int(params.get('limit', [str(site.batch)])[0])
+                self._send(200, site.card_batch(offset, limit), 'text/html; charset=utf-8')
+            elif site.records is not None and parsed.path == API_ROUTES[site.name]:
+                if site.challenged():
+                    self._send(403, CHALLENGE_PAGE.encode('utf-8'), 'text/html; charset=utf-8', {'Server': 'cloudflare'})
+                    return
+                site.count("api")
+                self._send(200, site.api_page(params), 'application/json; charset=utf-8')
+            else:
+                self._send(404, b'Not found', 'text/plain')
+        except ValueError:
+            self._send(400, b'Bad request', 'text/plain')
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_site_server(site, host='127.0.0.1', port=0):
+    server = ThreadingHTTPServer((host, port), StandInSiteHandler)
+    server.daemon_threads = True
+    server.site = site
+    return server
+
+
+def start_sites(host='127.0.0.1', base_port=0, **options):
+    """
+    Start all three sites on background threads; returns {name: server}.
+    With base_port=0 every site gets a free port.
+    """
+    servers = {}
+    for offset, name in enumerate(SITES):
+        server = make_site_server(StandInSite(name, **options), host, base_port + offset if base_port else 0)
+        threading.Thread(target=server.serve_forever, name=f"standin-{name}", daemon=True).start()
+        servers[name] = server
+    return servers
+
+
+def site_urls(servers):
+    """SCRAPER_<SOURCE>_URL settings that point the scraper at the stand-ins."""
+    return {f"SCRAPER_{name.upper()}_URL": f"http://{server.server_address[0]}:{server.server_port}/"
+            for name, server in servers.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8770, help="Devfolio's port; Devpost and Unstop use the next two")
+    parser.add_argument('--cards', type=int, default=200, help="Cards per listing")
+    parser.add_argument('--batch', type=int, default=24, help="Cards in the first page and per scroll / Load more")
+    parser.add_argument('--latency', type=float, default=0, help="Milliseconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0, help="Up to this many extra milliseconds, at random")
+    parser.add_argument('--challenge-rate', type=float, default=0, help="Share of listing requests answered with a bot challenge")
+    args = parser.parse_args()
+    servers = start_sites(args.host, args.port, cards=args.cards, batch=args.batch, latency=args.latency / 1000,
+                          jitter=args.jitter / 1000, challenge_rate=args.challenge_rate)
+    for setting, url in site_urls(servers).items():
+        print(f"{setting}={url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
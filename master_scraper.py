@@ -1,464 +1,504 @@
 import time
 import csv # Not strictly used by the current scrapers, but kept from your template
-import re # For cleaning text
-import json # For JSON output
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import urljoin
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import traceback 
-
-
-def runscraper():
-    DRIVER_PATH = None
-    USE_WEBDRIVER_MANAGER = False
+from selenium.common.exceptions import TimeoutException
+import os
+import atexit
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.driver_pool import DriverPool
+from utils.scrolling import scroll_until_settled, card_attributes
+from utils.direct_fetch import DirectFetcher
+from utils.event_store import open_event_store, event_key
+from utils.normalize import normalize_event
+from utils.event_record import as_record
+from utils.serialization import write_events
+from utils.enrichment import DetailFetcher, enrich_events
+from utils.lean_browser import BLOCKED_URL_PATTERNS, apply_lean_options, block_urls, clear_network_log, enable_network_log, page_report
+from utils.instrumentation import configure_logging, get_logger, span, SOURCE_RUNS, EVENTS_SCRAPED, DRIVER_START_SECONDS, PAGE_BYTES, PAGE_REQUESTS
+from browser_extractors import extract_rows
+from sources import REGISTRY
+
+log = get_logger(__name__)
+
+DRIVER_PATH_PLACEHOLDER = '/path/to/your/chromedriver'
+DRIVER_POOL_SIZE = int(os.environ.get("SCRAPER_DRIVER_POOL_SIZE", 3))
+DRIVER_MAX_USES = int(os.environ.get("SCRAPER_DRIVER_MAX_USES", 20))
+DRIVER_ACQUIRE_TIMEOUT = 120
+SOURCE_NAMES = REGISTRY.names()
+SOURCE_BASE_URLS = {spec.name: spec.base_url for spec in REGISTRY}
+USE_DIRECT_FETCH = os.environ.get("SCRAPER_DIRECT_FETCH", "1") != "0"
+DIRECT_FETCHER = DirectFetcher()
+INCREMENTAL_SCRAPE = os.environ.get("SCRAPER_INCREMENTAL", "1") != "0"
+INCREMENTAL_KNOWN_RUN = 10 # Consecutive already-stored cards that end scrolling early
+INCREMENTAL_RETENTION = 7 * 24 * 3600 # Stored events older than this are not backfilled into results
+# Scroll each listing to the end at least this often, so backfilled events (whose last_seen an early stop never
+# updates) are seen again before they age out of INCREMENTAL_RETENTION.
+INCREMENTAL_FULL_SCROLL = int(os.environ.get("SCRAPER_INCREMENTAL_FULL_SCROLL", 24 * 3600))
+DETAIL_FETCHER = DetailFetcher(
+    max_workers=int(os.environ.get("SCRAPER_ENRICH_WORKERS", 8)),
+    per_host_rate=float(os.environ.get("SCRAPER_ENRICH_RATE", 4)),
+    ttl=int(os.environ.get("SCRAPER_ENRICH_TTL", 24 * 3600)),
+)
+ENRICH_LIMIT = int(os.environ.get("SCRAPER_ENRICH_LIMIT", 25)) # Detail pages fetched per source scrape; cached details are always applied
+# lxml is the fast path; SCRAPER_PARSER=bs4 switches back to the BeautifulSoup parsers.
+PARSER_BACKEND = os.environ.get("SCRAPER_PARSER", "lxml")
+# "browser" reads the cards with an injected script and falls back to page_source + parser; "html" always uses the parser.
+EXTRACTION_MODE = os.environ.get("SCRAPER_EXTRACTION", "browser")
+VERIFY_EXTRACTION = os.environ.get("SCRAPER_VERIFY_EXTRACTION") == "1" # also parse page_source and compare
+# Shared orchestration policy for every registered source.
+MAX_WORKERS = int(os.environ.get("SCRAPER_MAX_WORKERS", 0)) or None # None runs every selected source at once
+SELENIUM_TIMEOUT = 30
+# Lean mode: no images, fonts, media or trackers, fewer background features, smaller window.
+LEAN_BROWSER = os.environ.get("SCRAPER_LEAN_BROWSER", "1") != "0"
+BLOCKED_URLS = BLOCKED_URL_PATTERNS + tuple(
+    pattern.strip() for pattern in os.environ.get("SCRAPER_BLOCK_URLS", "").split(',') if pattern.strip())
+BROWSER_WINDOW_SIZE = os.environ.get("SCRAPER_WINDOW_SIZE", "1024,768")
+SCROLL_QUIET_WINDOW = 1.5 # Stop scrolling once no new cards appear and the page is idle for this long
+STREAM_BUFFER = int(os.environ.get("SCRAPER_STREAM_BUFFER", 1000)) # Records a stream holds for a slow client
+STREAM_SEND_TIMEOUT = int(os.environ.get("SCRAPER_STREAM_SEND_TIMEOUT", 30)) # Seconds a full stream buffer may wait before the scrape is cancelled
+SOURCE_TIMEOUT = int(os.environ.get("SCRAPER_SOURCE_TIMEOUT", 180)) # Per-source deadline, measured from the source's own start
+
+
+_event_store = None
+_event_store_lock = threading.Lock()
+_last_full_scroll = {} # source name -> start time of its last scrape that scrolled to the end of the listing
+
+
+def event_store():
+    """The persistent event store, opened on first use rather than at import."""
+    global _event_store
+    with _event_store_lock:
+        if _event_store is None:
+            _event_store = open_event_store()
+        return _event_store
+
+
+def full_scroll_due(source_name):
+    """True when `source_name` has not been scrolled to the end in this process within INCREMENTAL_FULL_SCROLL seconds."""
+    return time.time() - _last_full_scroll.get(source_name, 0) >= INCREMENTAL_FULL_SCROLL
+
+
+@functools.lru_cache(maxsize=1)
+def resolve_driver_path():
+    """Resolve the ChromeDriver path once per process. Failures are not cached, so a later call retries."""
     try:
         from webdriver_manager.chrome import ChromeDriverManager
-        DRIVER_PATH = ChromeDriverManager().install()
-        print(f"Using ChromeDriver installed by webdriver-manager at: {DRIVER_PATH}")
-        USE_WEBDRIVER_MANAGER = True
+        driver_path = ChromeDriverManager().install()
+        log.info("Using ChromeDriver installed by webdriver-manager at: %s", driver_path)
+        return driver_path
     except ImportError:
-        print("webdriver-manager not found. Install with `pip install webdriver-manager` or set DRIVER_PATH manually.")
-        DRIVER_PATH = '/path/to/your/chromedriver'
-        if DRIVER_PATH == '/path/to/your/chromedriver':
-             print("WARNING: DRIVER_PATH is using the default placeholder. Please update it if webdriver-manager is not used.")
-        USE_WEBDRIVER_MANAGER = False
-    except Exception as e:
-        print(f"Error during WebDriver manager setup: {e}")
-        print("Scraping cannot proceed without a valid ChromeDriver path.")
-        return {"error": "WebDriver setup failed", "details": str(e), "events": []}
+        log.warning("webdriver-manager not found. Install with `pip install webdriver-manager` or set DRIVER_PATH manually.")
+        driver_path = os.environ.get("CHROMEDRIVER_PATH", DRIVER_PATH_PLACEHOLDER)
+        if driver_path == DRIVER_PATH_PLACEHOLDER:
+             log.warning("DRIVER_PATH is using the default placeholder. Please update it if webdriver-manager is not used.")
+        return driver_path
 
-    SELENIUM_TIMEOUT = 30
-    SCROLL_PAUSE_TIME = 3.0
-    MAX_SCROLL_ATTEMPTS = 8
-
-    def clean_text(text):
-        if text:
-            return ' '.join(text.split()).strip()
-        return None
 
-    def get_driver():
-        if not DRIVER_PATH or (DRIVER_PATH == '/path/to/your/chromedriver' and not USE_WEBDRIVER_MANAGER):
-            raise Exception("ChromeDriver path is not configured correctly. Please install webdriver-manager or set DRIVER_PATH.")
-        
-        service = Service(executable_path=DRIVER_PATH)
-        options = webdriver.ChromeOptions()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument(
-            'user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-            '(KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'
-        )
-        options.add_argument("--start-maximized") 
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        return driver
-
-    def scrape_devfolio(driver_instance, base_url="https://devfolio.co/"):
-        print("\n--- Starting Devfolio Scrape ---")
-        target_url = urljoin(base_url, "/hackathons")
-        all_hackathons = []
-        processed_urls = set()
+def get_driver():
+    driver_path = resolve_driver_path()
+    if not driver_path or driver_path == DRIVER_PATH_PLACEHOLDER:
+        raise Exception("ChromeDriver path is not configured correctly. Please install webdriver-manager or set DRIVER_PATH.")
+    
+    service = Service(executable_path=driver_path)
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(
+        'user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'
+    )
+    if LEAN_BROWSER:
+        apply_lean_options(options, BROWSER_WINDOW_SIZE)
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    enable_network_log(options)
+
+    started = time.perf_counter()
+    driver = webdriver.Chrome(service=service, options=options)
+    DRIVER_START_SECONDS.observe(time.perf_counter() - started)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+        if LEAN_BROWSER:
+            block_urls(driver, BLOCKED_URLS)
+    except Exception as e:
+        log.warning("Could not configure the DevTools protocol (lean blocking and page metrics disabled): %s", e)
+    return driver
 
-        try:
-            print(f"Navigating to {target_url}...")
-            driver_instance.get(target_url)
 
-            wait_selector_css = "a.bnxtME"
-            print(f"Waiting for Devfolio listings ({wait_selector_css})...")
-            try:
-                WebDriverWait(driver_instance, SELENIUM_TIMEOUT).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, wait_selector_css))
-                )
-                print("Devfolio listings detected.")
-                time.sleep(3) # Stability pause
-            except TimeoutException:
-                print("Timeout waiting for Devfolio listings. Structure might have changed or page blocked.")
-                print(f"Page title: {driver_instance.title}")
-                return []
-
-            print("Scrolling Devfolio page...")
-            last_height = driver_instance.execute_script("return document.body.scrollHeight")
-            no_change_count = 0
-            for i in range(MAX_SCROLL_ATTEMPTS // 2):
-                driver_instance.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(SCROLL_PAUSE_TIME)
-                new_height = driver_instance.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    no_change_count +=1
-                    if no_change_count >= 2: break
-                else: no_change_count = 0
-                last_height = new_height
-            print("Finished Devfolio scrolling.")
-
-            html_content = driver_instance.page_source
-            soup = BeautifulSoup(html_content, 'lxml')
-            hackathon_links = soup.find_all('a', class_='bnxtME')
-            print(f"Found {len(hackathon_links)} potential Devfolio listings.")
-
-            for link_tag in hackathon_links:
-                card = link_tag.find_parent('div', class_=lambda x: x and x.startswith('CompactHackathonCard__Card-sc-'))
-                if not card:
-                     card = link_tag.find_parent('div', class_=lambda x: x and x.startswith('sc-'))
-                if not card: continue
-
-                event_data = {'source': 'Devfolio'}
+DRIVER_POOL = DriverPool(get_driver, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES)
+atexit.register(DRIVER_POOL.shutdown)
+atexit.register(DETAIL_FETCHER.shutdown)
+atexit.register(DIRECT_FETCHER.shutdown)
 
-                try:
-                    raw_url = link_tag.get('href')
-                    if not raw_url: continue
-                    event_data['url'] = urljoin(base_url, raw_url)
-                    if event_data['url'] in processed_urls: continue
-                    processed_urls.add(event_data['url'])
-
-                    title_tag = link_tag.find('h3')
-                    event_data['title'] = clean_text(title_tag.get_text()) if title_tag else 'N/A'
-                    if event_data['title'] == 'N/A': continue
-
-                    status_tags = card.find_all('p', class_='ifkmYk')
-                    statuses = [clean_text(tag.get_text()) for tag in status_tags if clean_text(tag.get_text())]
-                    event_data['status_mode'] = ', '.join(statuses) if statuses else 'N/A'
-                    
-                    event_data['prize_info'] = 'N/A (Details on event page)'
-                    event_data['participants_count'] = 'N/A (Details on event page)'
-                    event_data['host_name'] = 'N/A (Details on event page)'
-                    event_data['dates'] = 'N/A (Details on event page)'
-                    event_data['themes_tags'] = 'N/A (Details on event page)'
-                    event_data['location_mode'] = 'Online/Offline (Check Status/Mode)'
-
-                    all_hackathons.append(event_data)
-                except Exception as e:
-                    print(f"  Error processing one Devfolio card (URL: {event_data.get('url', 'Unknown')}): {e}")
-        except Exception as e:
-            print(f"Critical error during Devfolio scrape: {e}")
-            traceback.print_exc()
-        finally:
-            print(f"--- Finished Devfolio Scrape ({len(all_hackathons)} events found) ---")
-            return all_hackathons
 
-    def scrape_devpost(driver_instance, base_url="https://devpost.com/"):
-        print("\n--- Starting Devpost Scrape ---")
-        target_url = urljoin(base_url, "/hackathons")
-        all_hackathons = []
-        processed_urls = set()
+def scrape_listing(spec, driver_instance, base_url, on_event=None, state=None, incremental=True):
+    """Browser path for one source: navigate, wait for the cards, scroll until settled, parse."""
+    state = {} if state is None else state
+    stages = state.setdefault('stages', {})
+    source = {"source": spec.name}
+    log.info("Starting %s scrape", spec.name, extra=source)
+    target_url = urljoin(base_url, spec.listing_path)
+    all_hackathons = []
 
-        try:
-            print(f"Navigating to {target_url}...")
+    try:
+        clear_network_log(driver_instance)
+        log.debug("Navigating to %s", target_url, extra=source)
+        with span(spec.name, 'page_load', stages):
             driver_instance.get(target_url)
 
-            wait_selector_css = "div.hackathon-tile"
-            print(f"Waiting for Devpost listings ({wait_selector_css})...")
-            try:
-                WebDriverWait(driver_instance, SELENIUM_TIMEOUT).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, wait_selector_css))
-                )
-                print("Devpost listings detected.")
-                time.sleep(3)
-            except TimeoutException:
-                print("Timeout waiting for Devpost listings.")
-                print(f"Page title: {driver_instance.title}")
-                return []
-
-            print("Scrolling Devpost page...")
-            last_height = driver_instance.execute_script("return document.body.scrollHeight")
-            no_change_count = 0
-            for i in range(MAX_SCROLL_ATTEMPTS):
-                driver_instance.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(SCROLL_PAUSE_TIME)
-                try:
-                     load_more_button = driver_instance.find_element(By.CSS_SELECTOR, "a.load-more-challenges")
-                     if load_more_button.is_displayed() and load_more_button.is_enabled():
-                         print("Clicking Devpost 'Load More' button...")
-                         driver_instance.execute_script("arguments[0].click();", load_more_button)
-                         time.sleep(SCROLL_PAUSE_TIME + 1)
-                except Exception: pass
-
-                new_height = driver_instance.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    no_change_count +=1
-                    if no_change_count >= 2: break
-                else: no_change_count = 0
-                last_height = new_height
-            print("Finished Devpost scrolling.")
-
-            html_content = driver_instance.page_source
-            soup = BeautifulSoup(html_content, 'lxml')
-            hackathon_tiles = soup.select('div.hackathon-tile')
-            print(f"Found {len(hackathon_tiles)} potential Devpost tiles.")
-
-            for tile in hackathon_tiles:
-                event_data = {'source': 'Devpost'}
-
-                try:
-                    anchor = tile.find('a', class_='tile-anchor')
-                    if not anchor or not anchor.has_attr('href'): continue
-
-                    relative_url = anchor['href']
-                    event_data['url'] = urljoin(base_url, relative_url.split('?')[0])
-                    if event_data['url'] in processed_urls: continue
-                    processed_urls.add(event_data['url'])
-
-                    # Initialize fields
-                    event_data['title'] = 'N/A'
-                    event_data['status_label'] = 'N/A'
-                    event_data['location_mode'] = 'N/A'
-                    event_data['prize_info'] = 'N/A'
-                    event_data['participants_count'] = 'N/A'
-                    event_data['host_name'] = 'N/A'
-                    event_data['dates'] = 'N/A'
-                    event_data['themes_tags'] = 'N/A'
-
-                    main_content = anchor.find('div', class_='main-content')
-                    if main_content:
-                        content_div = main_content.find('div', class_='content')
-                        if content_div:
-                             title_tag = content_div.find('h3', class_='mb-4')
-                             event_data['title'] = clean_text(title_tag.get_text()) if title_tag else 'N/A'
-                             if event_data['title'] == 'N/A': continue
-
-                             info_row = content_div.find('div', class_='flex-row') # Simplified
-                             if info_row:
-                                 status_tag = info_row.find('div', class_='status-label')
-                                 event_data['status_label'] = clean_text(status_tag.get_text()) if status_tag else 'N/A'
-                                 
-                                 location_text = 'N/A'
-                                 mode_text = 'N/A'
-                                 location_icon_div = info_row.find('div', class_='info-with-icon')
-                                 if location_icon_div:
-                                     icon = location_icon_div.find('i')
-                                     info_span = location_icon_div.find('span')
-                                     if icon and info_span:
-                                         location_text = clean_text(info_span.get_text())
-                                         mode_text = 'Online' if 'fa-globe' in icon.get('class', []) else \
-                                                     ('In-Person' if 'fa-map-marker-alt' in icon.get('class', []) else 'Hybrid/Unknown')
-                                 event_data['location_mode'] = f"{mode_text} - {location_text}" if location_text != 'N/A' else mode_text
-
-                             pnp_div = content_div.find('div', class_='prizes-and-participants')
-                             if pnp_div:
-                                 prize_tag = pnp_div.find('span', class_='prize-amount')
-                                 event_data['prize_info'] = clean_text(prize_tag.get_text()) if prize_tag else 'N/A'
-                                 partic_tag = pnp_div.find('div', class_='participants')
-                                 strong_tag = partic_tag.find('strong') if partic_tag else None
-                                 event_data['participants_count'] = clean_text(strong_tag.get_text()) if strong_tag else 'N/A'
-                    
-                    side_info = anchor.find('div', class_='side-info')
-                    if side_info:
-                         host_tag = side_info.find('span', class_='host-label')
-                         event_data['host_name'] = clean_text(host_tag['title']) if host_tag and host_tag.has_attr('title') else (clean_text(host_tag.get_text()) if host_tag else 'N/A')
-                         sub_period_tag = side_info.find('div', class_='submission-period')
-                         event_data['dates'] = clean_text(sub_period_tag.get_text()) if sub_period_tag else 'N/A'
-                         theme_tags_elements = side_info.select('span.theme-label')
-                         themes_list = [clean_text(tag['title']) for tag in theme_tags_elements if tag.has_attr('title')]
-                         event_data['themes_tags'] = ', '.join(themes_list) if themes_list else 'N/A'
-                    
-                    event_data['status_mode'] = f"{event_data.get('status_label', 'N/A')} ({event_data.get('location_mode', 'N/A')})"
-                    all_hackathons.append(event_data)
-                except Exception as e:
-                    print(f"  Error processing one Devpost tile (URL: {event_data.get('url', 'Unknown')}): {e}")
-        except Exception as e:
-            print(f"Critical error during Devpost scrape: {e}")
-            traceback.print_exc()
-        finally:
-            print(f"--- Finished Devpost Scrape ({len(all_hackathons)} events found) ---")
-            return all_hackathons
-
-    def scrape_unstop(driver_instance, base_url="https://unstop.com/"):
-        print("\n--- Starting Unstop Scrape ---")
-        target_url = urljoin(base_url, "/hackathons")
-        all_hackathons = []
-        processed_ids = set()
-
+        log.debug("Waiting for %s listings (%s)", spec.name, spec.wait_selector, extra=source)
         try:
-            print(f"Navigating to {target_url}...")
-            driver_instance.get(target_url)
-
-            list_container_selector = "div.user_list"
-            listing_item_selector = "app-competition-listing div.single_profile"
-            print(f"Waiting for Unstop listings ({listing_item_selector})...")
-            try:
-                WebDriverWait(driver_instance, SELENIUM_TIMEOUT).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, list_container_selector))
-                )
-                WebDriverWait(driver_instance, SELENIUM_TIMEOUT).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, listing_item_selector))
-                )
-                print("Unstop listings detected.")
-                time.sleep(3)
-            except TimeoutException:
-                print("Timeout waiting for Unstop listings.")
-                if "Just a moment..." in driver_instance.page_source or "Cloudflare" in driver_instance.title:
-                     print("Cloudflare detected on Unstop. Scraping will likely fail.")
-                print(f"Page title: {driver_instance.title}")
-                return []
-
-            print("Scrolling Unstop page...")
-            last_height = driver_instance.execute_script("return document.body.scrollHeight")
-            no_change_count = 0
-            for i in range(MAX_SCROLL_ATTEMPTS):
-                driver_instance.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(SCROLL_PAUSE_TIME)
-                new_height = driver_instance.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    no_change_count +=1
-                    if no_change_count >= 3: break
-                else: no_change_count = 0
-                last_height = new_height
-            print("Finished Unstop scrolling.")
-
-            html_content = driver_instance.page_source
-            soup = BeautifulSoup(html_content, 'lxml')
-            listings = soup.select('app-competition-listing div.single_profile')
-            print(f"Found {len(listings)} potential Unstop listings.")
-
-            for profile_div in listings:
-                event_data = {'source': 'Unstop'}
+            with span(spec.name, 'wait', stages):
+                for selector in spec.ready_selectors:
+                    WebDriverWait(driver_instance, SELENIUM_TIMEOUT).until(
+                        EC.visibility_of_element_located((By.CSS_SELECTOR, selector))
+                    )
+                condition = EC.visibility_of_element_located if spec.wait_for_visible else EC.presence_of_all_elements_located
+                WebDriverWait(driver_instance, SELENIUM_TIMEOUT).until(condition((By.CSS_SELECTOR, spec.wait_selector)))
+        except TimeoutException:
+            state['listing_failure'] = ("error", "Timeout waiting for listings")
+            if any(marker in driver_instance.page_source or marker in driver_instance.title for marker in spec.blocked_markers):
+                state['listing_failure'] = ("blocked", "Bot challenge detected")
+            log.warning("Timeout waiting for %s listings (%s); page title: %s", spec.name,
+                        state['listing_failure'][1], driver_instance.title, extra=source)
+            return []
+
+        with span(spec.name, 'scroll', stages):
+            state['scroll'] = scroll_until_settled(
+                driver_instance, spec.card_selector, load_more_selector=spec.load_more_selector,
+                max_rounds=spec.max_scroll_rounds, quiet_window=SCROLL_QUIET_WINDOW,
+                stop_when=known_cards_reached(spec, base_url) if incremental else None,
+            )
+        log.debug("Finished %s scrolling: %s", spec.name, state['scroll'], extra=source)
+
+        parse = spec.extractors.get(PARSER_BACKEND) or next(iter(spec.extractors.values()))
+        if EXTRACTION_MODE == 'browser' and spec.browser_extractor:
+            all_hackathons = extract_in_browser(spec, driver_instance, base_url, on_event, state)
+        if not all_hackathons:
+            with span(spec.name, 'page_source', stages):
+                html_content = driver_instance.page_source
+            with span(spec.name, 'parse', stages):
+                all_hackathons = parse(html_content, base_url, on_event)
+            state['extraction'] = dict(state.get('extraction', {}), mode='html', bytes=len(html_content.encode('utf-8')),
+                                       transfer_seconds=stages['page_source'], parse_seconds=stages['parse'])
+        elif VERIFY_EXTRACTION:
+            expected = parse(driver_instance.page_source, base_url)
+            state['extraction']['verified'] = expected == all_hackathons
+            if expected != all_hackathons:
+                log.warning("In-browser extraction differs from the %s parser for %s: %d vs %d events", PARSER_BACKEND,
+                            spec.name, len(all_hackathons), len(expected), extra=source)
+    except Exception as e:
+        log.exception("Critical error during %s scrape: %s", spec.name, e, extra=source)
+    finally:
+        state['page'] = page_report(driver_instance)
+        if state['page']:
+            PAGE_BYTES.inc(state['page']['bytes'], source=spec.name)
+            for outcome in ('requests', 'blocked', 'failed'):
+                PAGE_REQUESTS.inc(state['page'][outcome], source=spec.name, outcome=outcome)
+        log.info("Finished %s scrape (%d events found)", spec.name, len(all_hackathons), extra=dict(source, page=state['page']))
+        return all_hackathons
+
+
+def extract_in_browser(spec, driver_instance, base_url, on_event, state):
+    """
+    Read the listing with the spec's injected script; returns [] (so the caller falls back to page_source) on failure.
+    Events reach `on_event` only once every row is built, so a fallback never re-emits them.
+    """
+    script, build = spec.browser_extractor
+    stages = state['stages']
+    try:
+        with span(spec.name, 'extract', stages):
+            rows, payload_bytes = extract_rows(driver_instance, script)
+        with span(spec.name, 'parse', stages):
+            events = build(rows, base_url)
+    except Exception as e:
+        log.warning("In-browser extraction failed for %s, falling back to page_source: %s", spec.name, e, extra={"source": spec.name})
+        state['extraction'] = {"fallback_reason": str(e)}
+        return []
+    state['extraction'] = {"mode": "browser", "bytes": payload_bytes, "transfer_seconds": stages['extract'], "parse_seconds": stages['parse']}
+    if not events:
+        state['extraction'] = {"fallback_reason": "No events extracted in the browser"}
+    elif on_event:
+        for event in events:
+            on_event(event)
+    return events
+
+
+def known_cards_reached(spec, base_url):
+    """Stop scrolling once the last INCREMENTAL_KNOWN_RUN cards on the page are all in the event store."""
+    if not (spec.known_card_selector and spec.known_card_attribute and spec.card_key):
+        return None
 
-                try:
-                     comp_id = None
-                     comp_id_match = re.search(r'i_(\d+)_', profile_div.get('id', ''))
-                     if comp_id_match: comp_id = comp_id_match.group(1)
-                     else:
-                        class_list = profile_div.get('class', [])
-                        for cls in class_list:
-                            if cls.startswith('opp_') and cls.split('_')[-1].isdigit():
-                                comp_id = cls.split('_')[-1]; break
-                     if not comp_id or comp_id in processed_ids: continue
-                     processed_ids.add(comp_id)
-                     event_data['url'] = urljoin(base_url, f"o/{comp_id}")
-
-                     content_div = profile_div.find('div', class_='content')
-                     if not content_div: continue
-
-                     title_tag = content_div.find('h2', class_='double-wrap')
-                     event_data['title'] = clean_text(title_tag.get_text()) if title_tag else 'N/A'
-                     if event_data['title'] == 'N/A': continue
-
-                     org_tag = content_div.find('p')
-                     event_data['host_name'] = clean_text(org_tag.get_text()) if org_tag else 'N/A'
-                     
-                     event_data['prize_info'] = 'N/A'
-                     event_data['participants_count'] = 'N/A'
-                     event_data['dates'] = 'N/A'
-                     event_data['themes_tags'] = 'N/A'
-                     event_data['status_mode'] = 'Online (typically)' # Unstop is mostly online
-                     event_data['location_mode'] = 'Online (typically)'
-
-                     other_fields_div = content_div.find('div', class_='other_fields')
-                     if other_fields_div:
-                         seperate_boxes = other_fields_div.find_all('div', class_='seperate_box', recursive=False)
-                         for box in seperate_boxes:
-                             box_text = clean_text(box.get_text())
-                             if not box_text: continue
-                             
-                             img_alt = box.find('img')['alt'] if box.find('img') and box.find('img').has_attr('alt') else ''
-
-                             if 'prize' in box.get('class', []) or 'Prize money' in img_alt:
-                                 prize_text_cleaned = re.sub(r'^\s*🏆\s*', '', box_text).strip()
-                                 event_data['prize_info'] = prize_text_cleaned if prize_text_cleaned else box_text
-                             elif img_alt == 'group' or 'Registered' in box_text:
-                                 match = re.search(r'([\d,]+)\s+Registered', box_text)
-                                 event_data['participants_count'] = match.group(1).replace(',', '') if match else box_text
-                             elif img_alt == 'schedule' or any(k in box_text for k in ['ago', 'left', 'day']):
-                                 event_data['dates'] = box_text # This is "time left" or similar
-                     
-                     skills_div = content_div.find('div', class_='skills')
-                     if skills_div:
-                         tag_elements = skills_div.select('un-chip-items span.chip_text')
-                         tags_list = [clean_text(tag.get_text()) for tag in tag_elements]
-                         if tags_list: event_data['themes_tags'] = ', '.join(tags_list)
-
-                     all_hackathons.append(event_data)
-                except Exception as e:
-                    print(f"  Error processing one Unstop listing (ID: {event_data.get('url', 'Unknown').split('/')[-1]}): {e}")
-        except Exception as e:
-            print(f"Critical error during Unstop scrape: {e}")
-            traceback.print_exc()
-        finally:
-            print(f"--- Finished Unstop Scrape ({len(all_hackathons)} events found) ---")
-            return all_hackathons
+    def check(driver_instance):
+        values = card_attributes(driver_instance, spec.known_card_selector, spec.known_card_attribute)[-INCREMENTAL_KNOWN_RUN:]
+        keys = [key for key in (spec.card_key(value, base_url) for value in values if value) if key]
+        return len(keys) >= INCREMENTAL_KNOWN_RUN and len(event_store().known(keys)) == len(keys)
+    return check
+
+
+def runscraper(max_workers=None, sources=None, use_direct=None, incremental=None, on_event=None, on_source_done=None, cancel=None):
+    """
+    Scrape the selected registered sources concurrently and return the aggregated result.
+
+    Sources run cheapest first on a shared worker pool, each under its own
+    deadline. When `on_event(event)` is given, each event is handed to it as
+    soon as it is parsed instead of being collected into the returned
+    `events` list, and `on_source_done(source_name, timing)` is called as
+    every source finishes. Setting the `cancel` Event abandons the sources
+    still running, as if their deadline had passed.
+    """
+    if use_direct is None:
+        use_direct = USE_DIRECT_FETCH
+    if incremental is None:
+        incremental = INCREMENTAL_SCRAPE
+    selected = sorted(REGISTRY.select(sources), key=lambda spec: spec.cost(use_direct))
 
-    print("Starting event aggregation scrape...")
-    master_event_list = []
-    
-    current_driver = None
     try:
-        print("\nInitializing WebDriver for Devfolio...")
-        current_driver = get_driver()
-        devfolio_events = scrape_devfolio(current_driver)
-        master_event_list.extend(devfolio_events)
-        print(f"Devfolio events added: {len(devfolio_events)}")
+        resolve_driver_path()
     except Exception as e:
-        print(f"Failed to initialize driver or scrape Devfolio: {e}")
-        traceback.print_exc()
-    finally:
-         if current_driver:
+        if not use_direct or any(spec.direct_fetch is None for spec in selected):
+            log.error("WebDriver setup failed; scraping cannot proceed without a valid ChromeDriver path: %s", e)
+            return {"error": "WebDriver setup failed", "details": str(e), "events": []}
+        log.warning("WebDriver setup failed (%s); continuing with direct HTTP fetch only.", e)
+
+    def run_source(spec, state):
+        state['started'] = time.time()
+        events = fetch_source(spec, state)
+        with span(spec.name, 'normalize', state['stages']):
+            # normalize_event is a no-op for events already normalised on their way to on_event.
+            events = [as_record(normalize_event(event)) for event in events]
+        if spec.detail_parser:
             try:
-                print("Quitting Devfolio WebDriver...")
-                current_driver.quit()
+                with span(spec.name, 'enrich', state['stages']):
+                    events, state['enrich'] = enrich_events(events, DETAIL_FETCHER, spec.detail_parser, ENRICH_LIMIT)
             except Exception as e:
-                print(f"Error quitting Devfolio driver: {e}")
+                log.exception("Error enriching %s events: %s", spec.name, e, extra={"source": spec.name})
+        try:
+            with span(spec.name, 'store', state['stages']):
+                state['store'] = event_store().upsert(events)
+            if state.get('scroll') and not state['scroll'].get('stopped_early'):
+                _last_full_scroll[spec.name] = state['started']
+            if state.get('scroll', {}).get('stopped_early'):
+                # Scrolling stopped at already-known cards; the rest of the listing comes from the store.
+                seen = {event_key(event) for event in events}
+                retained = [
+                    event for event in event_store().events_for_source(spec.name, time.time() - INCREMENTAL_RETENTION)
+                    if event_key(event) not in seen
+                ]
+                state['store']['from_store'] = len(retained)
+                retained = [as_record(normalize_event(event)) for event in retained] # rows stored before normalisation existed
+                events = events + retained
+                if state.get('emit'):
+                    for event in retained:
+                        state['emit'](event)
+        except Exception as e:
+            log.exception("Error updating the event store for %s: %s", spec.name, e, extra={"source": spec.name})
+        return events
 
-    current_driver = None
-    try:
-        print("\nInitializing WebDriver for Devpost...")
-        current_driver = get_driver()
-        devpost_events = scrape_devpost(current_driver)
-        master_event_list.extend(devpost_events)
-        print(f"Devpost events added: {len(devpost_events)}")
-    except Exception as e:
-        print(f"Failed to initialize driver or scrape Devpost: {e}")
-        traceback.print_exc()
-    finally:
-         if current_driver:
+    def fetch_source(spec, state):
+        base_url = spec.base_url
+        if use_direct and spec.direct_fetch:
             try:
-                print("Quitting Devpost WebDriver...")
-                current_driver.quit()
+                log.debug("Fetching %s listings over HTTP", spec.name, extra={"source": spec.name})
+                with span(spec.name, 'direct_fetch', state['stages']):
+                    events = spec.direct_fetch(DIRECT_FETCHER, base_url)
+                if events:
+                    state['backend'] = 'http'
+                    if state.get('emit'):
+                        for event in events:
+                            state['emit'](event)
+                    return events
+                state['fallback_reason'] = "Direct fetch returned no events"
             except Exception as e:
-                print(f"Error quitting Devpost driver: {e}")
+                state['fallback_reason'] = str(e)
+            log.warning("Direct fetch for %s unusable (%s); falling back to Selenium.", spec.name,
+                        state['fallback_reason'], extra={"source": spec.name})
+
+        state['backend'] = 'selenium'
+        try:
+            # Includes Chrome startup when the pool has to create a driver.
+            with span(spec.name, 'driver_acquire', state['stages']):
+                state['driver'] = DRIVER_POOL.acquire(timeout=DRIVER_ACQUIRE_TIMEOUT)
+            return scrape_listing(spec, state['driver'], base_url, state.get('emit'), state,
+                                  incremental and not full_scroll_due(spec.name))
+        finally:
+            if state.get('driver') and state.get('abandoned'):
+                DRIVER_POOL.discard(state['driver'])
+            elif state.get('driver'):
+                DRIVER_POOL.release(state['driver'])
+
+    def finish_source(spec, state, timing):
+        timing["stages"] = dict(state['stages'])
+        SOURCE_RUNS.inc(source=spec.name, status=timing['status'], backend=state.get('backend') or "none")
+        EVENTS_SCRAPED.inc(timing['events'], source=spec.name)
+        log.info("%s finished: %s, %d events in %ss", spec.name, timing['status'], timing['events'], timing['seconds'],
+                 extra={"source": spec.name, "status": timing['status'], "stages": timing['stages']})
+        if on_source_done:
+            on_source_done(spec.name, timing)
+
+    log.info("Starting event aggregation scrape of %s", ", ".join(spec.name for spec in selected))
+    master_event_list = []
+    total_events = 0
+    source_timings = {}
+    scrape_started = time.time()
+
+    workers = max(1, min(max_workers or MAX_WORKERS or len(selected), len(selected) or 1))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper")
+    pending = {}
+    for spec in selected:
+        state = {'stages': {}}
+        if on_event:
+            # Events from a source that was abandoned after its deadline must not leak into the stream.
+            state['emit'] = lambda event, state=state: None if state.get('abandoned') else on_event(as_record(normalize_event(event)))
+        future = executor.submit(run_source, spec, state)
+        pending[future] = (spec, state)
 
-    current_driver = None
     try:
-        print("\nInitializing WebDriver for Unstop...")
-        current_driver = get_driver()
-        unstop_events = scrape_unstop(current_driver)
-        master_event_list.extend(unstop_events)
-        print(f"Unstop events added: {len(unstop_events)}")
-    except Exception as e:
-        print(f"Failed to initialize driver or scrape Unstop: {e}")
-        traceback.print_exc()
+        while pending:
+            done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                spec, state = pending.pop(future)
+                source_name = spec.name
+                elapsed = round(time.time() - state.get('started', scrape_started), 2)
+                try:
+                    events = future.result()
+                    total_events += len(events)
+                    if not on_event:
+                        master_event_list.extend(events)
+                    timing = {"status": "ok", "events": len(events), "seconds": elapsed, "backend": state.get('backend'),
+                              "cost": spec.cost(use_direct)}
+                    if state.get('fallback_reason'):
+                        timing["fallback_reason"] = state['fallback_reason']
+                    if state.get('store'):
+                        timing["store"] = state['store']
+                    if state.get('scroll'):
+                        timing["scroll"] = state['scroll']
+                    if state.get('page'):
+                        timing["page"] = state['page']
+                    if state.get('extraction'):
+                        timing["extraction"] = state['extraction']
+                    if state.get('enrich'):
+                        timing["enrich"] = state['enrich']
+                    if state.get('listing_failure') and not events:
+                        status, details = state['listing_failure']
+                        timing.update(status=status, details=details)
+                    source_timings[source_name] = timing
+                except Exception as e:
+                    source_timings[source_name] = {"status": "error", "events": 0, "seconds": elapsed, "details": str(e)}
+                    log.exception("Failed to initialize driver or scrape %s: %s", source_name, e, extra={"source": source_name})
+                finish_source(spec, state, source_timings[source_name])
+
+            now = time.time()
+            cancelled = cancel is not None and cancel.is_set()
+            for future, (spec, state) in list(pending.items()):
+                deadline = spec.timeout or SOURCE_TIMEOUT
+                if not cancelled and ('started' not in state or now - state['started'] < deadline):
+                    continue
+                # The worker thread cannot be interrupted, so quitting its driver is what
+                # makes the pending Selenium call fail and frees the slot.
+                if cancelled:
+                    log.info("Scrape cancelled; abandoning %s.", spec.name, extra={"source": spec.name})
+                else:
+                    log.warning("%s exceeded its %ss deadline; abandoning it.", spec.name, deadline, extra={"source": spec.name})
+                state['abandoned'] = True
+                if state.get('driver'):
+                    DRIVER_POOL.discard(state['driver'])
+                source_timings[spec.name] = {"status": "cancelled" if cancelled else "timeout", "events": 0,
+                                             "seconds": round(now - state.get('started', scrape_started), 2)}
+                del pending[future]
+                finish_source(spec, state, source_timings[spec.name])
     finally:
-         if current_driver:
-            try:
-                print("Quitting Unstop WebDriver...")
-                current_driver.quit()
-            except Exception as e:
-                print(f"Error quitting Unstop driver: {e}")
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    total_events = len(master_event_list)
-    print(f"\nTotal events scraped from all sources: {total_events}")
-    
+    total_seconds = round(time.time() - scrape_started, 2)
+    log.info("Total events scraped from all sources: %d in %ss", total_events, total_seconds)
     if total_events == 0:
-        print("\nNo events were scraped from any source. Check individual scraper outputs and website structures.")
+        log.warning("No events were scraped from any source. Check individual scraper outputs and website structures.")
 
-    print("--- Aggregation Script Finished ---")
-    
     return {
         "message": f"Scraping completed. Found {total_events} events.",
         "total_events": total_events,
-        "events": master_event_list
+        "events": master_event_list,
+        "timings": {"sources": source_timings, "total_seconds": total_seconds}
     }
 
+def stream_scrape(sources=None, scrape=None, **kwargs):
+    """
+    Run runscraper() (or `scrape`, a function with the same signature) in a
+    background thread and yield records as they arrive: {"type": "event", ...}
+    per event, {"type": "summary", ...} per finished source and a final
+    {"type": "done", ...} (or {"type": "error", ...}).
+
+    At most STREAM_BUFFER records are held for the consumer. When it stops
+    reading (a slow client for STREAM_SEND_TIMEOUT seconds, or the generator
+    is closed on disconnect) the scrape is cancelled.
+    """
+    scrape = scrape or runscraper
+    records = queue.Queue(maxsize=STREAM_BUFFER)
+    stop = threading.Event()
+    finished = object()
+
+    def put(record):
+        deadline = time.time() + STREAM_SEND_TIMEOUT
+        while not stop.is_set():
+            try:
+                records.put(record, timeout=0.5) # short waits, so a disconnect is noticed promptly
+                return
+            except queue.Full:
+                if time.time() >= deadline:
+                    log.warning("Stream consumer stopped reading for %ss; cancelling the scrape.", STREAM_SEND_TIMEOUT)
+                    stop.set()
+
+    def produce():
+        try:
+            result = scrape(
+                sources=sources,
+                on_event=lambda event: put({"type": "event", "event": event}),
+                on_source_done=lambda source_name, timing: put({"type": "summary", "source": source_name, **timing}),
+                cancel=stop,
+                **kwargs,
+            )
+            if result.get("error"):
+                put({"type": "error", "error": result["error"], "details": result.get("details")})
+            else:
+                put({"type": "done", "total_events": result["total_events"], "timings": result["timings"]})
+        except Exception as e:
+            put({"type": "error", "error": "Scrape failed", "details": str(e)})
+        finally:
+            put(finished)
+            stop.set()
+
+    threading.Thread(target=produce, name="stream-scrape", daemon=True).start()
+    try:
+        while True:
+            try:
+                record = records.get(timeout=1.0)
+            except queue.Empty:
+                if stop.is_set():
+                    return # the producer gave up on us
+                continue
+            if record is finished:
+                return
+            yield record
+    finally:
+        stop.set()
+
 
 if __name__ == "__main__":
+    configure_logging()
     print("Running scraper directly...")
     
     results = runscraper()
@@ -466,6 +506,12 @@ if __name__ == "__main__":
     print(f"\n--- Direct Execution Results ---")
     print(f"Message: {results.get('message', 'N/A')}")
     print(f"Total Events Scraped: {results.get('total_events', 0)}")
+    for source_name, timing in results.get('timings', {}).get('sources', {}).items():
+        print(f"  {source_name}: {timing['status']}, {timing['events']} events in {timing['seconds']}s")
+        if timing.get('page'):
+            page = timing['page']
+            print(f"    browser: {page['bytes'] / 1e6:.2f} MB in {page['requests']} requests ({page['blocked']} blocked), "
+                  f"loaded in {page.get('load_ms', 'N/A')} ms, JS heap {page.get('js_heap_mb', 'N/A')} MB")
 
     if results.get('events'):
         print(f"First 2 events (if available):")
@@ -473,10 +519,9 @@ if __name__ == "__main__":
             print(f"Event {i+1}: {event.get('title', 'N/A')} from {event.get('source', 'N/A')}")
         
         OUTPUT_JSON_FILE = 'aggregated_events_direct_run.json'
-        print(f"\nSaving all events to {OUTPUT_JSON_FILE}...")
+        print(f"\nSaving all events to {OUTPUT_JSON_FILE} (columnar; read it back with utils.serialization.read_events)...")
         try:
-            with open(OUTPUT_JSON_FILE, 'w', encoding='utf-8') as f:
-                json.dump(results['events'], f, indent=4, ensure_ascii=False)
+            write_events(OUTPUT_JSON_FILE, results['events'])
             print(f"Data saved successfully to {OUTPUT_JSON_FILE}.")
         except IOError as e:
             print(f"Error writing to JSON file {OUTPUT_JSON_FILE}: {e}")
@@ -0,0 +1,234 @@
+"""
+Listing-page parsers, independent of any WebDriver.
+
+Each parser takes the raw HTML of a fully scrolled listing page and returns
+the event dicts the scrapers produce, so they can be run (and benchmarked)
+on saved pages as well as on a live `page_source`.
+"""
+import re
+from collections import Counter
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from utils.cleaner import clean_text
+from utils.instrumentation import get_logger, record_parse
+
+log = get_logger(__name__)
+
+
+def parse_devfolio(html_content, base_url="https://devfolio.co/", on_event=None):
+    """Extract Devfolio events from a fully loaded listing page's HTML."""
+    all_hackathons = []
+    processed_urls = set()
+    soup = BeautifulSoup(html_content, 'lxml')
+    hackathon_links = soup.find_all('a', class_='bnxtME')
+    log.debug("Found %d potential Devfolio listings.", len(hackathon_links))
+    dropped = Counter()
+    errors = 0
+
+    for link_tag in hackathon_links:
+        card = link_tag.find_parent('div', class_=lambda x: x and x.startswith('CompactHackathonCard__Card-sc-'))
+        if not card:
+             card = link_tag.find_parent('div', class_=lambda x: x and x.startswith('sc-'))
+        if not card: dropped['no_card'] += 1; continue
+
+        event_data = {'source': 'Devfolio'}
+
+        try:
+            raw_url = link_tag.get('href')
+            if not raw_url: dropped['no_url'] += 1; continue
+            event_data['url'] = urljoin(base_url, raw_url)
+            if event_data['url'] in processed_urls: dropped['duplicate'] += 1; continue
+            processed_urls.add(event_data['url'])
+
+            title_tag = link_tag.find('h3')
+            event_data['title'] = clean_text(title_tag.get_text()) if title_tag else 'N/A'
+            if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+            status_tags = card.find_all('p', class_='ifkmYk')
+            statuses = [clean_text(tag.get_text()) for tag in status_tags if clean_text(tag.get_text())]
+            event_data['status_mode'] = ', '.join(statuses) if statuses else 'N/A'
+
+            event_data['prize_info'] = 'N/A (Details on event page)'
+            event_data['participants_count'] = 'N/A (Details on event page)'
+            event_data['host_name'] = 'N/A (Details on event page)'
+            event_data['dates'] = 'N/A (Details on event page)'
+            event_data['themes_tags'] = 'N/A (Details on event page)'
+            event_data['location_mode'] = 'Online/Offline (Check Status/Mode)'
+
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Devfolio card (URL: %s): %s", event_data.get('url', 'Unknown'), e)
+    record_parse('Devfolio', len(hackathon_links), dropped, errors)
+    return all_hackathons
+
+
+def parse_devpost(html_content, base_url="https://devpost.com/", on_event=None):
+    """Extract Devpost events from a fully loaded listing page's HTML."""
+    all_hackathons = []
+    processed_urls = set()
+    soup = BeautifulSoup(html_content, 'lxml')
+    hackathon_tiles = soup.select('div.hackathon-tile')
+    log.debug("Found %d potential Devpost tiles.", len(hackathon_tiles))
+    dropped = Counter()
+    errors = 0
+
+    for tile in hackathon_tiles:
+        event_data = {'source': 'Devpost'}
+
+        try:
+            anchor = tile.find('a', class_='tile-anchor')
+            if not anchor or not anchor.has_attr('href'): dropped['no_url'] += 1; continue
+
+            relative_url = anchor['href']
+            event_data['url'] = urljoin(base_url, relative_url.split('?')[0])
+            if event_data['url'] in processed_urls: dropped['duplicate'] += 1; continue
+            processed_urls.add(event_data['url'])
+
+            # Initialize fields
+            event_data['title'] = 'N/A'
+            event_data['status_label'] = 'N/A'
+            event_data['location_mode'] = 'N/A'
+            event_data['prize_info'] = 'N/A'
+            event_data['participants_count'] = 'N/A'
+            event_data['host_name'] = 'N/A'
+            event_data['dates'] = 'N/A'
+            event_data['themes_tags'] = 'N/A'
+
+            main_content = anchor.find('div', class_='main-content')
+            if main_content:
+                content_div = main_content.find('div', class_='content')
+                if content_div:
+                     title_tag = content_div.find('h3', class_='mb-4')
+                     event_data['title'] = clean_text(title_tag.get_text()) if title_tag else 'N/A'
+                     if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+                     info_row = content_div.find('div', class_='flex-row') # Simplified
+                     if info_row:
+                         status_tag = info_row.find('div', class_='status-label')
+                         event_data['status_label'] = clean_text(status_tag.get_text()) if status_tag else 'N/A'
+
+                         location_text = 'N/A'
+                         mode_text = 'N/A'
+                         location_icon_div = info_row.find('div', class_='info-with-icon')
+                         if location_icon_div:
+                             icon = location_icon_div.find('i')
+                             info_span = location_icon_div.find('span')
+                             if icon and info_span:
+                                 location_text = clean_text(info_span.get_text())
+                                 mode_text = 'Online' if 'fa-globe' in icon.get('class', []) else \
+                                             ('In-Person' if 'fa-map-marker-alt' in icon.get('class', []) else 'Hybrid/Unknown')
+                         event_data['location_mode'] = f"{mode_text} - {location_text}" if location_text != 'N/A' else mode_text
+
+                     pnp_div = content_div.find('div', class_='prizes-and-participants')
+                     if pnp_div:
+                         prize_tag = pnp_div.find('span', class_='prize-amount')
+                         event_data['prize_info'] = clean_text(prize_tag.get_text()) if prize_tag else 'N/A'
+                         partic_tag = pnp_div.find('div', class_='participants')
+                         strong_tag = partic_tag.find('strong') if partic_tag else None
+                         event_data['participants_count'] = clean_text(strong_tag.get_text()) if strong_tag else 'N/A'
+
+            side_info = anchor.find('div', class_='side-info')
+            if side_info:
+                 host_tag = side_info.find('span', class_='host-label')
+                 event_data['host_name'] = clean_text(host_tag['title']) if host_tag and host_tag.has_attr('title') else (clean_text(host_tag.get_text()) if host_tag else 'N/A')
+                 sub_period_tag = side_info.find('div', class_='submission-period')
+                 event_data['dates'] = clean_text(sub_period_tag.get_text()) if sub_period_tag else 'N/A'
+                 theme_tags_elements = side_info.select('span.theme-label')
+                 themes_list = [clean_text(tag['title']) for tag in theme_tags_elements if tag.has_attr('title')]
+                 event_data['themes_tags'] = ', '.join(themes_list) if themes_list else 'N/A'
+
+            event_data['status_mode'] = f"{event_data.get('status_label', 'N/A')} ({event_data.get('location_mode', 'N/A')})"
+            all_hackathons.append(event_data)
+            if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Devpost tile (URL: %s): %s", event_data.get('url', 'Unknown'), e)
+    record_parse('Devpost', len(hackathon_tiles), dropped, errors)
+    return all_hackathons
+
+
+def parse_unstop(html_content, base_url="https://unstop.com/", on_event=None):
+    """Extract Unstop events from a fully loaded listing page's HTML."""
+    all_hackathons = []
+    processed_ids = set()
+    soup = BeautifulSoup(html_content, 'lxml')
+    listings = soup.select('app-competition-listing div.single_profile')
+    log.debug("Found %d potential Unstop listings.", len(listings))
+    dropped = Counter()
+    errors = 0
+
+    for profile_div in listings:
+        event_data = {'source': 'Unstop'}
+
+        try:
+             comp_id = None
+             comp_id_match = re.search(r'i_(\d+)_', profile_div.get('id', ''))
+             if comp_id_match: comp_id = comp_id_match.group(1)
+             else:
+                class_list = profile_div.get('class', [])
+                for cls in class_list:
+                    if cls.startswith('opp_') and cls.split('_')[-1].isdigit():
+                        comp_id = cls.split('_')[-1]; break
+             if not comp_id or comp_id in processed_ids: dropped['duplicate' if comp_id else 'no_id'] += 1; continue
+             processed_ids.add(comp_id)
+             event_data['url'] = urljoin(base_url, f"o/{comp_id}")
+
+             content_div = profile_div.find('div', class_='content')
+             if not content_div: dropped['no_content'] += 1; continue
+
+             title_tag = content_div.find('h2', class_='double-wrap')
+             event_data['title'] = clean_text(title_tag.get_text()) if title_tag else 'N/A'
+             if event_data['title'] == 'N/A': dropped['no_title'] += 1; continue
+
+             org_tag = content_div.find('p')
+             event_data['host_name'] = clean_text(org_tag.get_text()) if org_tag else 'N/A'
+
+             event_data['prize_info'] = 'N/A'
+             event_data['participants_count'] = 'N/A'
+             event_data['dates'] = 'N/A'
+             event_data['themes_tags'] = 'N/A'
+             event_data['status_mode'] = 'Online (typically)' # Unstop is mostly online
+             event_data['location_mode'] = 'Online (typically)'
+
+             other_fields_div = content_div.find('div', class_='other_fields')
+             if other_fields_div:
+                 seperate_boxes = other_fields_div.find_all('div', class_='seperate_box', recursive=False)
+                 for box in seperate_boxes:
+                     box_text = clean_text(box.get_text())
+                     if not box_text: continue
+
+                     img_alt = box.find('img')['alt'] if box.find('img') and box.find('img').has_attr('alt') else ''
+
+                     if 'prize' in box.get('class', []) or 'Prize money' in img_alt:
+                         prize_text_cleaned = re.sub(r'^\s*🏆\s*', '', box_text).strip()
+                         event_data['prize_info'] = prize_text_cleaned if prize_text_cleaned else box_text
+                     elif img_alt == 'group' or 'Registered' in box_text:
+                         match = re.search(r'([\d,]+)\s+Registered', box_text)
+                         event_data['participants_count'] = match.group(1).replace(',', '') if match else box_text
+                     elif img_alt == 'schedule' or any(k in box_text for k in ['ago', 'left', 'day']):
+                         event_data['dates'] = box_text # This is "time left" or similar
+
+             skills_div = content_div.find('div', class_='skills')
+             if skills_div:
+                 tag_elements = skills_div.select('un-chip-items span.chip_text')
+                 tags_list = [clean_text(tag.get_text()) for tag in tag_elements]
+                 if tags_list: event_data['themes_tags'] = ', '.join(tags_list)
+
+             all_hackathons.append(event_data)
+             if on_event: on_event(event_data)
+        except Exception as e:
+            errors += 1
+            log.warning("Error processing one Unstop listing (ID: %s): %s", event_data.get('url', 'Unknown').split('/')[-1], e)
+    record_parse('Unstop', len(listings), dropped, errors)
+    return all_hackathons
+
+
+PARSERS = {
+    "Devfolio": parse_devfolio,
+    "Devpost": parse_devpost,
+    "Unstop": parse_unstop,
+}
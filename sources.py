@@ -0,0 +1,108 @@
+"""
+Built-in listing sources.
+
+Each site is a declarative SourceSpec registered in REGISTRY; the
+orchestrator in master_scraper.py runs whatever is registered. To add a
+platform, write its parser(s), register a spec here or in a module of your
+own, and list that module in SCRAPER_SOURCE_MODULES:
+
+    # my_sources.py
+    from sources import REGISTRY, SourceSpec
+    REGISTRY.register(SourceSpec(name="MLH", base_url="https://mlh.io/", ...))
+
+Base URLs can be overridden per source with SCRAPER_<SOURCE>_URL.
+"""
+import importlib
+import os
+import re
+from urllib.parse import urljoin
+
+import browser_extractors
+import detail_parsers
+import fast_parsers
+import parsers
+from utils.direct_fetch import fetch_devpost, fetch_unstop
+from utils.source_registry import SourceRegistry, SourceSpec
+
+REGISTRY = SourceRegistry()
+
+
+def base_url_for(name, default):
+    return os.environ.get(f"SCRAPER_{name.upper()}_URL", default)
+
+
+def extractors_for(name):
+    return {"lxml": fast_parsers.PARSERS[name], "bs4": parsers.PARSERS[name]}
+
+
+def devfolio_card_key(href, base_url):
+    return urljoin(base_url, href)
+
+
+def devpost_card_key(href, base_url):
+    return urljoin(base_url, href.split('?')[0])
+
+
+def unstop_card_key(element_id, base_url):
+    comp_id_match = re.search(r'i_(\d+)_', element_id)
+    return f"unstop:{comp_id_match.group(1)}" if comp_id_match else None
+
+
+REGISTRY.register(SourceSpec(
+    name="Devfolio",
+    base_url=base_url_for("Devfolio", "https://devfolio.co/"),
+    listing_path="/hackathons",
+    wait_selector="a.bnxtME",
+    wait_for_visible=False,
+    card_selector="a.bnxtME",
+    max_scroll_rounds=4,
+    known_card_selector="a.bnxtME",
+    known_card_attribute="href",
+    card_key=devfolio_card_key,
+    extractors=extractors_for("Devfolio"),
+    browser_extractor=browser_extractors.EXTRACTORS["Devfolio"],
+    detail_parser=detail_parsers.DETAIL_PARSERS["Devfolio"],
+))
+
+REGISTRY.register(SourceSpec(
+    name="Devpost",
+    base_url=base_url_for("Devpost", "https://devpost.com/"),
+    listing_path="/hackathons",
+    wait_selector="div.hackathon-tile",
+    card_selector="div.hackathon-tile",
+    load_more_selector="a.load-more-challenges",
+    known_card_selector="div.hackathon-tile a.tile-anchor",
+    known_card_attribute="href",
+    card_key=devpost_card_key,
+    extractors=extractors_for("Devpost"),
+    browser_extractor=browser_extractors.EXTRACTORS["Devpost"],
+    direct_fetch=fetch_devpost,
+))
+
+REGISTRY.register(SourceSpec(
+    name="Unstop",
+    base_url=base_url_for("Unstop", "https://unstop.com/"),
+    listing_path="/hackathons",
+    ready_selectors=("div.user_list",),
+    wait_selector="app-competition-listing div.single_profile",
+    card_selector="app-competition-listing div.single_profile",
+    known_card_selector="app-competition-listing div.single_profile",
+    known_card_attribute="id",
+    card_key=unstop_card_key,
+    blocked_markers=("Just a moment...", "Cloudflare"),
+    extractors=extractors_for("Unstop"),
+    browser_extractor=browser_extractors.EXTRACTORS["Unstop"],
+    direct_fetch=fetch_unstop,
+))
+
+
+def load_source_modules(module_names=None):
+    """Import extra modules that register their own sources (SCRAPER_SOURCE_MODULES, comma-separated)."""
+    if module_names is None:
+        module_names = os.environ.get("SCRAPER_SOURCE_MODULES", "")
+    for module_name in (name.strip() for name in module_names.split(',')):
+        if module_name:
+            importlib.import_module(module_name)
+
+
+load_source_modules()
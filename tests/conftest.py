@@ -0,0 +1,70 @@
+import dataclasses
+import os
+import sys
+import tempfile
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'fixtures'))
+
+# Keep the event store that scrapes write to out of the working tree.
+os.environ.setdefault("SCRAPER_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="scraper-tests-"), "events.db"))
+os.environ.setdefault("SCRAPER_SCHEDULER", "0")
+os.environ.setdefault("SCRAPER_ENRICH_LIMIT", "0")
+os.environ.setdefault("SCRAPER_LOG_LEVEL", "WARNING")
+
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/"
+
+
+@pytest.fixture
+def recorded_api():
+    """Base URL of fixtures/standin_server.py serving the recorded Devpost and Unstop JSON."""
+    from standin_server import make_server
+
+    server = make_server()
+    yield serve(server)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def standin_sites():
+    """The generated stand-in sites; yields {source: server}."""
+    from standin_sites import start_sites
+
+    servers = start_sites(cards=60)
+    yield servers
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def http_sources(monkeypatch):
+    """
+    Replace the registered sources with made-up HTTP-only ones for runscraper().
+    Call with {name: fetch(fetcher, base_url)} and optional per-name SourceSpec overrides.
+    There is no browser to fall back to: acquiring a driver fails.
+    """
+    import master_scraper
+
+    class NoBrowser:
+        def acquire(self, timeout=None):
+            raise RuntimeError("No browser in tests")
+
+    def install(fetchers, **overrides):
+        template = master_scraper.REGISTRY.get('Unstop')
+        specs = [dataclasses.replace(template, name=name, direct_fetch=fetch, **overrides.get(name, {}))
+                 for name, fetch in fetchers.items()]
+        monkeypatch.setattr(master_scraper.REGISTRY, 'select',
+                            lambda names=None: [spec for spec in specs if not names or spec.name in names])
+        monkeypatch.setattr(master_scraper, 'resolve_driver_path', lambda: None)
+        monkeypatch.setattr(master_scraper, 'DRIVER_POOL', NoBrowser())
+        return specs
+    return install
@@ -0,0 +1,51 @@
+import json
+
+import master_scraper
+from browser_extractors import build_devfolio, build_devpost, build_unstop
+from sources import REGISTRY
+
+TILE = ['https://hack-1.devpost.com/?ref=x', ['Green Hack', ['5 days left', ['Online', ['fas', 'fa-globe']]], ['$1,000', '120']],
+        ['Host Org', 'Host Org', True, 'Oct 01 - Nov 01, 2026', ['Web']]]
+
+
+def test_devpost_row_building():
+    events = build_devpost([TILE])
+    assert events == [{
+        'source': 'Devpost', 'url': 'https://hack-1.devpost.com/', 'title': 'Green Hack', 'status_label': '5 days left',
+        'location_mode': 'Online - Online', 'prize_info': '$1,000', 'participants_count': '120', 'host_name': 'Host Org',
+        'dates': 'Oct 01 - Nov 01, 2026', 'themes_tags': 'Web', 'status_mode': '5 days left (Online - Online)',
+    }]
+
+
+def test_tile_without_anchor_is_dropped_not_fatal():
+    assert len(build_devpost([[None, None, None], TILE])) == 1
+    assert len(build_devpost([[None, None], TILE])) == 1 # rows from an older script
+
+
+def test_malformed_rows_are_skipped_by_every_builder():
+    assert build_devfolio([None, ['/a'], ['/b', 'Title', []]], 'https://devfolio.co/')[0]['title'] == 'Title'
+    assert len(build_unstop([['i_1_1'], ['i_2_1', [], ['Title', 'Org', None, None]]])) == 1
+
+
+class _Driver:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute_script(self, script):
+        return json.dumps(self.rows)
+
+
+def test_events_are_emitted_once_after_the_whole_build():
+    emitted, state = [], {'stages': {}}
+    events = master_scraper.extract_in_browser(REGISTRY.get('Devpost'), _Driver([[None, None, None], TILE]),
+                                               'https://devpost.com/', emitted.append, state)
+    assert len(events) == len(emitted) == 1
+    assert state['extraction']['mode'] == 'browser'
+
+
+def test_nothing_is_emitted_when_extraction_falls_back():
+    emitted, state = [], {'stages': {}}
+    events = master_scraper.extract_in_browser(REGISTRY.get('Devpost'), _Driver({'not': 'rows'}),
+                                               'https://devpost.com/', emitted.append, state)
+    assert events == emitted == []
+    assert 'fallback_reason' in state['extraction']
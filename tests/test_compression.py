@@ -0,0 +1,29 @@
+import pytest
+
+from utils.event_index import EventIndex
+from utils.normalize import normalize_event
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, 'event_index', EventIndex())
+    monkeypatch.setattr(app.scrape_cache, 'ensure_fresh', lambda sources=None: {})
+    monkeypatch.setattr(app, 'COMPRESS_MIN_BYTES', 0)
+    app.event_index.update('Devpost', [normalize_event({
+        'source': 'Devpost', 'title': f'Hack {i}', 'url': f'https://hack-{i}.devpost.com/', 'prize_info': f'${i}00',
+    }) for i in range(20)])
+    return app.app.test_client()
+
+
+def test_events_etag_is_weak_and_validates_every_encoding(client):
+    gzipped = client.get('/events', headers={'Accept-Encoding': 'gzip'})
+    plain = client.get('/events', headers={'Accept-Encoding': 'identity'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in plain.headers
+    assert gzipped.headers['ETag'].startswith('W/') and gzipped.headers['ETag'] == plain.headers['ETag']
+    for encoding in ('gzip', 'identity'):
+        revalidated = client.get('/events', headers={'Accept-Encoding': encoding, 'If-None-Match': plain.headers['ETag']})
+        assert revalidated.status_code == 304
+        assert revalidated.headers['ETag'] == plain.headers['ETag']
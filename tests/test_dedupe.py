@@ -0,0 +1,36 @@
+from utils.dedupe import dedupe_events
+
+
+def event(source, title, url, **fields):
+    return dict({'source': source, 'title': title, 'url': url, 'host_name': 'N/A', 'prize_info': 'N/A'}, **fields)
+
+
+def test_same_hackathon_on_two_sources_is_merged():
+    events = [
+        event('Devpost', 'Climate Code Hackathon 2026', 'https://a/1', prize_info='$5,000'),
+        event('Unstop', 'Climate Code 2026', 'https://b/1', host_name='Green Org'),
+    ]
+    merged, count = dedupe_events(events)
+    assert count == 1
+    assert len(merged) == 1
+    assert merged[0]['sources'] == ['Devpost', 'Unstop']
+    assert merged[0]['source_urls'] == {'Devpost': 'https://a/1', 'Unstop': 'https://b/1'}
+    assert merged[0]['prize_info'] == '$5,000'
+    assert merged[0]['host_name'] == 'Green Org'
+
+
+def test_numbered_titles_are_never_merged():
+    events = [event('Devpost', 'Open Hack 12', 'https://a/12'), event('Unstop', 'Open Hack 13', 'https://b/13')]
+    assert dedupe_events(events)[1] == 0
+
+
+def test_same_source_listings_are_kept_apart():
+    events = [event('Devpost', 'Quantum Build', 'https://a/1'), event('Devpost', 'Quantum Build', 'https://a/2')]
+    merged, count = dedupe_events(events)
+    assert count == 0
+    assert len(merged) == 2
+
+
+def test_unrelated_titles_are_kept():
+    events = [event('Devpost', 'Quantum Build', 'https://a/1'), event('Unstop', 'Health Fin Sprint', 'https://b/1')]
+    assert dedupe_events(events)[1] == 0
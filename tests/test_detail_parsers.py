@@ -0,0 +1,99 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from detail_parsers import parse_devfolio_detail
+from utils.enrichment import DetailFetcher, DetailFetchError, apply_details
+
+
+def page(json_ld=None, next_data=None):
+    scripts = ''
+    if json_ld is not None:
+        scripts += f'<script type="application/ld+json">{json.dumps(json_ld)}</script>'
+    if next_data is not None:
+        scripts += f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+    return f'<html><head>{scripts}</head><body></body></html>'
+
+
+HACKATHON = {
+    "name": "Green Hack", "starts_at": "2026-10-01T00:00:00Z", "ends_at": "2026-10-03T00:00:00Z",
+    "prizes": [{"amount": 500, "currency": "usd"}, {"amount": "1500", "currency": "usd"}],
+    "themes": [{"theme": {"name": "Climate"}}, {"name": "Web"}], "participants_count": 1200, "is_online": True,
+    "hackathon_setting": {"organizer_name": "Green Org"},
+}
+
+
+def test_next_data_fields():
+    fields = parse_devfolio_detail(page(next_data={"props": {"pageProps": {"hackathon": HACKATHON}}}))
+    assert fields == {
+        'dates': 'Oct 01, 2026 - Oct 03, 2026', 'prize_info': '2,000 USD', 'themes_tags': 'Climate, Web',
+        'participants_count': '1,200', 'location_mode': 'Online', 'host_name': 'Green Org',
+    }
+
+
+def test_json_ld_event_fields_ignore_the_ticket_price():
+    fields = parse_devfolio_detail(page(json_ld={
+        "@type": "Event", "startDate": "2026-10-01", "endDate": "2026-10-02", "organizer": {"name": "Org"},
+        "location": {"@type": "VirtualLocation"}, "offers": {"price": "0", "priceCurrency": "USD"},
+    }))
+    assert fields == {'host_name': 'Org', 'dates': 'Oct 01, 2026 - Oct 02, 2026', 'location_mode': 'Online'}
+
+
+@pytest.mark.parametrize("json_ld, next_data", [
+    (42, None),
+    ("just a string", None),
+    ([1, {"@type": "Event", "organizer": "not a dict"}], None),
+    (None, {"hackathon": dict(HACKATHON, prizes=[{"amount": "TBA"}], hackathon_setting="x", themes="Web")}),
+])
+def test_malformed_documents_do_not_raise(json_ld, next_data):
+    fields = parse_devfolio_detail(page(json_ld, next_data))
+    assert 'prize_info' not in fields
+
+
+def test_empty_page():
+    assert parse_devfolio_detail('') == {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'<html></html>'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def detail_page_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/hackathon"
+    server.shutdown()
+    server.server_close()
+
+
+def test_parser_errors_become_detail_fetch_errors(detail_page_url):
+    def broken(html):
+        raise KeyError('amount')
+
+    with pytest.raises(DetailFetchError):
+        DetailFetcher().fetch(detail_page_url, broken)
+
+
+def test_parser_errors_keep_cached_details(detail_page_url):
+    fetcher = DetailFetcher(ttl=0)
+    assert fetcher.fetch(detail_page_url, lambda html: {'host_name': 'Org'}) == ({'host_name': 'Org'}, 'fetched')
+    assert fetcher.fetch(detail_page_url, lambda html: 1 / 0) == ({'host_name': 'Org'}, 'stale')
+
+
+def test_apply_details_fills_only_placeholders():
+    event = {'source': 'Devfolio', 'url': 'https://x', 'title': 'T', 'host_name': 'Known', 'prize_info': 'N/A',
+             'dates': 'N/A (Details on event page)', 'location_mode': 'Online/Offline (Check Status/Mode)'}
+    enriched = apply_details(event, {'host_name': 'Other', 'prize_info': '2,000 USD', 'location_mode': 'Online'})
+    assert enriched['host_name'] == 'Known'
+    assert (enriched['prize_amount'], enriched['prize_currency'], enriched['mode']) == (2000, 'USD', 'online')
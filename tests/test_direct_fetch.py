@@ -0,0 +1,68 @@
+import dataclasses
+
+import pytest
+
+from utils.direct_fetch import DirectFetcher, DirectFetchError, fetch_devpost, fetch_unstop
+
+
+def test_devpost_reads_every_recorded_page(recorded_api):
+    events = fetch_devpost(DirectFetcher(), recorded_api)
+    assert len(events) == 14
+    assert len({event['url'] for event in events}) == 14
+    assert all(event['source'] == 'Devpost' and event['title'] != 'N/A' for event in events)
+    assert all(event['status_mode'] == f"{event['status_label']} ({event['location_mode']})" for event in events)
+
+
+def test_unstop_reads_every_recorded_page(recorded_api):
+    events = fetch_unstop(DirectFetcher(), recorded_api)
+    assert len(events) == 25
+    assert all(event['url'].startswith(recorded_api + 'o/') for event in events)
+
+
+def test_pagination_follows_the_stand_in_page_count(standin_sites):
+    base_url = f"http://127.0.0.1:{standin_sites['unstop'].server_port}/"
+    events = fetch_unstop(DirectFetcher(), base_url)
+    assert len(events) == 60
+    assert standin_sites['unstop'].site.counts['api'] == 4 # 60 records at 18 per page
+
+
+def test_max_pages_caps_the_fetch(standin_sites):
+    base_url = f"http://127.0.0.1:{standin_sites['devpost'].server_port}/"
+    assert len(fetch_devpost(DirectFetcher(max_pages=2), base_url)) == 18
+
+
+def test_missing_endpoint_raises_direct_fetch_error(recorded_api):
+    with pytest.raises(DirectFetchError):
+        DirectFetcher().get_json(recorded_api + 'api/unknown')
+
+
+def test_bot_challenge_raises_direct_fetch_error(standin_sites):
+    server = standin_sites['devpost']
+    server.site.challenge_rate = 1.0
+    with pytest.raises(DirectFetchError):
+        fetch_devpost(DirectFetcher(), f"http://127.0.0.1:{server.server_port}/")
+
+
+def test_runscraper_uses_the_http_path_against_the_stand_in(recorded_api, monkeypatch):
+    import master_scraper
+
+    specs = [dataclasses.replace(master_scraper.REGISTRY.get(name), base_url=recorded_api) for name in ('Devpost', 'Unstop')]
+    monkeypatch.setattr(master_scraper.REGISTRY, 'select', lambda names=None: specs)
+    monkeypatch.setattr(master_scraper, 'resolve_driver_path', lambda: None)
+    result = master_scraper.runscraper(use_direct=True, incremental=False)
+    sources = result['timings']['sources']
+    assert {name: (timing['status'], timing['backend'], timing['events']) for name, timing in sources.items()} == {
+        'Devpost': ('ok', 'http', 14), 'Unstop': ('ok', 'http', 25)}
+    assert len({event['url'] for event in result['events']}) == 39
+
+
+def test_sessions_are_reused_across_fetches_and_closed_on_shutdown(standin_sites):
+    base_url = f"http://127.0.0.1:{standin_sites['unstop'].server_port}/"
+    fetcher = DirectFetcher(max_workers=2)
+    for _ in range(3):
+        assert len(fetch_unstop(fetcher, base_url)) == 60
+    sessions = list(fetcher._sessions._sessions)
+    assert 1 <= len(sessions) <= 2
+    fetcher.shutdown()
+    assert fetcher._sessions._sessions == []
+    assert all(len(session.get_adapter('http://').poolmanager.pools) == 0 for session in sessions)
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from utils.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.quit_calls = 0
+        self.visited = []
+        self.cookies_cleared = 0
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def created():
+    return []
+
+
+@pytest.fixture
+def pool(created):
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+    return DriverPool(factory, size=2, max_uses=2)
+
+
+def test_released_drivers_are_reset_and_reused(pool, created):
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    assert len(created) == 1
+    assert driver.cookies_cleared == 1 and driver.visited == ['about:blank']
+
+
+def test_drivers_are_recycled_after_max_uses(pool, created):
+    for _ in range(3):
+        pool.release(pool.acquire())
+    assert len(created) == 2
+    assert created[0].quit_calls == 1 and created[1].quit_calls == 0
+
+
+def test_unhealthy_idle_driver_is_replaced(pool, created):
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.healthy = False
+    replacement = pool.acquire()
+    assert replacement is not driver and driver.quit_calls == 1
+    assert pool.stats()['created'] == 1
+
+
+def test_acquire_times_out_when_every_driver_is_leased(pool):
+    pool.acquire()
+    pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+
+def test_shutdown_while_a_driver_is_starting_quits_it():
+    starting, finish = threading.Event(), threading.Event()
+    driver = FakeDriver()
+
+    def slow_factory():
+        starting.set()
+        finish.wait(5)
+        return driver
+
+    pool = DriverPool(slow_factory, size=1)
+    outcome = []
+
+    def acquire():
+        try:
+            outcome.append(pool.acquire())
+        except RuntimeError as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    starting.wait(5)
+    pool.shutdown()
+    finish.set()
+    thread.join(5)
+    assert isinstance(outcome[0], RuntimeError)
+    assert driver.quit_calls == 1
+    assert pool.stats()['created'] == 0
+    pool.release(driver)
+    assert pool.stats()['created'] == 0
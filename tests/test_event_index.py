@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.event_index import EventIndex, encode_cursor
+from utils.normalize import normalize_event
+
+NOW = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+def listing(source, index, prize, dates, **fields):
+    return normalize_event(dict({
+        'source': source, 'title': f'Green Hack {index}', 'url': f'https://{source.lower()}.example/{index}',
+        'prize_info': prize, 'dates': dates, 'location_mode': 'Online', 'themes_tags': 'Web, AI',
+    }, **fields), NOW)
+
+
+@pytest.fixture
+def index():
+    index = EventIndex()
+    index.update('Devpost', [listing('Devpost', i, f'${(i + 1) * 100}', f'Oct {i + 1:02d} - Nov {i + 1:02d}, 2026')
+                             for i in range(7)])
+    index.update('Unstop', [listing('Unstop', i, 'N/A', 'N/A', location_mode='In-Person - Pune', themes_tags='AI')
+                            for i in range(3)])
+    return index
+
+
+def test_pages_walk_the_sort_order_without_gaps(index):
+    seen, cursor = [], None
+    while True:
+        page = index.query(sort='prize', descending=True, cursor=cursor, limit=3, now=NOW)
+        seen.extend(event['id'] for event in page['events'])
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 10
+    prizes = [index.get(doc_id)['prize_amount'] for doc_id in seen]
+    assert prizes[:7] == sorted(prizes[:7], reverse=True)
+    assert prizes[7:] == [None] * 3 # events without the sort field come last
+
+
+def test_cursor_from_another_sort_is_rejected(index):
+    cursor = index.query(sort='prize', descending=True, limit=2, now=NOW)['next_cursor']
+    with pytest.raises(ValueError):
+        index.query(sort='ends_at', cursor=cursor, now=NOW)
+    with pytest.raises(ValueError):
+        index.query(sort='prize', cursor=cursor, now=NOW) # same field, other direction
+
+
+def test_cursor_with_mistyped_value_is_rejected(index):
+    with pytest.raises(ValueError):
+        index.query(sort='ends_at', cursor=encode_cursor('ends_at', 500, 'abc'), now=NOW)
+    with pytest.raises(ValueError):
+        index.query(sort='prize', cursor='not-a-cursor', now=NOW)
+
+
+def test_filters(index):
+    assert index.query(sources=['unstop'], now=NOW)['total'] == 3
+    assert index.query(modes=['in-person'], now=NOW)['total'] == 3
+    assert index.query(tags=['web'], now=NOW)['total'] == 7
+    assert index.query(prize_min=300, prize_max=500, now=NOW)['total'] == 3
+    assert index.query(text='hack 2', now=NOW)['total'] == 2
+    assert index.query(statuses=['upcoming'], now=NOW)['total'] == 0
+    assert index.query(statuses=['open'], now=NOW)['total'] == 7
+
+
+def test_range_ending_today_is_open_not_ended():
+    index = EventIndex()
+    index.update('Devpost', [listing('Devpost', 0, '$100', 'Oct 01 - Oct 18, 2026')])
+    now = datetime(2026, 10, 18, 15, tzinfo=timezone.utc)
+    assert index.query(statuses=['open'], now=now)['total'] == 1
+    assert index.query(statuses=['ended'], now=now)['total'] == 0
+
+
+def test_update_replaces_only_one_source(index):
+    assert index.update('Unstop', [listing('Unstop', 0, 'N/A', 'N/A')]) == (0, 1, 2)
+    assert len(index) == 8
+    assert index.update('Unstop', [listing('Unstop', 0, 'N/A', 'N/A')]) == (0, 0, 0)
+
+
+def test_events_endpoint_answers_a_mismatched_cursor_with_400(monkeypatch):
+    import app
+
+    monkeypatch.setattr(app, 'event_index', EventIndex())
+    monkeypatch.setattr(app.scrape_cache, 'ensure_fresh', lambda sources=None: {})
+    app.event_index.update('Devpost', [listing('Devpost', i, f'${i}', 'N/A') for i in range(1, 4)])
+    client = app.app.test_client()
+    cursor = client.get('/events?sort=-prize&limit=1').get_json()['next_cursor']
+    assert client.get(f'/events?sort=-prize&limit=1&cursor={cursor}').status_code == 200
+    assert client.get(f'/events?sort=ends_at&cursor={cursor}').status_code == 400
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import master_scraper
+from utils.event_store import SQLiteEventStore, event_key
+
+
+def listing(index, **fields):
+    return dict({'source': 'Devfolio', 'title': f'Hack {index}', 'url': f'https://hack-{index}.devfolio.co/'}, **fields)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteEventStore(str(tmp_path / "events.db"))
+    yield store
+    store.close()
+
+
+def test_upsert_counts_new_changed_and_unchanged(store):
+    assert store.upsert([listing(1), listing(2)]) == {"new": 2, "changed": 0, "unchanged": 0}
+    assert store.upsert([listing(1), listing(2, prize_info='$500')]) == {"new": 0, "changed": 1, "unchanged": 1}
+    assert store.known([event_key(listing(1)), 'https://elsewhere/']) == {event_key(listing(1))}
+
+
+def test_changed_since_and_retention_window(store):
+    store.upsert([listing(1)])
+    checkpoint = time.time()
+    time.sleep(0.01)
+    store.upsert([listing(1), listing(2)])
+    assert store.changed_since(checkpoint) == {event_key(listing(2))}
+    assert [event['title'] for event in store.events_for_source('Devfolio', checkpoint)] == ['Hack 1', 'Hack 2']
+    assert store.events_for_source('Devfolio', time.time() + 1) == []
+
+
+def test_unstop_events_are_keyed_by_competition_id():
+    assert event_key({'source': 'Unstop', 'url': 'https://unstop.com/o/12345/'}) == 'unstop:12345'
+    assert event_key({'source': 'Devpost', 'url': 'https://a.devpost.com/'}) == 'https://a.devpost.com/'
+
+
+def test_importing_the_scraper_does_not_open_a_store(tmp_path):
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env.pop("SCRAPER_DB_PATH", None)
+    subprocess.run([sys.executable, '-c', 'import master_scraper'], cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / "events.db").exists()
+
+
+def test_naive_since_is_read_as_utc():
+    import app
+
+    assert app.parse_since('2026-10-18T12:00:00') == datetime(2026, 10, 18, 12, tzinfo=timezone.utc).timestamp()
+    assert app.parse_since('2026-10-18T14:00:00+02:00') == app.parse_since('2026-10-18T12:00:00Z')
+    assert app.parse_since('1760788800') == 1760788800.0
+    assert app.parse_window_bound('2026-10-18T12:00:00') == '2026-10-18T12:00:00+00:00'
+
+
+class FakePool:
+    def acquire(self, timeout=None):
+        return object()
+
+    def release(self, driver):
+        pass
+
+    def discard(self, driver):
+        pass
+
+
+@pytest.fixture
+def fake_browser(monkeypatch, tmp_path):
+    """runscraper() on Devfolio with a fake browser; returns the list of incremental flags each scrape got."""
+    listed = [listing(index) for index in range(5)]
+    runs = []
+
+    def scrape_listing(spec, driver, base_url, on_event=None, state=None, incremental=True):
+        runs.append(incremental)
+        # An incremental scrape stops after the first two (already stored) cards.
+        state['scroll'] = {"stopped_early": incremental}
+        return listed[:2] if incremental else list(listed)
+
+    monkeypatch.setattr(master_scraper, '_event_store', SQLiteEventStore(str(tmp_path / "events.db")))
+    monkeypatch.setattr(master_scraper, '_last_full_scroll', {})
+    monkeypatch.setattr(master_scraper, 'scrape_listing', scrape_listing)
+    monkeypatch.setattr(master_scraper, 'DRIVER_POOL', FakePool())
+    monkeypatch.setattr(master_scraper, 'resolve_driver_path', lambda: None)
+    monkeypatch.setattr(master_scraper, 'ENRICH_LIMIT', 0)
+    return runs
+
+
+def test_early_stop_fills_the_rest_of_the_listing_from_the_store(fake_browser):
+    master_scraper.runscraper(sources=['Devfolio'], incremental=True)
+    result = master_scraper.runscraper(sources=['Devfolio'], incremental=True)
+    assert fake_browser == [False, True]
+    assert sorted(event['title'] for event in result['events']) == [f'Hack {index}' for index in range(5)]
+    assert result['timings']['sources']['Devfolio']['store']['from_store'] == 3
+
+
+def test_listing_is_scrolled_to_the_end_once_the_full_scroll_interval_passes(fake_browser, monkeypatch):
+    master_scraper.runscraper(sources=['Devfolio'], incremental=True)
+    master_scraper.runscraper(sources=['Devfolio'], incremental=True)
+    monkeypatch.setitem(master_scraper._last_full_scroll, 'Devfolio',
+                        time.time() - master_scraper.INCREMENTAL_FULL_SCROLL - 1)
+    master_scraper.runscraper(sources=['Devfolio'], incremental=True)
+    assert fake_browser == [False, True, False]
+    assert master_scraper.INCREMENTAL_FULL_SCROLL < master_scraper.INCREMENTAL_RETENTION
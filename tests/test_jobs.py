@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from utils.jobs import JobManager, QueueFull
+
+
+def blocking_scrape(release):
+    def run_scrape(sources, on_event, on_source_done):
+        release.wait(5)
+        for source in sources:
+            on_event({'source': source, 'title': 'Hack'})
+            on_source_done(source, {"status": "ok", "events": 1})
+        return {"total_events": len(sources), "timings": {}}
+    return run_scrape
+
+
+def wait_for_status(jobs, job_id, status, timeout=5):
+    deadline = time.time() + timeout
+    while jobs.describe(job_id)['status'] != status and time.time() < deadline:
+        time.sleep(0.01)
+    return jobs.describe(job_id)
+
+
+@pytest.fixture
+def release():
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+def test_identical_pending_jobs_are_coalesced(release):
+    jobs = JobManager(blocking_scrape(release), max_workers=1)
+    job, coalesced = jobs.submit(['Devpost', 'Unstop'])
+    again, coalesced_again = jobs.submit(['Unstop', 'Devpost'])
+    other, _ = jobs.submit(['Devpost'])
+    assert (coalesced, coalesced_again) == (False, True)
+    assert again is job and other is not job
+    release.set()
+    described = wait_for_status(jobs, job.id, 'done')
+    assert described['total_events'] == 2
+    assert described['sources']['Unstop'] == {"status": "ok", "events": 1}
+    assert jobs.describe(job.id, offset=1)['events'] == [{'source': 'Unstop', 'title': 'Hack'}]
+    assert jobs.submit(['Devpost', 'Unstop'])[1] is False
+
+
+def test_full_queue_raises_queue_full(release):
+    jobs = JobManager(blocking_scrape(release), max_workers=1, max_queue=1)
+    running, _ = jobs.submit(['Devfolio'])
+    wait_for_status(jobs, running.id, 'running')
+    jobs.submit(['Devpost'])
+    with pytest.raises(QueueFull):
+        jobs.submit(['Unstop'])
+
+
+def test_finished_jobs_expire(release):
+    release.set()
+    jobs = JobManager(blocking_scrape(release), result_ttl=0.05, max_results=1)
+    first, _ = jobs.submit(['Devpost'])
+    wait_for_status(jobs, first.id, 'done')
+    second, _ = jobs.submit(['Unstop'])
+    wait_for_status(jobs, second.id, 'done')
+    assert jobs.describe(first.id) is None # over max_results
+    time.sleep(0.1)
+    assert jobs.describe(second.id) is None # past the TTL
+
+
+def test_failed_scrape_marks_the_job_failed():
+    def run_scrape(sources, on_event, on_source_done):
+        raise RuntimeError("no driver")
+
+    jobs = JobManager(run_scrape)
+    job, _ = jobs.submit(['Devpost'])
+    assert wait_for_status(jobs, job.id, 'failed')['error'] == "no driver"
+
+
+@pytest.mark.parametrize("body", [{"sources": [1]}, {"sources": "Devpost"}, {"sources": {"Devpost": True}}, ["Devpost"]])
+def test_create_job_rejects_malformed_sources(body):
+    import app
+
+    response = app.app.test_client().post('/scrape/jobs', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
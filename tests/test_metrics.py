@@ -0,0 +1,58 @@
+import pytest
+
+from utils.instrumentation import STAGE_SECONDS, MetricsRegistry, span
+
+
+def test_counter_and_gauge_render_in_prometheus_text_format():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs", ("source", "status"))
+    pool = registry.gauge("pool_drivers", "Drivers", ("state",))
+    runs.inc(source='Devpost', status='ok')
+    runs.inc(2, source='Devpost', status='ok')
+    runs.inc(source='Say "hi"\n', status='error')
+    pool.set(3, state='size')
+    pool.set(1, state='size')
+    assert registry.render().splitlines() == [
+        "# HELP runs_total Runs",
+        "# TYPE runs_total counter",
+        'runs_total{source="Devpost",status="ok"} 3',
+        'runs_total{source="Say \\"hi\\"\\n",status="error"} 1',
+        "# HELP pool_drivers Drivers",
+        "# TYPE pool_drivers gauge",
+        'pool_drivers{state="size"} 1',
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        'latency_seconds_sum 5.55',
+        'latency_seconds_count 3',
+    ]
+
+
+def test_span_records_the_stage_even_when_it_raises():
+    timings = {}
+    with pytest.raises(ValueError):
+        with span('TestSource', 'parse', timings):
+            raise ValueError
+    assert 'parse' in timings
+    assert 'scraper_stage_seconds_count{source="TestSource",stage="parse"} 1' in STAGE_SECONDS.render()
+
+
+def test_metrics_endpoint():
+    import app
+
+    response = app.app.test_client().get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    body = response.get_data(as_text=True)
+    assert 'scraper_driver_pool_drivers{state="size"}' in body
+    assert 'scraper_jobs{status="queued"} 0' in body
+    assert '# TYPE scraper_http_request_seconds histogram' in body
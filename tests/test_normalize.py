@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.normalize import normalize_event, parse_count, parse_dates, parse_mode, parse_prize
+
+NOW = datetime(2026, 10, 18, 10, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('$50,000', (50000, 'USD')),
+    ('₹ 1,00,000', (100000, 'INR')),
+    ('5,000 USD', (5000, 'USD')),
+    ('EUR 1.5k', (1500, 'EUR')),
+    ('Rs. 2 lakhs', (200000, 'INR')),
+    ('$5 million', (5_000_000, 'USD')),
+    ('$1.5M in prizes', (1_500_000, 'USD')),
+    ('USD 2 mn', (2_000_000, 'USD')),
+    ('€10 thousand', (10_000, 'EUR')),
+    ('₹1 crore', (10_000_000, 'INR')),
+    ('₹2 crores', (20_000_000, 'INR')),
+    ('$5 mentorship', (5, 'USD')),
+    ('1,000 in prizes', (1000, None)),
+    ('Top 3 win $5,000', (5000, 'USD')),
+    ('2 prizes worth $1,000', (1000, 'USD')),
+    ('Prizes TBA 2026', (None, None)),
+    ('Swag and stickers', (None, None)),
+    ('N/A (Details on event page)', (None, None)),
+])
+def test_parse_prize(text, expected):
+    assert parse_prize(text) == expected
+
+
+def test_parse_count():
+    assert parse_count('2,500 Registered') == 2500
+    assert parse_count('N/A') is None
+
+
+def test_date_ranges():
+    assert parse_dates(['Oct 01 - Nov 15, 2026'], NOW) == ('2026-10-01T00:00:00+00:00', '2026-11-15T23:59:59+00:00')
+    assert parse_dates(['Dec 15 - Jan 10, 2026'], NOW)[0] == '2025-12-15T00:00:00+00:00'
+    assert parse_dates(['Starts 12/11/26'], NOW)[0] == '2026-11-12T00:00:00+00:00'
+
+
+@pytest.mark.parametrize("text, ends_at", [
+    ('3 hours left', '2026-10-18T23:59:59+00:00'),
+    ('45 mins left', '2026-10-18T23:59:59+00:00'),
+    ('5 days left', '2026-10-23T23:59:59+00:00'),
+])
+def test_time_left_is_rounded_up_to_the_end_of_the_day(text, ends_at):
+    assert parse_dates([text], NOW) == (None, ends_at)
+    assert datetime.fromisoformat(ends_at) > NOW
+
+
+def test_range_ending_today_is_still_open():
+    ends_at = parse_dates(['Oct 01 - Oct 18, 2026'], NOW)[1]
+    assert ends_at == '2026-10-18T23:59:59+00:00'
+    assert datetime.fromisoformat(ends_at) > NOW
+    assert parse_dates(['Feb 01 - 30, 2026'], NOW)[1] is None
+
+
+def test_parse_mode():
+    assert parse_mode('Online - Online') == 'online'
+    assert parse_mode('In-Person - Berlin') == 'in-person'
+    assert parse_mode('Online, Offline') == 'hybrid'
+    assert parse_mode('Online/Offline (Check Status/Mode)') is None
+
+
+def test_normalize_event_runs_once():
+    event = normalize_event({'prize_info': '$1,000', 'participants_count': '12', 'dates': 'N/A'}, NOW)
+    assert (event['prize_amount'], event['prize_currency'], event['participants']) == (1000, 'USD', 12)
+    event['prize_info'] = '$5'
+    assert normalize_event(event)['prize_amount'] == 1000
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import master_scraper
+
+
+def listings(source, count):
+    def fetch(fetcher, base_url):
+        return [{'source': source, 'title': f'{source} Hack {i}', 'url': f'https://{source.lower()}.example/{i}'}
+                for i in range(count)]
+    return fetch
+
+
+def test_events_from_every_source_are_merged(http_sources):
+    http_sources({'Alpha': listings('Alpha', 3), 'Beta': listings('Beta', 2)})
+    result = master_scraper.runscraper(use_direct=True)
+    assert result['total_events'] == 5
+    assert sorted({event['source'] for event in result['events']}) == ['Alpha', 'Beta']
+    assert {name: timing['status'] for name, timing in result['timings']['sources'].items()} == {'Alpha': 'ok', 'Beta': 'ok'}
+
+
+def test_a_failing_source_does_not_sink_the_others(http_sources):
+    def broken(fetcher, base_url):
+        raise ValueError("listing API changed")
+
+    http_sources({'Alpha': listings('Alpha', 3), 'Broken': broken})
+    result = master_scraper.runscraper(use_direct=True)
+    assert result['total_events'] == 3
+    assert result['timings']['sources']['Broken']['status'] == 'error'
+    assert result['timings']['sources']['Alpha']['status'] == 'ok'
+
+
+def test_a_source_past_its_deadline_is_abandoned(http_sources):
+    release = threading.Event()
+
+    def slow(fetcher, base_url):
+        release.wait(5)
+        return listings('Slow', 2)(fetcher, base_url)
+
+    http_sources({'Alpha': listings('Alpha', 3), 'Slow': slow}, Slow={'timeout': 0.3})
+    streamed = []
+    started = time.time()
+    result = master_scraper.runscraper(use_direct=True, on_event=streamed.append)
+    assert time.time() - started < 3
+    assert result['timings']['sources']['Slow']['status'] == 'timeout'
+    assert result['total_events'] == 3
+    release.set()
+    time.sleep(0.2)
+    assert {event['source'] for event in streamed} == {'Alpha'} # the late source's events never reach the stream
+
+
+def test_sources_share_a_bounded_worker_pool(http_sources):
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def counted(source):
+        def fetch(fetcher, base_url):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return listings(source, 1)(fetcher, base_url)
+        return fetch
+
+    http_sources({name: counted(name) for name in ('A', 'B', 'C', 'D')})
+    result = master_scraper.runscraper(use_direct=True, max_workers=2)
+    assert result['total_events'] == 4
+    assert peak[0] == 2
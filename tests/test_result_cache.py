@@ -0,0 +1,93 @@
+import threading
+import time
+
+from utils.result_cache import ScrapeCache
+
+
+def scrape_result(source_name, events=None, status="ok"):
+    events = [{'source': source_name, 'title': 'Hack', 'url': f'https://{source_name}/1'}] if events is None else events
+    return {"events": events, "timings": {"sources": {source_name: {"status": status, "events": len(events)}}}}
+
+
+def test_miss_then_fresh_then_stale():
+    calls = []
+    cache = ScrapeCache(lambda name: calls.append(name) or scrape_result(name), ['A'], default_ttl=60)
+    first = cache.get()
+    assert first["payload"]["timings"]["sources"]["A"]["cache"] == "miss"
+    assert cache.get()["payload"]["timings"]["sources"]["A"]["cache"] == "fresh"
+    assert calls == ['A']
+
+    cache.ttls['A'] = 0
+    assert cache.get()["payload"]["timings"]["sources"]["A"]["cache"] == "stale"
+    deadline = time.time() + 5
+    while len(calls) < 2 and time.time() < deadline:
+        time.sleep(0.01) # the stale read starts one background refresh
+    assert calls == ['A', 'A']
+
+
+def test_concurrent_misses_share_one_scrape():
+    calls = []
+    release = threading.Event()
+
+    def slow(name):
+        calls.append(name)
+        release.wait(5)
+        return scrape_result(name)
+
+    cache = ScrapeCache(slow, ['A'])
+    threads = [threading.Thread(target=cache.get) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert calls == ['A']
+
+
+def test_failed_refresh_is_not_retried_inside_the_retry_window():
+    calls = []
+
+    def failing(name):
+        calls.append(name)
+        return {"error": "WebDriver setup failed", "details": "no driver", "events": []}
+
+    cache = ScrapeCache(failing, ['A'], retry_after=60)
+    assert cache.get()["payload"]["error"] == "WebDriver setup failed"
+    started = time.time()
+    payload = cache.get()["payload"]
+    assert time.time() - started < 0.5
+    assert payload["error"] == "WebDriver setup failed"
+    assert payload["timings"]["sources"]["A"]["cache"] == "failed"
+    assert calls == ['A']
+
+    cache.get(force_refresh=True)
+    assert calls == ['A', 'A']
+
+
+def test_failed_refresh_keeps_serving_the_last_good_entry():
+    results = [scrape_result('A'), scrape_result('A', status="timeout")]
+    cache = ScrapeCache(lambda name: results.pop(0), ['A'])
+    cache.get()
+    payload = cache.get(force_refresh=True)["payload"]
+    assert payload["total_events"] == 1
+    assert payload["timings"]["sources"]["A"]["last_error"]["error"] == "Scrape timeout"
+
+
+def test_snapshot_round_trip(tmp_path):
+    cache = ScrapeCache(scrape_result, ['A', 'B'])
+    expected = cache.get()
+    path = str(tmp_path / "snapshot.json")
+    cache.save_snapshot(path)
+
+    updated = []
+    restored = ScrapeCache(lambda name: None, ['A', 'B'], on_update=lambda name, events: updated.append(name))
+    assert restored.load_snapshot(path) == 2
+    assert sorted(updated) == ['A', 'B']
+    assert restored.get()["etag"] == expected["etag"]
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "snapshot.json"
+    path.write_text("not json")
+    assert ScrapeCache(scrape_result, ['A']).load_snapshot(str(path)) == 0
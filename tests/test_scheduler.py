@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from utils.scheduler import SourceScheduler
+
+
+def finish(scheduler, source, outcome):
+    scheduler._set(source, last_started=time.time())
+    before = time.time()
+    scheduler._finish(source, outcome)
+    return scheduler.status()[source]['next_run'] - before
+
+
+@pytest.fixture
+def scheduler():
+    return SourceScheduler(lambda name: {"ok": True}, ['Devfolio', 'Unstop'], default_interval=100,
+                           intervals={'Unstop': 50}, jitter=0.1, retry_base=10, max_backoff=35)
+
+
+def test_successful_runs_are_rescheduled_after_the_interval_with_jitter(scheduler):
+    delays = [finish(scheduler, 'Devfolio', {"ok": True, "events": 5}) for _ in range(50)]
+    assert all(89.9 <= delay <= 110.1 for delay in delays)
+    assert len({round(delay, 3) for delay in delays}) > 1
+    assert 44.9 <= finish(scheduler, 'Unstop', {"ok": True}) <= 55.1
+    assert scheduler.status()['Devfolio']['event_count'] == 5
+
+
+def test_failures_back_off_exponentially_up_to_the_cap(scheduler):
+    delays = [finish(scheduler, 'Devfolio', {"ok": False, "error": "blocked"}) for _ in range(4)]
+    for delay, base in zip(delays, (10, 20, 35, 35)):
+        assert base - 0.1 <= delay <= base * 1.1 + 0.1 # jitter only ever delays a retry
+    status = scheduler.status()['Devfolio']
+    assert (status['consecutive_failures'], status['last_error']) == (4, "blocked")
+    finish(scheduler, 'Devfolio', {"ok": True})
+    assert scheduler.status()['Devfolio']['consecutive_failures'] == 0
+
+
+def test_sources_are_ordered_cheapest_first():
+    scheduler = SourceScheduler(lambda name: {"ok": True}, ['Devfolio', 'Devpost', 'Unstop'],
+                                costs={'Devfolio': 10, 'Devpost': 1, 'Unstop': 1.5})
+    assert scheduler.sources == ['Devpost', 'Unstop', 'Devfolio']
+
+
+def test_cheapest_waiting_source_gets_the_free_slot():
+    scheduler = SourceScheduler(lambda name: {"ok": True}, ['Devfolio', 'Devpost'],
+                                costs={'Devfolio': 10, 'Devpost': 1}, max_concurrent=1)
+    assert scheduler._acquire_slot('Devfolio') # free slot, nobody else waiting
+    granted = []
+    threads = [threading.Thread(target=lambda name=name: scheduler._acquire_slot(name) and granted.append(name))
+               for name in ('Devfolio', 'Devpost')]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    scheduler._release_slot()
+    time.sleep(0.1)
+    assert granted == ['Devpost']
+    scheduler._release_slot()
+    for thread in threads:
+        thread.join(5)
+    assert granted == ['Devpost', 'Devfolio']
@@ -0,0 +1,61 @@
+import time
+
+from utils import scrolling
+from utils.scrolling import scroll_until_settled
+
+FAST = {"quiet_window": 0.05, "settle_window": 0.01, "poll_interval": 0.01, "max_seconds": 5}
+
+
+class ListingDriver:
+    """A listing that adds the next batch of cards on every scroll (or "Load more" click)."""
+
+    def __init__(self, batches, load_more=False):
+        self.cards = batches[0]
+        self.batches = list(batches[1:])
+        self.load_more = load_more
+        self.last_mutation = time.time()
+        self.requests = 0
+
+    def execute_script(self, script, *args):
+        if script == scrolling._SCROLL_JS:
+            clicked = self.load_more and bool(self.batches)
+            if self.batches:
+                self.cards += self.batches.pop(0)
+                self.last_mutation = time.time() - 1 # already settled
+                self.requests += 1
+            return clicked
+        if script == scrolling._PROBE_JS:
+            return [self.cards, (time.time() - self.last_mutation) * 1000, self.requests]
+        return None
+
+
+def test_scrolls_until_no_new_cards_appear():
+    driver = ListingDriver([10, 10, 10])
+    result = scroll_until_settled(driver, 'a.card', **FAST)
+    assert (result['cards'], result['rounds'], result['stopped_early']) == (30, 3, False)
+
+
+def test_load_more_clicks_are_counted():
+    driver = ListingDriver([24, 24], load_more=True)
+    result = scroll_until_settled(driver, 'div.tile', load_more_selector='button.more', **FAST)
+    assert (result['cards'], result['load_more_clicks']) == (48, 1)
+
+
+def test_max_rounds_caps_scrolling():
+    driver = ListingDriver([10] * 20)
+    result = scroll_until_settled(driver, 'a.card', max_rounds=4, **FAST)
+    assert (result['cards'], result['rounds']) == (50, 4)
+
+
+def test_stop_when_ends_scrolling_early():
+    driver = ListingDriver([10] * 20)
+    result = scroll_until_settled(driver, 'a.card', stop_when=lambda d: d.cards >= 30, **FAST)
+    assert (result['cards'], result['rounds'], result['stopped_early']) == (30, 2, True)
+
+
+def test_no_fixed_sleep_on_a_quiet_page():
+    driver = ListingDriver([10])
+    started = time.time()
+    result = scroll_until_settled(driver, 'a.card', quiet_window=0.2, poll_interval=0.01)
+    assert result['rounds'] == 1
+    assert time.time() - started < 1
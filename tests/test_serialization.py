@@ -0,0 +1,64 @@
+import pickle
+
+import pytest
+
+from utils.event_record import EventRecord, as_record
+from utils.normalize import normalize_event
+from utils.serialization import dumps, events_from, loads, read_events, to_columns, write_events
+
+
+def event(index, **fields):
+    return as_record(normalize_event(dict({
+        'source': 'Devfolio', 'title': f'Hack {index}', 'url': f'https://hack-{index}.devfolio.co/',
+        'prize_info': 'N/A (Details on event page)', 'location_mode': 'Online/Offline (Check Status/Mode)',
+        'dates': 'Oct 01 - Nov 15, 2026', 'status_label': 'Open',
+    }, **fields)))
+
+
+def test_placeholders_become_none_and_labels_are_interned():
+    first, second = event(1), event(2)
+    assert first['prize_info'] is None and first['location_mode'] is None
+    assert first['status_label'] is second['status_label']
+    assert 'sources' not in first and first.get('sources') is None
+
+
+def test_record_is_immutable_and_replace_builds_a_new_one():
+    record = event(1)
+    with pytest.raises(AttributeError):
+        record.title = 'Other'
+    changed = record.replace(title='Other')
+    assert (record['title'], changed['title']) == ('Hack 1', 'Other')
+
+
+def test_unknown_keys_are_kept_in_extra():
+    record = EventRecord(source='MLH', title='Hack', url='https://mlh.io/1', city='Berlin')
+    assert record['city'] == 'Berlin'
+    assert record.to_dict()['city'] == 'Berlin'
+    assert dict(record)['city'] == 'Berlin'
+
+
+def test_record_serialises_like_its_dict():
+    record = event(1, sources=['Devfolio', 'Devpost'])
+    assert loads(dumps(record)) == record.to_dict()
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_columnar_round_trip():
+    events = [event(1), event(2, prize_info='$500'), EventRecord(source='MLH', title='Hack', city='Berlin')]
+    columns = to_columns(events)
+    assert columns['columns']['source'] == {"values": ['Devfolio', 'MLH'], "codes": [0, 0, 1]}
+    assert 'host_name' not in columns['columns'] # all-null columns are dropped
+    assert events_from(loads(dumps(columns))) == events
+
+
+def test_written_files_round_trip_and_old_row_files_still_load(tmp_path):
+    path = str(tmp_path / "events.json")
+    events = [event(index) for index in range(3)]
+    write_events(path, events)
+    assert read_events(path) == events
+    assert events_from([{'source': 'Devpost', 'title': 'Hack', 'prize_info': '$1,000'}])[0]['prize_amount'] == 1000
+
+
+def test_unknown_columnar_version_is_rejected():
+    with pytest.raises(ValueError):
+        events_from(dict(to_columns([event(1)]), version=99))
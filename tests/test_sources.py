@@ -0,0 +1,68 @@
+import dataclasses
+import threading
+
+import pytest
+
+import master_scraper
+from sources import REGISTRY, load_source_modules
+from utils.source_registry import SourceRegistry
+
+
+def spec(name, **fields):
+    return dataclasses.replace(REGISTRY.get('Unstop'), name=name, **fields)
+
+
+def test_builtin_sources_are_registered_in_order():
+    assert REGISTRY.names() == ('Devfolio', 'Devpost', 'Unstop')
+    assert all(spec.extractors.keys() >= {'lxml', 'bs4'} for spec in REGISTRY)
+
+
+def test_select_is_case_insensitive_and_skips_disabled_sources():
+    registry = SourceRegistry()
+    registry.register(spec('Alpha'))
+    registry.register(spec('Beta', enabled=False))
+    registry.register(spec('Gamma'))
+    assert registry.names() == ('Alpha', 'Gamma')
+    assert [s.name for s in registry.select(['gamma', 'BETA'])] == ['Gamma']
+    assert [s.name for s in registry.select()] == ['Alpha', 'Gamma']
+    assert 'Beta' in registry
+
+
+def test_duplicate_names_are_rejected():
+    registry = SourceRegistry()
+    registry.register(spec('Alpha'))
+    with pytest.raises(ValueError):
+        registry.register(spec('Alpha'))
+
+
+def test_cost_depends_on_the_http_fast_path():
+    http = spec('Alpha', http_cost=1, browser_cost=10)
+    browser_only = spec('Beta', direct_fetch=None, browser_cost=8)
+    assert (http.cost(use_direct=True), http.cost(use_direct=False)) == (1, 10)
+    assert browser_only.cost(use_direct=True) == 8
+
+
+def test_runscraper_starts_the_cheapest_source_first(http_sources):
+    started = []
+    lock = threading.Lock()
+
+    def fetch(name):
+        def run(fetcher, base_url):
+            with lock:
+                started.append(name)
+            return [{'source': name, 'title': f'{name} Hack', 'url': f'https://{name.lower()}.example/1'}]
+        return run
+
+    http_sources({name: fetch(name) for name in ('Costly', 'Cheap', 'Middling')},
+                 Costly={'http_cost': 9}, Cheap={'http_cost': 1}, Middling={'http_cost': 4})
+    result = master_scraper.runscraper(use_direct=True, max_workers=1)
+    assert started == ['Cheap', 'Middling', 'Costly']
+    assert result['timings']['sources']['Cheap']['cost'] == 1
+
+
+def test_extra_source_modules_are_imported(tmp_path, monkeypatch):
+    (tmp_path / "extra_sources_for_test.py").write_text("LOADED = True\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    load_source_modules(" extra_sources_for_test , ")
+    import extra_sources_for_test
+    assert extra_sources_for_test.LOADED
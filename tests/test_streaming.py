@@ -0,0 +1,62 @@
+import dataclasses
+import threading
+import time
+
+import master_scraper
+
+
+def endless_scrape(produced):
+    def scrape(sources, on_event, on_source_done, cancel, **kwargs):
+        count = 0
+        while not cancel.is_set() and count < 100000:
+            on_event({'n': count})
+            count += 1
+        produced.append(count)
+        return {"total_events": count, "timings": {}}
+    return scrape
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_records_end_with_done():
+    records = list(master_scraper.stream_scrape(scrape=lambda **kwargs: {"total_events": 0, "timings": {}}))
+    assert records == [{"type": "done", "total_events": 0, "timings": {}}]
+
+
+def test_closing_the_stream_cancels_the_scrape(monkeypatch):
+    monkeypatch.setattr(master_scraper, 'STREAM_BUFFER', 5)
+    produced = []
+    records = master_scraper.stream_scrape(scrape=endless_scrape(produced))
+    assert next(records)['type'] == 'event'
+    records.close()
+    assert wait_for(lambda: produced)
+    assert produced[0] <= 10
+
+
+def test_a_reader_that_stops_reading_cancels_the_scrape(monkeypatch):
+    monkeypatch.setattr(master_scraper, 'STREAM_BUFFER', 5)
+    monkeypatch.setattr(master_scraper, 'STREAM_SEND_TIMEOUT', 0.2)
+    produced = []
+    records = master_scraper.stream_scrape(scrape=endless_scrape(produced))
+    next(records)
+    assert wait_for(lambda: produced)
+    assert len(list(records)) <= 5
+
+
+def test_runscraper_abandons_sources_on_cancel(monkeypatch):
+    release = threading.Event()
+    spec = dataclasses.replace(master_scraper.REGISTRY.get('Unstop'), direct_fetch=lambda fetcher, base_url: release.wait(5) and [{'source': 'Unstop', 'title': 'T', 'url': 'https://unstop.com/o/1'}])
+    monkeypatch.setattr(master_scraper.REGISTRY, 'select', lambda names=None: [spec])
+    monkeypatch.setattr(master_scraper, 'resolve_driver_path', lambda: None)
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    started = time.time()
+    result = master_scraper.runscraper(sources=['Unstop'], use_direct=True, cancel=cancel)
+    release.set()
+    assert result['timings']['sources']['Unstop']['status'] == 'cancelled'
+    assert time.time() - started < 3
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from utils.work_queue import QueuedScraper, SQLiteWorkQueue
+
+
+def result(source, count=2):
+    events = [{'source': source, 'title': f'Hack {i}', 'url': f'https://{source}/{i}'} for i in range(count)]
+    return {"events": events, "total_events": count,
+            "timings": {"sources": {source: {"status": "ok", "events": count, "seconds": 0.1}}}}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    work_queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), max_attempts=2, retry_base=0)
+    yield work_queue
+    work_queue.close()
+
+
+def test_enqueue_coalesces_pending_tasks(queue):
+    task_id, coalesced = queue.enqueue('Devpost')
+    assert not coalesced
+    assert queue.enqueue('Devpost') == (task_id, True)
+    assert queue.enqueue('Unstop')[0] != task_id
+
+
+def test_lease_complete_and_read_back(queue):
+    task_id, _ = queue.enqueue('Devpost')
+    task = queue.lease('w1')
+    assert (task['id'], task['status'], task['attempts']) == (task_id, 'leased', 1)
+    assert queue.heartbeat(task_id, 'w1')
+    assert queue.complete(task_id, 'w1', result('Devpost'))
+    done = queue.get(task_id)
+    assert done['status'] == 'done'
+    assert [event['title'] for event in done['result']['events']] == ['Hack 0', 'Hack 1']
+    assert queue.stats()['done'] == 1
+
+
+def test_per_source_cap_and_priority(queue):
+    queue.enqueue('Devfolio', priority=3)
+    queue.enqueue('Devpost', priority=1)
+    assert queue.lease('w1', default_cap=1)['source'] == 'Devpost' # cheapest first
+    assert queue.lease('w2', default_cap=1)['source'] == 'Devfolio'
+
+    queue.enqueue('Devpost') # still leased, so this coalesces
+    assert queue.stats()['queued'] == 0
+
+
+def test_cap_blocks_a_second_lease_of_the_same_source(tmp_path):
+    first = SQLiteWorkQueue(str(tmp_path / "q.db"))
+    first.enqueue('Devpost')
+    assert first.lease('w1')
+    # A second task for the same source can only exist once the first is leased and a new one is inserted.
+    first._conn.execute("INSERT INTO tasks (id, source, status, priority, attempts, max_attempts, available_at, created)"
+                        " VALUES ('second', 'Devpost', 'queued', 0, 0, 3, 0, 0)")
+    other_process = SQLiteWorkQueue(str(tmp_path / "q.db"))
+    assert other_process.lease('w2', caps={'Devpost': 1}) is None
+    assert other_process.lease('w2', caps={'Devpost': 2})['id'] == 'second'
+
+
+def test_expired_lease_is_retried_then_failed(queue):
+    task_id, _ = queue.enqueue('Unstop')
+    assert queue.lease('crashed', lease_seconds=0.05)
+    time.sleep(0.1)
+    retry = queue.lease('w2', lease_seconds=0.05)
+    assert (retry['id'], retry['attempts'], retry['error']) == (task_id, 2, 'Lease expired (worker crashed lost)')
+    assert not queue.complete(task_id, 'crashed', result('Unstop')) # the old owner can no longer write back
+    time.sleep(0.1)
+    assert queue.lease('w3') is None
+    assert queue.get(task_id)['status'] == 'failed'
+
+
+def test_fail_requeues_until_attempts_run_out(queue):
+    task_id, _ = queue.enqueue('Devpost')
+    queue.lease('w1')
+    assert queue.fail(task_id, 'w1', 'boom')
+    assert queue.get(task_id)['status'] == 'queued'
+    queue.lease('w1')
+    queue.fail(task_id, 'w1', 'boom again')
+    assert (queue.get(task_id)['status'], queue.get(task_id)['error']) == ('failed', 'boom again')
+    assert not queue.fail(task_id, 'w1', 'late')
+
+
+def test_queued_scraper_collects_worker_results(queue):
+    def worker():
+        for _ in range(2):
+            task = None
+            while task is None:
+                task = queue.lease('w1', caps={'Devpost': 1, 'Unstop': 1})
+                time.sleep(0.01)
+            queue.complete(task['id'], 'w1', result(task['source'], count=3))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    done = []
+    outcome = QueuedScraper(queue, poll_interval=0.01, timeout=5).runscraper(
+        ['Devpost', 'Unstop'], on_source_done=lambda source, timing: done.append(source))
+    thread.join(5)
+    assert outcome['total_events'] == 6
+    assert len(outcome['events']) == 6
+    assert sorted(done) == ['Devpost', 'Unstop']
+    assert outcome['timings']['sources']['Devpost']['attempts'] == 1
+
+
+def test_queued_scraper_times_out_without_workers(queue):
+    outcome = QueuedScraper(queue, poll_interval=0.01, timeout=0.05).runscraper(['Devpost'])
+    assert outcome['timings']['sources']['Devpost']['status'] == 'timeout'
+    assert queue.stats()['queued'] == 1
+
+
+def test_stream_in_queue_mode_without_sources_queues_every_source(queue):
+    import master_scraper
+
+    def worker():
+        for _ in master_scraper.SOURCE_NAMES:
+            task = None
+            while task is None:
+                task = queue.lease('w1', caps=dict.fromkeys(master_scraper.SOURCE_NAMES, 1))
+                time.sleep(0.01)
+            queue.complete(task['id'], 'w1', result(task['source'], count=1))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    scraper = QueuedScraper(queue, master_scraper.SOURCE_NAMES, poll_interval=0.01, timeout=5)
+    records = list(master_scraper.stream_scrape(sources=None, scrape=scraper.runscraper))
+    thread.join(5)
+    assert records[-1]['type'] == 'done'
+    assert sorted(record['source'] for record in records if record['type'] == 'summary') == sorted(master_scraper.SOURCE_NAMES)
+    assert sum(record['type'] == 'event' for record in records) == len(master_scraper.SOURCE_NAMES)
@@ -1,4 +1,4 @@
-ef clean_text(text: str) -> str | None:
+def clean_text(text: str) -> str | None:
     """
     Collapse whitespace and strip leading/trailing spaces.
     Returns None if text is falsy.
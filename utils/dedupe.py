@@ -0,0 +1,148 @@
+"""
+Cross-source duplicate detection with MinHash signatures and LSH banding.
+
+Titles are reduced to character 3-gram shingles and summarised by a short
+MinHash signature. Events whose signatures collide in at least one LSH band
+become candidate pairs, which keeps the work close to linear in the number
+of events; only those candidates get an exact Jaccard check. Confirmed
+pairs from different sources are merged into one event.
+"""
+import functools
+import random
+import re
+import zlib
+
+from utils.event_record import as_record
+from utils.normalize import is_placeholder
+
+NUM_PERMUTATIONS = 32
+BANDS = 8
+ROWS = NUM_PERMUTATIONS // BANDS # 8 bands of 4 rows: pairs above ~0.6 Jaccard collide with high probability
+TITLE_THRESHOLD = 0.7 # exact title Jaccard needed to merge
+TITLE_THRESHOLD_SAME_HOST = 0.5 # ... or this much when the hosts also match
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601) # fixed seed: signatures must be stable across processes
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9 ]+')
+_NOISE_TOKENS = {'hackathon', 'hackathons', 'the', 'edition', 'online', 'virtual', 'a', 'an', 'of'}
+_YEAR_RE = re.compile(r'^(19|20)\d\d$')
+
+
+def title_tokens(text):
+    tokens = _NON_WORD_RE.sub(' ', (text or '').lower()).split()
+    return [token for token in tokens if token not in _NOISE_TOKENS and not _YEAR_RE.match(token)]
+
+
+def shingles(text, size=3):
+    compact = ''.join(title_tokens(text))
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+
+@functools.lru_cache(maxsize=65536)
+def _permuted(shingle):
+    # 3-grams repeat heavily across titles, so each one is hashed through the permutations once.
+    value = zlib.crc32(shingle.encode('utf-8'))
+    return tuple((a * value + b) % _PRIME for a, b in _PERMUTATIONS)
+
+
+def minhash(shingle_set):
+    return [min(column) for column in zip(*map(_permuted, shingle_set))]
+
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def _numbers(text):
+    """Non-year numbers in a title ("Hack 12" vs "Hack 13" are different events)."""
+    return {token for token in title_tokens(text) if token.isdigit()}
+
+
+def _host_tokens(event):
+    host = event.get('host_name')
+    return set() if is_placeholder(host) else set(title_tokens(host))
+
+
+def _richness(event):
+    return sum(1 for value in event.values() if value is not None and not is_placeholder(value))
+
+
+def merge_group(events):
+    """Merge duplicates of one hackathon: the most complete listing wins, gaps are filled from the others."""
+    primary = max(events, key=_richness) # max() keeps the first of equally rich events
+    merged = dict(primary)
+    for event in events:
+        if event is primary:
+            continue
+        for field, value in event.items():
+            if field != 'source' and (merged.get(field) is None or is_placeholder(merged.get(field))) \
+                    and value is not None and not is_placeholder(value):
+                merged[field] = value
+    merged['sources'] = [event['source'] for event in events]
+    merged['source_urls'] = {event['source']: event.get('url') for event in events}
+    return as_record(merged)
+
+
+def dedupe_events(events):
+    """
+    Merge events that describe the same hackathon on different sources.
+
+    Returns (events, merged_count). Order follows the first listing of each
+    hackathon; events from the same source are never merged with each other.
+    """
+    signatures = [shingles(event.get('title')) for event in events]
+    sources = [event.get('source') for event in events]
+    parent = list(range(len(events)))
+    group_sources = [{source} for source in sources]
+    host_tokens = {}
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def hosts(index):
+        if index not in host_tokens:
+            host_tokens[index] = _host_tokens(events[index])
+        return host_tokens[index]
+
+    buckets = {}
+    for index, shingle_set in enumerate(signatures):
+        if not shingle_set:
+            continue
+        signature = minhash(shingle_set)
+        # Numbers are part of the bucket key: "Hack 12" and "Hack 13" never become candidates.
+        numbers = frozenset(_numbers(events[index].get('title')))
+        for band in range(BANDS):
+            key = (band, numbers, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            buckets.setdefault(key, []).append(index)
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for position, first in enumerate(members):
+            for second in members[position + 1:]:
+                if sources[first] == sources[second] or (first, second) in checked:
+                    continue
+                checked.add((first, second))
+                root_first, root_second = find(first), find(second)
+                if root_first == root_second or group_sources[root_first] & group_sources[root_second]:
+                    continue
+                similarity = jaccard(signatures[first], signatures[second])
+                if similarity >= TITLE_THRESHOLD or (
+                        similarity >= TITLE_THRESHOLD_SAME_HOST and jaccard(hosts(first), hosts(second)) >= 0.5):
+                    parent[root_second] = root_first
+                    group_sources[root_first] |= group_sources[root_second]
+
+    groups = {}
+    for index in range(len(events)):
+        groups.setdefault(find(index), []).append(events[index])
+    result = [group[0] if len(group) == 1 else merge_group(group) for group in groups.values()]
+    return result, len(events) - len(result)
@@ -0,0 +1,191 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.cleaner import clean_text
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36'
+)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+
+class DirectFetchError(Exception):
+    """Raised when a listing API cannot be used, so the caller can fall back to Selenium."""
+
+
+class SessionPool:
+    """
+    Keep-alive sessions with retrying, pooled adapters. requests.Session is not
+    guaranteed thread-safe, so each thread gets its own; `close` closes them all.
+    """
+
+    def __init__(self, accept, pool_maxsize=4, backoff_factor=0.3):
+        self.accept = accept
+        self.pool_maxsize = pool_maxsize
+        self.backoff_factor = backoff_factor
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=self.backoff_factor, status_forcelist=(429, 500, 502, 503, 504))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_maxsize, max_retries=retry)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({'User-Agent': USER_AGENT, 'Accept': self.accept})
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+class DirectFetcher:
+    """
+    Fetches listing JSON over pooled keep-alive connections and paginates
+    endpoints in parallel. One instance is shared per process: every request
+    runs on its long-lived worker threads, so their sessions (and open
+    connections) are reused from one scrape to the next.
+    """
+
+    def __init__(self, max_workers=4, timeout=10, max_pages=20):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self._sessions = SessionPool('application/json', pool_maxsize=max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="direct-fetch")
+
+    @property
+    def session(self):
+        return self._sessions.get()
+
+    def get_json(self, url, params=None):
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise DirectFetchError(f"GET {url} failed: {e}") from e
+
+    def paginate(self, url, params_for_page, page_count_of):
+        """Fetch page 1, work out how many pages exist, then fetch the rest in parallel (in page order)."""
+        first = self._executor.submit(self.get_json, url, params_for_page(1)).result()
+        pages = min(page_count_of(first), self.max_pages)
+        if pages <= 1:
+            return [first]
+        rest = list(self._executor.map(lambda page: self.get_json(url, params_for_page(page)), range(2, pages + 1)))
+        return [first] + rest
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._sessions.close()
+
+
+def fetch_devpost(fetcher, base_url="https://devpost.com/"):
+    api_url = urljoin(base_url, "/api/hackathons")
+    pages = fetcher.paginate(
+        api_url,
+        lambda page: {'page': page, 'status[]': ['upcoming', 'open']},
+        lambda body: -(-body.get('meta', {}).get('total_count', 0) // max(body.get('meta', {}).get('per_page', 1), 1)),
+    )
+
+    all_hackathons = []
+    processed_urls = set()
+    for body in pages:
+        for record in body.get('hackathons', []):
+            if not record.get('url'):
+                continue
+            url = urljoin(base_url, record['url'].split('?')[0])
+            title = clean_text(record.get('title')) or 'N/A'
+            if url in processed_urls or title == 'N/A':
+                continue
+            processed_urls.add(url)
+
+            location = record.get('displayed_location') or {}
+            location_text = clean_text(location.get('location')) or 'N/A'
+            icon = location.get('icon', '')
+            mode_text = 'Online' if icon == 'globe' else ('In-Person' if icon == 'map-marker-alt' else 'Hybrid/Unknown')
+            location_mode = f"{mode_text} - {location_text}" if location_text != 'N/A' else mode_text
+
+            status_label = clean_text(record.get('time_left_to_submission')) or \
+                (record['open_state'].capitalize() if record.get('open_state') else 'N/A')
+            prize_text = clean_text(HTML_TAG_RE.sub('', record.get('prize_amount') or ''))
+            registrations = record.get('registrations_count')
+            themes_list = [clean_text(theme.get('name')) for theme in record.get('themes', []) if theme.get('name')]
+
+            event_data = {
+                'source': 'Devpost',
+                'url': url,
+                'title': title,
+                'status_label': status_label,
+                'location_mode': location_mode,
+                'prize_info': prize_text or 'N/A',
+                'participants_count': f"{registrations:,}" if isinstance(registrations, int) else 'N/A',
+                'host_name': clean_text(record.get('organization_name')) or 'N/A',
+                'dates': clean_text(record.get('submission_period_dates')) or 'N/A',
+                'themes_tags': ', '.join(themes_list) if themes_list else 'N/A',
+            }
+            event_data['status_mode'] = f"{event_data['status_label']} ({event_data['location_mode']})"
+            all_hackathons.append(event_data)
+    return all_hackathons
+
+
+def fetch_unstop(fetcher, base_url="https://unstop.com/"):
+    api_url = urljoin(base_url, "/api/public/opportunity/search-result")
+    pages = fetcher.paginate(
+        api_url,
+        lambda page: {'opportunity': 'hackathons', 'page': page, 'per_page': 18, 'oppstatus': 'open'},
+        lambda body: body.get('data', {}).get('last_page', 1),
+    )
+
+    all_hackathons = []
+    processed_ids = set()
+    for body in pages:
+        for record in body.get('data', {}).get('data', []):
+            comp_id = str(record.get('id') or '')
+            title = clean_text(record.get('title')) or 'N/A'
+            if not comp_id.isdigit() or comp_id in processed_ids or title == 'N/A':
+                continue
+            processed_ids.add(comp_id)
+
+            prize_total = sum(prize.get('cash') or 0 for prize in record.get('prizes') or [])
+            currency = next((prize.get('currency') for prize in record.get('prizes') or [] if prize.get('currency')), '')
+            registrations = record.get('registerCount')
+            remain_days = (record.get('regnRequirements') or {}).get('remain_days')
+            skills = [clean_text(skill.get('skill_name') or skill.get('skill')) for skill in record.get('required_skills') or []]
+            skills = [skill for skill in skills if skill]
+
+            all_hackathons.append({
+                'source': 'Unstop',
+                'url': urljoin(base_url, f"o/{comp_id}"),
+                'title': title,
+                'host_name': clean_text((record.get('organisation') or {}).get('name')) or 'N/A',
+                'prize_info': clean_text(f"{currency} {prize_total:,}") if prize_total else 'N/A',
+                'participants_count': str(registrations) if registrations is not None else 'N/A',
+                'dates': clean_text(remain_days) or 'N/A',
+                'themes_tags': ', '.join(skills) if skills else 'N/A',
+                'status_mode': 'Online (typically)',
+                'location_mode': 'Online (typically)',
+            })
+    return all_hackathons
+
+
+DIRECT_SOURCES = {
+    "Devpost": fetch_devpost,
+    "Unstop": fetch_unstop,
+}
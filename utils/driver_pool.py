@@ -0,0 +1,155 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.instrumentation import get_logger
+
+log = get_logger(__name__)
+
+
+class DriverPool:
+    """
+    Process-wide pool of warm WebDriver instances.
+
+    Drivers are created lazily by `factory` up to `size`, health-checked when
+    they are handed out, reset (cookies, storage, blank page) when they are
+    returned, and recycled after `max_uses` leases or as soon as they fail.
+    """
+
+    def __init__(self, factory, size=3, max_uses=20):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            with self._cond:
+                while not self._idle and self._created >= self.size and not self._closed:
+                    remaining = deadline - time.time() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No WebDriver became available within {timeout}s")
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("WebDriver pool has been shut down")
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    driver = None
+                    self._created += 1
+
+            if driver is None:
+                try:
+                    driver = self.factory()
+                except Exception:
+                    with self._cond:
+                        if not self._closed: # shutdown() already reset the count
+                            self._created -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    closed = self._closed
+                    if not closed:
+                        self._uses[driver] = 0
+                if closed:
+                    # shutdown() ran while this driver was starting; it never saw it, so quit it here.
+                    self._quit(driver)
+                    raise RuntimeError("WebDriver pool has been shut down")
+                return driver
+
+            if self._is_healthy(driver):
+                return driver
+            log.warning("Pooled WebDriver failed its health check; replacing it.")
+            self.discard(driver)
+
+    def release(self, driver):
+        with self._cond:
+            if driver not in self._uses:
+                return
+            self._uses[driver] += 1
+            expired = self._uses[driver] >= self.max_uses or self._closed
+
+        if expired or not self._reset(driver):
+            self.discard(driver)
+            return
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    def discard(self, driver):
+        with self._cond:
+            if self._uses.pop(driver, None) is None:
+                return
+            self._created -= 1
+            self._cond.notify()
+        self._quit(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def warm_up(self, count=None):
+        """Start up to `count` drivers in the background so the first lease is fast."""
+        def _warm():
+            drivers = []
+            try:
+                for _ in range(min(count or self.size, self.size)):
+                    drivers.append(self.acquire(timeout=0))
+            except Exception as e:
+                log.warning("WebDriver pool warm-up stopped early: %s", e)
+            for driver in drivers:
+                self.release(driver)
+
+        threading.Thread(target=_warm, name="driver-pool-warmup", daemon=True).start()
+
+    def stats(self):
+        with self._cond:
+            return {"size": self.size, "created": self._created, "idle": len(self._idle)}
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            drivers = list(self._uses)
+            self._uses.clear()
+            self._idle.clear()
+            self._created = 0
+            self._cond.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def _reset(driver):
+        try:
+            driver.delete_all_cookies()
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass # Storage is not accessible on every origin (e.g. about:blank)
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            log.warning("Could not reset pooled WebDriver: %s", e)
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            log.warning("Error quitting pooled WebDriver: %s", e)
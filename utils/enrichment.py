@@ -0,0 +1,205 @@
+"""
+Detail-page enrichment: fill placeholder fields from each event's own page.
+
+Listing pages (Devfolio's especially) leave prize, host, dates and themes
+as 'N/A (Details on event page)'. `DetailFetcher` fetches detail pages over
+pooled keep-alive HTTP connections on a bounded worker pool, spaces
+requests to the same site by a per-host rate limit, and caches the parsed
+fields per URL. A cached page is served as is for `ttl` seconds and then
+revalidated with If-None-Match / If-Modified-Since, so an unchanged page
+costs a 304 instead of a download and a parse.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+
+from utils.direct_fetch import SessionPool
+from utils.event_record import as_record
+from utils.instrumentation import get_logger
+from utils.normalize import NORMALIZED_FIELDS, event_mode, is_placeholder, normalize_event
+
+log = get_logger(__name__)
+
+ENRICH_FIELDS = ('prize_info', 'participants_count', 'host_name', 'dates', 'themes_tags', 'location_mode')
+
+
+class DetailFetchError(Exception):
+    """Raised when a detail page cannot be fetched (or parsed) and nothing is cached for it."""
+
+
+class HostRateLimiter:
+    """Spaces requests to the same site at least 1/rate seconds apart; other sites are not held up."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def site(url):
+        # Each Devfolio hackathon has its own subdomain on the same servers, so limit per registrable domain.
+        host = urlsplit(url).hostname or ''
+        return '.'.join(host.split('.')[-2:])
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        key = self.site(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(key, 0))
+            self._next_slot[key] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DetailFetcher:
+    def __init__(self, max_workers=8, per_host_rate=4.0, timeout=10, ttl=24 * 3600, max_entries=5000):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.limiter = HostRateLimiter(per_host_rate)
+        # One shared pool bounds detail fetches across every caller (scrapes and API requests alike).
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detail-fetch")
+        self._cache = OrderedDict() # url -> {"fields", "etag", "last_modified", "checked_at"}
+        self._sessions = SessionPool('text/html', pool_maxsize=max_workers, backoff_factor=0.5)
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        return self._sessions.get()
+
+    def needs_fetch(self, url):
+        """True when `url` has no cached details or they are older than the TTL."""
+        with self._lock:
+            entry = self._cache.get(url)
+            return entry is None or time.time() - entry["checked_at"] >= self.ttl
+
+    def cached(self, url):
+        """Parsed fields cached for `url` (however old), without any network access."""
+        with self._lock:
+            entry = self._cache.get(url)
+            return entry["fields"] if entry else None
+
+    def fetch(self, url, parse):
+        """Return (fields, outcome); outcome is 'cached', 'revalidated', 'fetched' or 'stale' (refetch failed)."""
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry:
+                self._cache.move_to_end(url)
+        if entry and time.time() - entry["checked_at"] < self.ttl:
+            return entry["fields"], "cached"
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers['If-None-Match'] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers['If-Modified-Since'] = entry["last_modified"]
+        self.limiter.wait(url)
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and entry:
+                self._store(url, dict(entry, checked_at=time.time()))
+                return entry["fields"], "revalidated"
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if entry:
+                log.warning("Revalidating %s failed, keeping cached details: %s", url, e)
+                return entry["fields"], "stale"
+            raise DetailFetchError(f"GET {url} failed: {e}") from e
+
+        try:
+            fields = parse(response.text)
+        except Exception as e:
+            if entry:
+                log.warning("Parsing %s failed, keeping cached details: %s", url, e)
+                return entry["fields"], "stale"
+            raise DetailFetchError(f"Parsing {url} failed: {e}") from e
+        self._store(url, {
+            "fields": fields,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "checked_at": time.time(),
+        })
+        return fields, "fetched"
+
+    def submit(self, url, parse):
+        """Run `fetch` on the shared pool; returns a Future."""
+        return self._executor.submit(self.fetch, url, parse)
+
+    def fetch_many(self, urls, parse):
+        """Fetch several pages on the shared pool; returns {url: (fields, outcome)} and skips failures."""
+        futures = {url: self.submit(url, parse) for url in dict.fromkeys(urls)}
+        results = {}
+        for url, future in futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                log.warning("Could not fetch details from %s: %s", url, e)
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._sessions.close()
+
+    def _store(self, url, entry):
+        with self._lock:
+            self._cache[url] = entry
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+
+def missing_fields(event):
+    """Listing fields of `event` that hold only a placeholder."""
+    missing = [field for field in ENRICH_FIELDS if field in event and is_placeholder(event[field])]
+    if 'location_mode' in event and 'location_mode' not in missing and event_mode(event) is None:
+        missing.append('location_mode') # e.g. Devfolio's "Online/Offline (Check Status/Mode)"
+    return missing
+
+
+def apply_details(event, fields):
+    """A record of `event` with its placeholder fields filled from `fields` and the normalised fields recomputed."""
+    missing = missing_fields(event)
+    filled = {field: fields[field] for field in missing if fields.get(field)}
+    if not filled:
+        return event
+    enriched = {key: value for key, value in event.items() if key not in NORMALIZED_FIELDS}
+    enriched.update(filled)
+    return as_record(normalize_event(enriched))
+
+
+def enrich_events(events, fetcher, parse, fetch_limit):
+    """
+    Fill placeholder fields of `events` from their detail pages.
+
+    Details already cached are applied to every event; at most `fetch_limit`
+    pages that are uncached or past the TTL are fetched (or revalidated) per
+    call. Returns (events, counts).
+    """
+    counts = {"applied": 0, "cached": 0, "fetched": 0, "revalidated": 0, "stale": 0, "failed": 0}
+    to_fetch = []
+    for event in events:
+        url = event.get('url')
+        if url and missing_fields(event) and fetcher.needs_fetch(url) and len(to_fetch) < fetch_limit:
+            to_fetch.append(url)
+    fetched = fetcher.fetch_many(to_fetch, parse) if to_fetch else {}
+    counts["failed"] = len(set(to_fetch) - fetched.keys())
+    for _, outcome in fetched.values():
+        counts[outcome] += 1
+
+    result = []
+    for event in events:
+        fields = fetcher.cached(event.get('url')) if event.get('url') and missing_fields(event) else None
+        if fields:
+            enriched = apply_details(event, fields)
+            if enriched is not event:
+                counts["applied"] += 1
+            event = enriched
+        result.append(event)
+    return result, counts
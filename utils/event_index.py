@@ -0,0 +1,287 @@
+"""
+In-memory secondary indexes over the cached events, for the /events query API.
+
+Events are indexed per listing (one document per source listing, no
+cross-source merging) under a short stable id derived from their store key.
+Inverted indexes map source, mode, theme tag, currency, text status and title
+tokens to document ids; sorted (value, id) lists over prize and the start/end
+dates answer range filters with bisect and give the sort orders. Each update
+replaces one source's documents, touching only the ones that were added,
+changed or removed.
+
+Pages are addressed by an opaque keyset cursor (the sort order, and the sort
+value and id of the last event returned), so paging stays stable while new
+scrapes land. A cursor is only valid for the sort order it was issued for.
+"""
+import base64
+import bisect
+import hashlib
+import heapq
+import json
+import re
+import threading
+from datetime import datetime, timezone
+
+from utils.event_store import event_key
+from utils.normalize import event_mode, is_placeholder
+
+SORT_FIELDS = ('ends_at', 'starts_at', 'prize')
+STATUSES = ('open', 'upcoming', 'ended')
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_AFTER_ANY_ID = '\uffff' # sorts after every id, so (value, _AFTER_ANY_ID) bounds all pairs with that value
+
+
+def event_id(event):
+    return hashlib.sha1((event_key(event) or '').encode('utf-8')).hexdigest()[:16]
+
+
+def title_tokens(text):
+    return set(_TOKEN_RE.findall((text or '').lower()))
+
+
+def theme_tags(event):
+    text = event.get('themes_tags')
+    if is_placeholder(text):
+        return set()
+    return {tag.strip().lower() for tag in text.split(',') if tag.strip()}
+
+
+def text_status(event):
+    """Status from the listing's labels, for events without parsed dates."""
+    text = ' '.join(str(event.get(field) or '') for field in ('status_label', 'status_mode')).lower()
+    if any(word in text for word in ('ended', 'closed', 'completed')):
+        return 'ended'
+    if any(word in text for word in ('upcoming', 'starts', 'opens')):
+        return 'upcoming'
+    if any(word in text for word in ('open', 'left', 'live')):
+        return 'open'
+    return None
+
+
+def sort_order(sort, descending):
+    return f"-{sort}" if descending else sort
+
+
+def encode_cursor(order, value, doc_id):
+    return base64.urlsafe_b64encode(json.dumps([order, value, doc_id]).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, order):
+    """(value, id) from a cursor issued for `order`; ValueError for a malformed cursor or one from another sort."""
+    try:
+        cursor_order, value, doc_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from None
+    if cursor_order != order:
+        raise ValueError(f"Cursor was issued for sort={cursor_order!r}, not sort={order!r}")
+    # prize values are numbers, dates ISO strings; anything else cannot be compared with the index.
+    expected = str if order.lstrip('-') in ('ends_at', 'starts_at') else (int, float)
+    if not isinstance(doc_id, str) or not (value is None or (isinstance(value, expected) and not isinstance(value, bool))):
+        raise ValueError("Invalid cursor: unexpected value types")
+    return value, doc_id
+
+
+class _SortedIndex:
+    """(value, id) pairs kept in order; documents without a value are left out."""
+
+    def __init__(self, value_of):
+        self.value_of = value_of
+        self.pairs = []
+
+    def update(self, removed_ids, added_docs):
+        # One linear merge per source update instead of an insort per event.
+        kept = [pair for pair in self.pairs if pair[1] not in removed_ids] if removed_ids else self.pairs
+        added = sorted((value, doc_id) for doc_id, value in
+                       ((doc_id, self.value_of(doc)) for doc_id, doc in added_docs.items()) if value is not None)
+        self.pairs = list(heapq.merge(kept, added)) if added else kept
+
+    def range(self, low=None, high=None):
+        """Ids with low <= value <= high (either bound may be None)."""
+        start = 0 if low is None else bisect.bisect_left(self.pairs, (low,))
+        end = len(self.pairs) if high is None else bisect.bisect_right(self.pairs, (high, _AFTER_ANY_ID))
+        return {doc_id for _, doc_id in self.pairs[start:end]}
+
+
+class EventIndex:
+    def __init__(self):
+        self._docs = {}
+        self._by_source = {}
+        self._inverted = {'source': {}, 'mode': {}, 'tag': {}, 'currency': {}, 'status': {}, 'dated': {}, 'token': {}}
+        self._sorted = {
+            'prize': _SortedIndex(lambda event: event.get('prize_amount')),
+            # An event with only one known date is treated as a one-day window for filtering and sorting.
+            'starts_at': _SortedIndex(lambda event: event.get('starts_at') or event.get('ends_at')),
+            'ends_at': _SortedIndex(lambda event: event.get('ends_at') or event.get('starts_at')),
+        }
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def update(self, source_name, events):
+        """Replace the indexed events of one source; returns (added, changed, removed) counts."""
+        incoming = {}
+        for event in events:
+            incoming[event_id(event)] = event
+        with self._lock:
+            current = self._by_source.get(source_name, set())
+            removed = current - incoming.keys()
+            changed = {doc_id for doc_id in current & incoming.keys() if self._docs[doc_id] != incoming[doc_id]}
+            added = {doc_id: incoming[doc_id] for doc_id in incoming.keys() - current}
+            added.update((doc_id, incoming[doc_id]) for doc_id in changed)
+            if not removed and not added:
+                return 0, 0, 0
+
+            for doc_id in removed | changed:
+                self._unindex(doc_id, self._docs.pop(doc_id))
+            for doc_id, event in added.items():
+                self._docs[doc_id] = event
+                self._index(doc_id, event)
+            for index in self._sorted.values():
+                index.update(removed | changed, added)
+            self._by_source[source_name] = set(incoming)
+            self.version += 1
+            return len(added) - len(changed), len(changed), len(removed)
+
+    def replace(self, doc_id, event):
+        """Swap in a new version of one indexed event (e.g. after enrichment); False if it is no longer indexed."""
+        with self._lock:
+            current = self._docs.get(doc_id)
+            if current is None:
+                return False
+            if current != event:
+                self._unindex(doc_id, current)
+                self._docs[doc_id] = event
+                self._index(doc_id, event)
+                for index in self._sorted.values():
+                    index.update({doc_id}, {doc_id: event})
+                self.version += 1
+            return True
+
+    def get(self, doc_id):
+        with self._lock:
+            event = self._docs.get(doc_id)
+            return dict(event, id=doc_id) if event else None
+
+    def query(self, sources=None, modes=None, tags=None, text=None, statuses=None, prize_min=None, prize_max=None,
+              currency=None, date_from=None, date_to=None, sort='ends_at', descending=False, cursor=None, limit=50,
+              fields=None, now=None):
+        """
+        Return {"total", "events", "next_cursor"} for one page of matching events.
+
+        List filters (sources, modes, tags, statuses) match any of their values;
+        `text` matches titles containing every token. The date window keeps
+        events running at some point between `date_from` and `date_to` (ISO
+        8601). Events without a value for the sort field come last.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field {sort!r}; use one of {', '.join(SORT_FIELDS)}")
+        order = sort_order(sort, descending)
+        after = decode_cursor(cursor, order) if cursor else None
+        now = (now or datetime.now(timezone.utc)).replace(microsecond=0).isoformat()
+
+        with self._lock:
+            candidates = []
+            for name, values in (('source', sources), ('mode', modes), ('tag', tags), ('currency', currency and [currency])):
+                if values:
+                    candidates.append(self._any_of(name, (value.lower() for value in values)))
+            if text:
+                tokens = title_tokens(text)
+                candidates.extend(self._inverted['token'].get(token, set()) for token in tokens)
+            if statuses:
+                candidates.append(set().union(*(self._status_ids(status, now) for status in statuses)))
+            if prize_min is not None or prize_max is not None:
+                candidates.append(self._sorted['prize'].range(prize_min, prize_max))
+            if date_from:
+                candidates.append(self._sorted['ends_at'].range(low=date_from))
+            if date_to:
+                candidates.append(self._sorted['starts_at'].range(high=date_to))
+
+            matching = None
+            for ids in sorted(candidates, key=len):
+                matching = set(ids) if matching is None else matching & ids
+                if not matching:
+                    break
+            total = len(self._docs) if matching is None else len(matching)
+            page, last = self._page(self._sorted[sort], matching, descending, after, limit)
+            events = [self._project(doc_id, self._docs[doc_id], fields) for doc_id in page]
+
+        return {
+            "total": total,
+            "events": events,
+            "next_cursor": encode_cursor(order, *last) if last and len(page) == limit else None,
+        }
+
+    def _page(self, index, matching, descending, after, limit):
+        """Walk the sort order from the cursor: indexed values first, then the events without one, by id."""
+        pairs = index.pairs
+        page, last = [], None
+        after_value, after_id = after if after else (None, None)
+
+        if not after or after_value is not None:
+            if descending:
+                end = bisect.bisect_left(pairs, (after_value, after_id)) if after else len(pairs)
+                ordered = (pairs[position] for position in range(end - 1, -1, -1))
+            else:
+                start = bisect.bisect_right(pairs, (after_value, after_id)) if after else 0
+                ordered = (pairs[position] for position in range(start, len(pairs)))
+            for value, doc_id in ordered:
+                if matching is None or doc_id in matching:
+                    page.append(doc_id)
+                    last = (value, doc_id)
+                    if len(page) == limit:
+                        return page, last
+
+        indexed = {doc_id for _, doc_id in pairs}
+        unvalued = sorted(doc_id for doc_id in (self._docs if matching is None else matching) if doc_id not in indexed)
+        start = bisect.bisect_right(unvalued, after_id) if after and after_value is None else 0
+        for doc_id in unvalued[start:start + limit - len(page)]:
+            page.append(doc_id)
+            last = (None, doc_id)
+        return page, last
+
+    def _status_ids(self, status, now):
+        has_start = self._inverted['dated'].get('start', set())
+        has_end = self._inverted['dated'].get('end', set())
+        ended = self._sorted['ends_at'].range(high=now) & has_end
+        if status == 'ended':
+            return ended | self._inverted['status'].get(status, set())
+        upcoming = (self._sorted['starts_at'].range(low=now) & has_start) - ended
+        if status == 'upcoming':
+            return upcoming | self._inverted['status'].get(status, set())
+        return ((has_start | has_end) - ended - upcoming) | self._inverted['status'].get(status, set())
+
+    def _any_of(self, name, values):
+        index = self._inverted[name]
+        return set().union(*(index.get(value, set()) for value in values))
+
+    def _keys(self, event):
+        keys = [('source', (event.get('source') or '').lower()), ('mode', event.get('mode') or event_mode(event)),
+                ('currency', (event.get('prize_currency') or '').lower())]
+        keys.extend(('tag', tag) for tag in theme_tags(event))
+        keys.extend(('token', token) for token in title_tokens(event.get('title')))
+        keys.extend((('dated', 'start' if event.get('starts_at') else None), ('dated', 'end' if event.get('ends_at') else None)))
+        if not (event.get('starts_at') or event.get('ends_at')):
+            keys.append(('status', text_status(event)))
+        return [(name, value) for name, value in keys if value]
+
+    def _index(self, doc_id, event):
+        for name, value in self._keys(event):
+            self._inverted[name].setdefault(value, set()).add(doc_id)
+
+    def _unindex(self, doc_id, event):
+        for name, value in self._keys(event):
+            ids = self._inverted[name].get(value)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._inverted[name][value]
+
+    @staticmethod
+    def _project(doc_id, event, fields):
+        if not fields:
+            return dict(event, id=doc_id)
+        projected = {field: event.get(field) for field in fields}
+        projected['id'] = doc_id
+        return projected
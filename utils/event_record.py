@@ -0,0 +1,122 @@
+"""
+Compact, typed in-memory representation of one scraped event.
+
+The parsers build plain dicts with the same keys and a handful of repeated
+literals ('N/A', 'N/A (Details on event page)', 'Online (typically)') on
+every event. Once an event is normalised it is stored as an `EventRecord`:
+one fixed `__slots__` layout instead of a per-event hash table, placeholder
+literals replaced by None, and the low-cardinality labels (source, mode,
+currency, status and location labels) interned so every event shares one
+copy of each string.
+
+Records behave as read-only mappings for the rest of the code (`get`,
+`in`, `items()`, `dict(record, ...)`), so indexing, dedupe and enrichment
+work on them unchanged. Keys the record does not know about (from custom
+sources) are kept in `extra` rather than dropped.
+"""
+import operator
+import sys
+from collections.abc import Mapping
+
+from utils.normalize import NORMALIZED_FIELDS, is_placeholder
+
+LISTING_FIELDS = ('source', 'title', 'url', 'host_name', 'status_label', 'status_mode', 'location_mode',
+                  'prize_info', 'participants_count', 'dates', 'themes_tags')
+MERGE_FIELDS = ('sources', 'source_urls') # only set on events merged across sources
+FIELDS = LISTING_FIELDS + NORMALIZED_FIELDS + MERGE_FIELDS
+
+INTERNED_FIELDS = frozenset(('source', 'status_label', 'status_mode', 'location_mode', 'prize_currency', 'mode'))
+# Listing labels that only say "unknown"; anything starting with 'N/A' is one too (see is_placeholder).
+SENTINELS = frozenset(('Online (typically)', 'Online/Offline (Check Status/Mode)'))
+
+
+class EventRecord(Mapping):
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        for field in FIELDS:
+            value = fields.pop(field, None)
+            if type(value) is str:
+                if value in SENTINELS or is_placeholder(value):
+                    value = None
+                elif field in INTERNED_FIELDS:
+                    value = sys.intern(value)
+            _set(self, field, value)
+        _set(self, 'extra', fields or None) # whatever is left is a key the record has no slot for
+
+    @classmethod
+    def from_event(cls, event):
+        return event if isinstance(event, cls) else cls(**event)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; build a new one with replace()")
+
+    def replace(self, **changes):
+        return type(self)(**dict(self.to_dict(), **changes))
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            if key in MERGE_FIELDS and getattr(self, key) is None:
+                raise KeyError(key)
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        # Hot path for the indexes and dedupe; Mapping.get would go through a KeyError for every null.
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None and key in MERGE_FIELDS else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def __iter__(self):
+        for field in FIELDS:
+            if field not in MERGE_FIELDS or getattr(self, field) is not None:
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, EventRecord):
+            return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"EventRecord({self.get('source')!r}, {self.get('title')!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def to_dict(self):
+        """Plain dict with every field, in field order; null where the listing had no value."""
+        result = dict(zip(FIELDS, _all_fields(self)))
+        for field in MERGE_FIELDS:
+            if result[field] is None:
+                del result[field]
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+_FIELD_SET = frozenset(FIELDS)
+_all_fields = operator.attrgetter(*FIELDS)
+_set = object.__setattr__
+
+
+def as_record(event):
+    """`event` as an EventRecord (records are returned as is)."""
+    return EventRecord.from_event(event)
+
+
+def as_dict(event):
+    """Plain-dict form of an event or record, for code that needs a real dict (e.g. BSON)."""
+    return event.to_dict() if isinstance(event, EventRecord) else event
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from utils.event_record import as_dict
+from utils.serialization import dumps, loads
+
+
+def event_key(event):
+    """Stable identity of an event: the Unstop comp_id, or the canonical listing URL for other sources."""
+    if event.get('source') == 'Unstop':
+        comp_id = (event.get('url') or '').rstrip('/').rsplit('/', 1)[-1]
+        if comp_id.isdigit():
+            return f"unstop:{comp_id}"
+    return event.get('url')
+
+
+def content_hash(event):
+    return hashlib.sha1(dumps(event, sort_keys=True)).hexdigest()
+
+
+class SQLiteEventStore:
+    """Embedded event store for local use. One row per event key."""
+
+    def __init__(self, path="events.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " key TEXT PRIMARY KEY, source TEXT NOT NULL, hash TEXT NOT NULL, data TEXT NOT NULL,"
+                " first_seen REAL NOT NULL, last_seen REAL NOT NULL, last_changed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS events_last_changed ON events (last_changed)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS events_source_seen ON events (source, last_seen)")
+
+    def upsert(self, events):
+        """Save events and return counts of new, changed and unchanged ones."""
+        now = time.time()
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        with self._lock, self._conn:
+            for event in events:
+                key = event_key(event)
+                if not key:
+                    continue
+                digest = content_hash(event)
+                row = self._conn.execute("SELECT hash FROM events WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    counts["new"] += 1
+                    self._conn.execute(
+                        "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, event.get('source', ''), digest, dumps(event).decode('utf-8'), now, now, now),
+                    )
+                elif row[0] != digest:
+                    counts["changed"] += 1
+                    self._conn.execute(
+                        "UPDATE events SET hash = ?, data = ?, last_seen = ?, last_changed = ? WHERE key = ?",
+                        (digest, dumps(event).decode('utf-8'), now, now, key),
+                    )
+                else:
+                    counts["unchanged"] += 1
+                    self._conn.execute("UPDATE events SET last_seen = ? WHERE key = ?", (now, key))
+        return counts
+
+    def known(self, keys):
+        keys = [key for key in keys if key]
+        if not keys:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key FROM events WHERE key IN ({','.join('?' * len(keys))})", keys
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def events_for_source(self, source, seen_after=0):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM events WHERE source = ? AND last_seen >= ? ORDER BY first_seen",
+                (source, seen_after),
+            ).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def changed_since(self, since):
+        """Keys of events that were first seen or last changed at or after `since` (unix time)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key FROM events WHERE last_changed >= ?", (since,)).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MongoEventStore:
+    """Event store backed by a MongoDB collection, for deployments that share state between processes."""
+
+    def __init__(self, uri, database="scraper", collection="events"):
+        from pymongo import MongoClient, ASCENDING
+
+        self._client = MongoClient(uri)
+        self._collection = self._client[database][collection]
+        self._collection.create_index([("last_changed", ASCENDING)])
+        self._collection.create_index([("source", ASCENDING), ("last_seen", ASCENDING)])
+
+    def upsert(self, events):
+        from pymongo import UpdateOne
+
+        now = time.time()
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        by_key = {event_key(event): event for event in events if event_key(event)}
+        existing = {
+            doc["_id"]: doc["hash"]
+            for doc in self._collection.find({"_id": {"$in": list(by_key)}}, {"hash": 1})
+        }
+        operations = []
+        for key, event in by_key.items():
+            digest = content_hash(event)
+            if key not in existing:
+                counts["new"] += 1
+                operations.append(UpdateOne({"_id": key}, {"$set": {
+                    "source": event.get('source', ''), "hash": digest, "data": as_dict(event),
+                    "first_seen": now, "last_seen": now, "last_changed": now,
+                }}, upsert=True))
+            elif existing[key] != digest:
+                counts["changed"] += 1
+                operations.append(UpdateOne({"_id": key}, {"$set": {
+                    "hash": digest, "data": as_dict(event), "last_seen": now, "last_changed": now,
+                }}))
+            else:
+                counts["unchanged"] += 1
+                operations.append(UpdateOne({"_id": key}, {"$set": {"last_seen": now}}))
+        if operations:
+            self._collection.bulk_write(operations, ordered=False)
+        return counts
+
+    def known(self, keys):
+        keys = [key for key in keys if key]
+        return {doc["_id"] for doc in self._collection.find({"_id": {"$in": keys}}, {"_id": 1})} if keys else set()
+
+    def events_for_source(self, source, seen_after=0):
+        cursor = self._collection.find({"source": source, "last_seen": {"$gte": seen_after}}, {"data": 1})
+        return [doc["data"] for doc in cursor.sort("first_seen", 1)]
+
+    def changed_since(self, since):
+        return {doc["_id"] for doc in self._collection.find({"last_changed": {"$gte": since}}, {"_id": 1})}
+
+    def close(self):
+        self._client.close()
+
+
+def open_event_store():
+    """Mongo when SCRAPER_MONGO_URI is set, otherwise the embedded SQLite store at SCRAPER_DB_PATH."""
+    mongo_uri = os.environ.get("SCRAPER_MONGO_URI")
+    if mongo_uri:
+        return MongoEventStore(mongo_uri, database=os.environ.get("SCRAPER_MONGO_DB", "scraper"))
+    return SQLiteEventStore(os.environ.get("SCRAPER_DB_PATH", "events.db"))
@@ -0,0 +1,215 @@
+"""
+Logging, stage spans and Prometheus metrics for the scraper.
+
+Logging goes through the standard `logging` module under the "scraper"
+logger. Messages use lazy %-formatting, so disabled levels cost one level
+check; SCRAPER_LOG_LEVEL picks the level (OFF silences everything) and
+SCRAPER_LOG_FORMAT=json emits one JSON object per line with any `extra`
+fields attached.
+
+Metrics live in the module-level METRICS registry and are rendered in the
+Prometheus text format by `METRICS.render()`.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_STANDARD_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _STANDARD_RECORD_FIELDS})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level=None, log_format=None):
+    """Set up the "scraper" logger once per process from SCRAPER_LOG_LEVEL / SCRAPER_LOG_FORMAT."""
+    level = (level or os.environ.get("SCRAPER_LOG_LEVEL", "INFO")).upper()
+    log_format = log_format or os.environ.get("SCRAPER_LOG_FORMAT", "text")
+    logger = logging.getLogger("scraper")
+    if level == "OFF":
+        logger.disabled = True
+        return logger
+
+    handler = logging.StreamHandler()
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def get_logger(name):
+    return logging.getLogger(f"scraper.{name}")
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        return self.header() + [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in sorted(values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self):
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        lines = self.header()
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def _add(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._add(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+STAGE_SECONDS = METRICS.histogram(
+    "scraper_stage_seconds", "Time spent in each scrape stage", ("source", "stage"))
+SOURCE_RUNS = METRICS.counter(
+    "scraper_source_runs_total", "Finished source scrapes by outcome", ("source", "status", "backend"))
+EVENTS_SCRAPED = METRICS.counter(
+    "scraper_events_total", "Events returned per source", ("source",))
+CARDS_FOUND = METRICS.counter(
+    "scraper_cards_found_total", "Candidate cards found on listing pages", ("source",))
+CARDS_DROPPED = METRICS.counter(
+    "scraper_cards_dropped_total", "Cards skipped by the parsers' guards", ("source", "reason"))
+PARSE_ERRORS = METRICS.counter(
+    "scraper_parse_errors_total", "Cards whose extraction raised an exception", ("source",))
+DRIVER_START_SECONDS = METRICS.histogram(
+    "scraper_driver_start_seconds", "Time to launch a new Chrome instance")
+DRIVER_POOL_DRIVERS = METRICS.gauge(
+    "scraper_driver_pool_drivers", "WebDriver pool size, live drivers and idle drivers", ("state",))
+PAGE_BYTES = METRICS.counter(
+    "scraper_page_bytes_total", "Bytes transferred by the browser while scraping listing pages", ("source",))
+PAGE_REQUESTS = METRICS.counter(
+    "scraper_page_requests_total", "Browser requests on listing pages: made, blocked by lean mode, failed", ("source", "outcome"))
+SCRAPE_JOBS = METRICS.gauge(
+    "scraper_jobs", "Async scrape jobs held in memory by status", ("status",))
+WORK_QUEUE_TASKS = METRICS.gauge(
+    "scraper_work_queue_tasks", "Tasks in the shared worker queue by status", ("status",))
+HTTP_REQUEST_SECONDS = METRICS.histogram(
+    "scraper_http_request_seconds", "API request latency", ("endpoint", "method", "status"))
+
+
+@contextmanager
+def span(source, stage, timings=None):
+    """Time a stage of one source's scrape; the duration feeds STAGE_SECONDS and, if given, `timings[stage]`."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, source=source, stage=stage)
+        if timings is not None:
+            timings[stage] = round(timings.get(stage, 0) + elapsed, 4)
+
+
+def record_parse(source, found, dropped, errors):
+    """Count one parsed listing page: candidate cards, cards dropped per reason, and extraction errors."""
+    CARDS_FOUND.inc(found, source=source)
+    for reason, count in dropped.items():
+        CARDS_DROPPED.inc(count, source=source, reason=reason)
+    if errors:
+        PARSE_ERRORS.inc(errors, source=source)
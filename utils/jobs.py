@@ -0,0 +1,149 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.instrumentation import get_logger
+
+log = get_logger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised by JobManager.submit when too many jobs are already waiting for a worker."""
+
+
+class ScrapeJob:
+    def __init__(self, key, sources):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.sources = sources
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.events = []
+        self.source_status = {name: {"status": "pending"} for name in sources}
+        self.result = None
+        self.error = None
+
+    @property
+    def pending(self):
+        return self.status in ("queued", "running")
+
+    def to_dict(self, offset=0):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "sources": dict(self.source_status),
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "total_events": len(self.events),
+            "offset": offset,
+            "events": self.events[offset:],
+            "timings": (self.result or {}).get("timings"),
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs scrape jobs on a bounded worker pool so API workers are not held for a whole scrape.
+
+    `run_scrape(sources, on_event, on_source_done)` performs one scrape and
+    returns a runscraper()-style result. A job identical to one still queued
+    or running is coalesced into it; once `max_queue` jobs are waiting,
+    `submit` raises QueueFull. Finished jobs stay readable for `result_ttl`
+    seconds, and at most `max_results` of them are kept (least recently read
+    go first).
+    """
+
+    def __init__(self, run_scrape, max_workers=2, max_queue=16, result_ttl=900, max_results=100):
+        self.run_scrape = run_scrape
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-job")
+        self._jobs = OrderedDict()
+        self._pending_by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, sources):
+        """Return (job, coalesced)."""
+        key = tuple(sorted(sources))
+        with self._lock:
+            self._expire()
+            existing = self._pending_by_key.get(key)
+            if existing:
+                return existing, True
+            if self.queue_depth() >= self.max_queue:
+                raise QueueFull(f"{self.max_queue} scrape jobs are already queued")
+            job = ScrapeJob(key, list(sources))
+            self._jobs[job.id] = job
+            self._pending_by_key[key] = job
+        self._executor.submit(self._run, job)
+        return job, False
+
+    def describe(self, job_id, offset=0):
+        """Progress and the events collected so far (from `offset`), or None for an unknown or expired job."""
+        with self._lock:
+            self._expire()
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            self._jobs.move_to_end(job_id)
+            return job.to_dict(offset)
+
+    def queue_depth(self):
+        return sum(1 for job in self._jobs.values() if job.status == "queued")
+
+    def stats(self):
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job):
+        with self._lock:
+            job.status = "running"
+            job.started = time.time()
+
+        def on_event(event):
+            with self._lock:
+                job.events.append(event)
+
+        def on_source_done(source_name, timing):
+            with self._lock:
+                job.source_status[source_name] = timing
+
+        result, error = None, None
+        try:
+            result = self.run_scrape(job.sources, on_event, on_source_done)
+            error = result.get("error")
+        except Exception as e:
+            log.exception("Scrape job %s failed: %s", job.id, e)
+            error = str(e)
+        with self._lock:
+            job.result = result
+            job.error = error
+            job.status = "failed" if error else "done"
+            job.finished = time.time()
+            if self._pending_by_key.get(job.key) is job:
+                del self._pending_by_key[job.key]
+            self._expire()
+
+    def _expire(self):
+        """Drop finished jobs past their TTL, then the least recently read ones over max_results. Caller holds the lock."""
+        now = time.time()
+        finished = [job_id for job_id, job in self._jobs.items() if not job.pending]
+        for job_id in finished:
+            if now - self._jobs[job_id].finished > self.result_ttl:
+                del self._jobs[job_id]
+        finished = [job_id for job_id in finished if job_id in self._jobs]
+        for job_id in finished[:max(0, len(finished) - self.max_results)]:
+            del self._jobs[job_id]
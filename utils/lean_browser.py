@@ -0,0 +1,119 @@
+"""
+Lean Chrome profile and per-page network/load reporting.
+
+The scrapers only read the DOM, so in lean mode Chrome skips what does not
+affect it: images are disabled by content setting, and image, font, media
+and analytics/tracker URLs are blocked through the DevTools protocol
+(Network.setBlockedURLs) before any page loads. Background features are
+switched off and the window is a laptop-sized viewport instead of a
+maximised one. The anti-automation tweaks in get_driver() are untouched.
+
+Independently of the mode, drivers record Network events in Chrome's
+performance log so `page_report` can tell how many bytes a listing page
+pulled, how many requests were blocked and how long the page took to load.
+"""
+import json
+
+from utils.instrumentation import get_logger
+
+log = get_logger(__name__)
+
+BLOCKED_URL_PATTERNS = (
+    # images
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp',
+    # fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+    # media
+    '*.mp4', '*.webm', '*.mp3', '*.m4a', '*.ogg', '*.wav', '*.m3u8',
+    # analytics, ads and trackers
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*segment.io*', '*segment.com*',
+    '*mixpanel.com*', '*amplitude.com*', '*clarity.ms*', '*intercom.io*', '*intercomcdn.com*',
+    '*sentry.io*', '*fullstory.com*', '*linkedin.com/px*', '*snap.licdn.com*', '*twitter.com/i/adsct*',
+)
+
+LEAN_ARGUMENTS = (
+    '--disable-extensions',
+    '--disable-gpu',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-translate',
+    '--disable-notifications',
+    '--mute-audio',
+    '--no-first-run',
+    '--blink-settings=imagesEnabled=false',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,InterestFeedContentSuggestions',
+)
+
+LEAN_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+}
+
+
+def apply_lean_options(options, window_size):
+    """Add the lean-mode switches and content settings to ChromeOptions."""
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_argument(f'--window-size={window_size}')
+    options.add_experimental_option('prefs', LEAN_PREFS)
+
+
+def enable_network_log(options):
+    """Record Network events (not Page/timeline ones) in the performance log read by `page_report`."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
+
+def block_urls(driver, patterns):
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+
+
+def clear_network_log(driver):
+    """Drop log entries left over from the driver's previous lease."""
+    try:
+        driver.get_log('performance')
+    except Exception as e:
+        log.debug("No performance log to clear: %s", e)
+
+
+def page_report(driver):
+    """
+    Bytes transferred, requests made and blocked, and load timings of the
+    current page since the last clear_network_log(); None if the driver
+    cannot report them.
+    """
+    try:
+        entries = driver.get_log('performance')
+        timing = driver.execute_script(
+            "const n = performance.getEntriesByType('navigation')[0];"
+            "return n ? {dcl: n.domContentLoadedEventEnd, load: n.loadEventEnd} : null;"
+        )
+    except Exception as e:
+        log.debug("Page report unavailable: %s", e)
+        return None
+
+    report = {"bytes": 0, "requests": 0, "blocked": 0, "failed": 0}
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        method, params = message.get('method'), message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            report["requests"] += 1
+        elif method == 'Network.loadingFinished':
+            report["bytes"] += int(params.get('encodedDataLength', 0))
+        elif method == 'Network.loadingFailed':
+            report["blocked" if params.get('blockedReason') else "failed"] += 1
+    if isinstance(timing, dict):
+        report["dom_content_loaded_ms"] = round(timing.get('dcl') or 0)
+        report["load_ms"] = round(timing.get('load') or 0)
+    try:
+        metrics = {metric['name']: metric['value'] for metric in driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']}
+        report["js_heap_mb"] = round(metrics.get('JSHeapUsedSize', 0) / 1e6, 1)
+    except Exception as e:
+        log.debug("Performance metrics unavailable: %s", e)
+    return report
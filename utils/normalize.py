@@ -0,0 +1,160 @@
+"""
+Normalised, typed fields derived from the scraped free-text ones.
+
+`normalize_event` adds `prize_amount` / `prize_currency`, `participants`,
+`starts_at` / `ends_at` (ISO 8601, UTC) and `mode` next to the original
+strings, which are left untouched. Fields that cannot be parsed, or that only hold a
+placeholder such as 'N/A (Details on event page)', become None.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+NORMALIZED_FIELDS = ('prize_amount', 'prize_currency', 'participants', 'starts_at', 'ends_at', 'mode')
+
+# ISO 4217 codes accepted when written out next to an amount ("5,000 USD", "EUR 1,000").
+CURRENCY_CODES = frozenset(('USD', 'INR', 'EUR', 'GBP', 'JPY', 'CNY', 'CAD', 'AUD', 'NZD', 'SGD', 'HKD', 'CHF', 'SEK', 'NOK',
+                            'DKK', 'PLN', 'AED', 'SAR', 'ZAR', 'NGN', 'KES', 'BRL', 'MXN', 'KRW', 'IDR', 'MYR', 'PHP', 'THB',
+                            'VND', 'PKR', 'BDT', 'LKR', 'NPR', 'TRY', 'ILS', 'EGP'))
+CURRENCY_SYMBOLS = {'$': 'USD', '₹': 'INR', '€': 'EUR', '£': 'GBP', '¥': 'JPY', 'rs': 'INR', 'rs.': 'INR', 'inr': 'INR'}
+MULTIPLIERS = {'k': 1_000, 'thousand': 1_000, 'm': 1_000_000, 'mn': 1_000_000, 'million': 1_000_000,
+               'lakh': 100_000, 'lakhs': 100_000, 'lac': 100_000, 'cr': 10_000_000, 'crore': 10_000_000, 'crores': 10_000_000}
+MONTHS = {name: index for index, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+
+PRIZE_RE = re.compile(
+    r'(?P<currency>[$₹€£¥]|\b[A-Z]{3}\b|\b(?i:rs)\.?)?\s*(?P<amount>\d[\d,]*(?:\.\d+)?)'
+    r'\s*(?P<multiplier>(?i:k|thousand|m|mn|million|lakhs?|lac|cr|crores?))?\b(?:\s*(?P<suffix>[A-Z]{3})\b)?'
+)
+COUNT_RE = re.compile(r'\d[\d,]*')
+TIME_LEFT_RE = re.compile(r'(\d+)\s*(minute|min|hour|hr|day|week|month)s?\s+left', re.IGNORECASE)
+STARTS_RE = re.compile(r'\bstarts\s+(\d{1,2})/(\d{1,2})/(\d{2,4})', re.IGNORECASE)
+# "Oct 01 - Nov 15, 2026", "Sep 15, 2025 - Jan 10, 2026", "Jun 01 - 30, 2025"
+DATE_RANGE_RE = re.compile(
+    r'(?P<m1>[A-Za-z]{3})[a-z]*\.?\s+(?P<d1>\d{1,2})(?:,\s*(?P<y1>\d{4}))?\s*[-–]\s*'
+    r'(?:(?P<m2>[A-Za-z]{3})[a-z]*\.?\s+)?(?P<d2>\d{1,2}),\s*(?P<y2>\d{4})'
+)
+TIME_UNITS = {'minute': timedelta(minutes=1), 'min': timedelta(minutes=1), 'hour': timedelta(hours=1), 'hr': timedelta(hours=1),
+              'day': timedelta(days=1), 'week': timedelta(weeks=1), 'month': timedelta(days=30)}
+
+
+def is_placeholder(value):
+    return not value or str(value).startswith('N/A')
+
+
+def _currency(match):
+    for code in (match.group('currency'), match.group('suffix')):
+        if code:
+            currency = CURRENCY_SYMBOLS.get(code.lower(), code.upper())
+            if currency in CURRENCY_CODES:
+                return currency
+    return None
+
+
+def _is_year(match):
+    return not match.group('multiplier') and re.fullmatch(r'(19|20)\d\d', match.group('amount')) is not None
+
+
+def parse_prize(text):
+    """
+    '$50,000' -> (50000, 'USD'); '₹ 1,00,000' -> (100000, 'INR'); placeholders or non-cash prizes -> (None, None).
+
+    The first amount written with a currency wins ('Top 3 win $5,000' -> 5000); without one, the first
+    number that does not look like a year is taken, with no currency.
+    """
+    if is_placeholder(text):
+        return None, None
+    matches = list(PRIZE_RE.finditer(text))
+    match = next((match for match in matches if _currency(match)), None) or \
+        next((match for match in matches if not _is_year(match)), None)
+    if not match:
+        return None, None
+    amount = float(match.group('amount').replace(',', ''))
+    if match.group('multiplier'):
+        amount *= MULTIPLIERS[match.group('multiplier').lower()]
+    return (int(amount) if amount.is_integer() else amount), _currency(match)
+
+
+def parse_count(text):
+    """'1,234' -> 1234; '2,500 Registered' -> 2500; placeholders -> None."""
+    if is_placeholder(text):
+        return None
+    match = COUNT_RE.search(str(text))
+    return int(match.group().replace(',', '')) if match else None
+
+
+def _end_of_day(value):
+    return datetime(value.year, value.month, value.day, 23, 59, 59, tzinfo=timezone.utc)
+
+
+def _date(year, month, day):
+    try:
+        return datetime(year, month, day, tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def parse_dates(texts, now):
+    """
+    Find (starts_at, ends_at) in the given date phrases.
+
+    Relative phrases ("5 days left", "3 hours left") are resolved against
+    `now` and rounded up to the end of that day, so re-scraping the same
+    listing later the same day gives the same value and an open event never
+    ends in the past. The last day of a range ("Oct 01 - Oct 18, 2026")
+    likewise ends at 23:59:59, not at midnight.
+    """
+    starts_at = ends_at = None
+    for text in texts:
+        if is_placeholder(text):
+            continue
+        match = DATE_RANGE_RE.search(text)
+        if match and match.group('m1').lower() in MONTHS:
+            end_month = MONTHS.get((match.group('m2') or match.group('m1')).lower())
+            end_year = int(match.group('y2'))
+            start_year = int(match.group('y1') or end_year)
+            start_month = MONTHS[match.group('m1').lower()]
+            if not match.group('y1') and end_month and start_month > end_month:
+                start_year -= 1 # "Dec 15 - Jan 10, 2026" starts in 2025
+            starts_at = starts_at or _date(start_year, start_month, int(match.group('d1')))
+            if not ends_at and end_month:
+                last_day = _date(end_year, end_month, int(match.group('d2')))
+                ends_at = _end_of_day(last_day) if last_day else None
+            continue
+        match = TIME_LEFT_RE.search(text)
+        if match and not ends_at:
+            ends_at = _end_of_day(now + int(match.group(1)) * TIME_UNITS[match.group(2).lower()])
+            continue
+        match = STARTS_RE.search(text)
+        if match and not starts_at:
+            day, month, year = (int(part) for part in match.groups())
+            starts_at = _date(year + 2000 if year < 100 else year, month, day)
+    return (starts_at.isoformat() if starts_at else None), (ends_at.isoformat() if ends_at else None)
+
+
+def parse_mode(text):
+    """'online', 'in-person' or 'hybrid' from a location/mode label; None if it does not say."""
+    if is_placeholder(text) or 'check status' in text.lower():
+        return None # Devfolio's "Online/Offline (Check Status/Mode)" placeholder
+    text = text.lower()
+    online = 'online' in text
+    in_person = 'offline' in text or 'in-person' in text or 'in person' in text
+    if 'hybrid' in text or (online and in_person):
+        return 'hybrid'
+    return 'online' if online else 'in-person' if in_person else None
+
+
+def event_mode(event):
+    return parse_mode(event.get('location_mode')) or parse_mode(event.get('status_mode'))
+
+
+def normalize_event(event, now=None):
+    """Add the normalised fields to `event` in place (once) and return it."""
+    if 'prize_amount' in event:
+        return event
+    now = now or datetime.now(timezone.utc)
+    event['prize_amount'], event['prize_currency'] = parse_prize(event.get('prize_info'))
+    event['participants'] = parse_count(event.get('participants_count'))
+    event['starts_at'], event['ends_at'] = parse_dates(
+        (event.get('dates'), event.get('status_label'), event.get('status_mode')), now)
+    event['mode'] = event_mode(event)
+    return event
@@ -0,0 +1,257 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from utils.instrumentation import get_logger
+from utils.serialization import dumps, events_from, loads, to_columns
+
+log = get_logger(__name__)
+
+
+class ScrapeCache:
+    """
+    Per-source cache in front of the scraper.
+
+    Each source has its own TTL. Once an entry is older than its TTL it is
+    still served for `stale_ttl` more seconds while a single background
+    refresh runs; concurrent callers share that one in-flight scrape
+    (single-flight) instead of launching their own browsers. After a failed
+    refresh, requests do not start another one for `retry_after` seconds:
+    they get the stale entry if there is one, or the error straight away.
+
+    `combine(events)`, if given, post-processes the events of a multi-source
+    read and returns (events, merged_count); its output is memoised per
+    combination of cached entries. `on_update(source_name, events)` is
+    called whenever a source's entry is replaced, by a refresh or a loaded
+    snapshot.
+    """
+
+    def __init__(self, scrape_source, sources, default_ttl=600, stale_ttl=3600, ttls=None, wait_timeout=300, combine=None, on_update=None,
+                 retry_after=60):
+        self.scrape_source = scrape_source # callable(source_name) -> runscraper()-style result dict
+        self.combine = combine
+        self.on_update = on_update
+        self._combined = OrderedDict()
+        self.sources = list(sources)
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.ttls = dict(ttls or {})
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        self._entries = {}
+        self._errors = {}
+        self._flights = {}
+        self._last_refresh = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, source_name):
+        return self.ttls.get(source_name, self.default_ttl)
+
+    def get(self, sources=None, force_refresh=False, combine=True):
+        sources = sources or self.sources
+        cache_status = self.ensure_fresh(sources, force_refresh)
+        return self._build_payload(sources, cache_status, combine and self.combine is not None)
+
+    def ensure_fresh(self, sources=None, force_refresh=False):
+        """
+        Start refreshes for expired sources and wait (up to `wait_timeout`) for
+        those with nothing servable; returns {source_name: "fresh" | "stale" | "miss" | "failed"}.
+        "failed" means there is nothing cached and the last refresh failed less
+        than `retry_after` seconds ago, so none was attempted.
+        """
+        sources = sources or self.sources
+        now = time.time()
+        cache_status = {}
+        waiting = []
+
+        for source_name in sources:
+            with self._lock:
+                entry = self._entries.get(source_name)
+                error = self._errors.get(source_name)
+            age = now - entry['fetched_at'] if entry else None
+            ttl = self.ttl_for(source_name)
+            backing_off = not force_refresh and error is not None and now - error['at'] < self.retry_after
+
+            if entry and not force_refresh and age < ttl:
+                cache_status[source_name] = "fresh"
+            elif entry and not force_refresh and age < ttl + self.stale_ttl:
+                cache_status[source_name] = "stale"
+                if not backing_off:
+                    self.refresh(source_name)
+            elif backing_off:
+                cache_status[source_name] = "failed"
+            else:
+                cache_status[source_name] = "miss"
+                waiting.append(self.refresh(source_name))
+
+        deadline = time.time() + self.wait_timeout
+        for flight in waiting:
+            flight.wait(max(0, deadline - time.time()))
+        return cache_status
+
+    def refresh(self, source_name):
+        """Start (or join) the single in-flight refresh of a source; returns an Event set when it finishes."""
+        with self._lock:
+            flight = self._flights.get(source_name)
+            if flight:
+                return flight
+            flight = threading.Event()
+            self._flights[source_name] = flight
+
+        threading.Thread(
+            target=self._run_refresh, args=(source_name, flight), name=f"refresh-{source_name}", daemon=True
+        ).start()
+        return flight
+
+    def last_refresh(self, source_name):
+        """Outcome of the most recent finished refresh of a source, or None."""
+        with self._lock:
+            return self._last_refresh.get(source_name)
+
+    def _run_refresh(self, source_name, flight):
+        started = time.time()
+        outcome = {"ok": False, "events": 0}
+        try:
+            log.info("Refreshing cached %s events", source_name, extra={"source": source_name})
+            result = self.scrape_source(source_name)
+            timing = result.get('timings', {}).get('sources', {}).get(source_name, {})
+            with self._lock:
+                if result.get('error') or timing.get('status') != 'ok':
+                    # Keep serving the last good snapshot; only remember why the refresh failed.
+                    self._errors[source_name] = {
+                        "error": result.get('error') or f"Scrape {timing.get('status', 'failed')}",
+                        "details": result.get('details') or timing.get('details'),
+                        "fatal": bool(result.get('error')),
+                        "at": time.time(),
+                    }
+                    outcome["error"] = self._errors[source_name]["error"]
+                else:
+                    events = result.get('events', [])
+                    self._entries[source_name] = {
+                        "events": events,
+                        "fetched_at": time.time(),
+                        "timing": timing,
+                        "digest": _digest(events),
+                    }
+                    self._errors.pop(source_name, None)
+                    outcome.update(ok=True, events=len(events))
+            if outcome["ok"] and self.on_update:
+                self.on_update(source_name, events)
+        except Exception as e:
+            log.exception("Error refreshing %s: %s", source_name, e, extra={"source": source_name})
+            with self._lock:
+                self._errors[source_name] = {"error": "Scrape failed", "details": str(e), "fatal": True, "at": time.time()}
+            outcome["error"] = "Scrape failed"
+        finally:
+            outcome.update(finished=time.time(), seconds=round(time.time() - started, 2))
+            with self._lock:
+                self._last_refresh[source_name] = outcome
+                self._flights.pop(source_name, None)
+            flight.set()
+
+    def save_snapshot(self, path):
+        """
+        Write all cached entries to `path` atomically, so a restarted process
+        can serve them immediately. Each entry's events are stored columnar.
+        """
+        with self._lock:
+            entries = dict(self._entries)
+        snapshot = {"entries": {
+            source_name: dict(entry, events=to_columns(entry['events'])) for source_name, entry in entries.items()
+        }}
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(snapshot))
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path):
+        try:
+            with open(path, 'rb') as f:
+                snapshot = loads(f.read())
+            entries = {
+                source_name: dict(entry, events=events_from(entry['events']))
+                for source_name, entry in snapshot.get("entries", {}).items()
+            }
+        except FileNotFoundError:
+            return 0
+        except (IOError, ValueError, KeyError) as e:
+            log.warning("Ignoring unreadable snapshot %s: %s", path, e)
+            return 0
+        loaded = {}
+        with self._lock:
+            for source_name, entry in entries.items():
+                current = self._entries.get(source_name)
+                if current is None or current['fetched_at'] < entry['fetched_at']:
+                    self._entries[source_name] = loaded[source_name] = entry
+        if self.on_update:
+            for source_name, entry in loaded.items():
+                self.on_update(source_name, entry['events'])
+        return len(entries)
+
+    def _build_payload(self, sources, cache_status, combine=False):
+        now = time.time()
+        events = []
+        source_meta = {}
+        digests = []
+        max_age = None
+
+        with self._lock:
+            for source_name in sources:
+                entry = self._entries.get(source_name)
+                meta = {"cache": cache_status[source_name]}
+                if entry:
+                    age = now - entry['fetched_at']
+                    events.extend(entry['events'])
+                    digests.append(f"{source_name}:{entry['digest']}")
+                    meta.update(entry['timing'])
+                    meta['age_seconds'] = round(age, 1)
+                    remaining = max(0, int(self.ttl_for(source_name) - age))
+                    max_age = remaining if max_age is None else min(max_age, remaining)
+                if source_name in self._errors:
+                    meta['last_error'] = self._errors[source_name]
+                source_meta[source_name] = meta
+
+        merged = None
+        if combine and len(digests) > 1:
+            digests.append("combined")
+            events, merged = self._combine(tuple(digests), events)
+
+        payload = {
+            "message": f"Scraping completed. Found {len(events)} events.",
+            "total_events": len(events),
+            "events": events,
+            "timings": {"sources": source_meta},
+        }
+        if merged is not None:
+            payload["duplicates_merged"] = merged
+        if not digests:
+            with self._lock:
+                errors = [self._errors[s] for s in sources if self._errors.get(s, {}).get('fatal')]
+            if errors:
+                payload["error"] = errors[0]["error"]
+                payload["details"] = errors[0]["details"]
+
+        return {
+            "payload": payload,
+            "etag": hashlib.sha1("|".join(digests).encode('utf-8')).hexdigest() if digests else None,
+            "max_age": max_age or 0,
+            "stale_ttl": self.stale_ttl,
+        }
+
+    def _combine(self, key, events):
+        with self._lock:
+            if key in self._combined:
+                self._combined.move_to_end(key)
+                return self._combined[key]
+        combined = self.combine(events)
+        with self._lock:
+            self._combined[key] = combined
+            while len(self._combined) > 8:
+                self._combined.popitem(last=False)
+        return combined
+
+
+def _digest(events):
+    return hashlib.sha1(dumps(events, sort_keys=True)).hexdigest()
@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+
+from utils.instrumentation import get_logger
+
+log = get_logger(__name__)
+
+
+class SourceScheduler:
+    """
+    Refreshes every source in the background on its own interval.
+
+    `refresh_source(source_name)` runs one refresh and returns an outcome dict
+    with at least `ok` and `events`. Successful runs are rescheduled after the
+    source's interval (plus/minus `jitter`); failures are retried after
+    `retry_base * 2 ** (failures - 1)` seconds, capped at `max_backoff`.
+
+    `costs` weighs each source (lower is cheaper). Cheap sources get the first
+    start slots, and when `max_concurrent` limits how many refreshes run at
+    once, the cheapest due source is let through first.
+    """
+
+    def __init__(self, refresh_source, sources, default_interval=600, intervals=None,
+                 jitter=0.1, retry_base=60, max_backoff=3600, on_success=None, costs=None, max_concurrent=None):
+        self.refresh_source = refresh_source
+        self.costs = dict(costs or {})
+        self.sources = sorted(sources, key=lambda name: self.costs.get(name, 0))
+        self.max_concurrent = max_concurrent
+        self.default_interval = default_interval
+        self.intervals = dict(intervals or {})
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.max_backoff = max_backoff
+        self.on_success = on_success
+        self._status = {name: {"next_run": None, "consecutive_failures": 0} for name in self.sources}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._slots = threading.Condition(self._lock)
+        self._running = 0
+        self._waiting = {} # source name -> time it became due
+
+    def interval_for(self, source_name):
+        return self.intervals.get(source_name, self.default_interval)
+
+    def start(self):
+        with self._start_lock:
+            if self._threads:
+                return
+            for index, source_name in enumerate(self.sources):
+                thread = threading.Thread(
+                    target=self._run, args=(source_name, index), name=f"scheduler-{source_name}", daemon=True
+                )
+                self._threads.append(thread)
+                thread.start()
+
+    def is_running(self):
+        return bool(self._threads) and not self._stop.is_set()
+
+    def stop(self):
+        self._stop.set()
+        with self._slots:
+            self._slots.notify_all()
+
+    def status(self):
+        with self._lock:
+            return {
+                name: dict(entry, interval=self.interval_for(name), running=entry.get('running', False),
+                           cost=self.costs.get(name, 0), waiting=name in self._waiting)
+                for name, entry in self._status.items()
+            }
+
+    def _run(self, source_name, index):
+        # Stagger the first runs, cheapest first, so all browsers do not start at the same instant.
+        self._set(source_name, next_run=time.time() + index + random.uniform(0, 1))
+        while not self._stop.is_set():
+            with self._lock:
+                delay = self._status[source_name]['next_run'] - time.time()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            if not self._acquire_slot(source_name):
+                break
+
+            self._set(source_name, running=True, last_started=time.time())
+            try:
+                outcome = self.refresh_source(source_name) or {"ok": False, "error": "No result"}
+            except Exception as e:
+                outcome = {"ok": False, "error": str(e)}
+            finally:
+                self._release_slot()
+            self._finish(source_name, outcome)
+
+    def _acquire_slot(self, source_name):
+        """Wait until a refresh slot is free and no cheaper (or equally cheap, longer-due) source is waiting."""
+        with self._slots:
+            self._waiting[source_name] = time.time()
+            try:
+                while not self._stop.is_set():
+                    if self.max_concurrent is None or self._running < self.max_concurrent:
+                        first = min(self._waiting, key=lambda name: (self.costs.get(name, 0), self._waiting[name]))
+                        if first == source_name:
+                            self._running += 1
+                            return True
+                    self._slots.wait(1.0)
+                return False
+            finally:
+                del self._waiting[source_name]
+                self._slots.notify_all()
+
+    def _release_slot(self):
+        with self._slots:
+            self._running -= 1
+            self._slots.notify_all()
+
+    def _finish(self, source_name, outcome):
+        now = time.time()
+        with self._lock:
+            entry = self._status[source_name]
+            entry['running'] = False
+            entry['last_duration'] = round(now - entry['last_started'], 2)
+            if outcome.get('ok'):
+                entry.update(last_success=now, event_count=outcome.get('events', 0), consecutive_failures=0, last_error=None)
+                delay = self.interval_for(source_name)
+                delay *= 1 + random.uniform(-self.jitter, self.jitter)
+            else:
+                entry['consecutive_failures'] += 1
+                entry.update(last_failure=now, last_error=outcome.get('error'))
+                delay = min(self.retry_base * 2 ** (entry['consecutive_failures'] - 1), self.max_backoff)
+                delay *= 1 + random.uniform(0, self.jitter)
+            entry['next_run'] = now + delay
+
+        if outcome.get('ok'):
+            log.info("Scheduled refresh of %s succeeded; next run in %.0fs.", source_name, delay, extra={"source": source_name})
+            if self.on_success:
+                try:
+                    self.on_success(source_name)
+                except Exception as e:
+                    log.exception("Post-refresh hook failed for %s: %s", source_name, e, extra={"source": source_name})
+        else:
+            log.warning("Scheduled refresh of %s failed (%s); retrying in %.0fs.", source_name, outcome.get('error'),
+                        delay, extra={"source": source_name})
+
+    def _set(self, source_name, **values):
+        with self._lock:
+            self._status[source_name].update(values)
@@ -0,0 +1,95 @@
+import time
+
+# Records the time of the last DOM mutation so Python can tell when the page has gone quiet.
+_INSTALL_OBSERVER_JS = """
+if (!window.__scraperObserver) {
+    window.__scraperLastMutation = Date.now();
+    window.__scraperObserver = new MutationObserver(function () { window.__scraperLastMutation = Date.now(); });
+    window.__scraperObserver.observe(document.body, {childList: true, subtree: true});
+}
+"""
+
+_SCROLL_JS = """
+window.scrollTo(0, document.body.scrollHeight);
+var selector = arguments[0];
+if (selector) {
+    var button = document.querySelector(selector);
+    if (button && button.offsetParent !== null && !button.disabled) { button.click(); return true; }
+}
+return false;
+"""
+
+_PROBE_JS = """
+return [
+    document.querySelectorAll(arguments[0]).length,
+    Date.now() - (window.__scraperLastMutation || 0),
+    performance.getEntriesByType('resource').length
+];
+"""
+
+
+def scroll_until_settled(driver, card_selector, load_more_selector=None, max_rounds=8,
+                         quiet_window=1.5, settle_window=0.3, poll_interval=0.15, max_seconds=60, stop_when=None):
+    """
+    Scroll an infinite-scroll listing until it stops producing cards.
+
+    Each round scrolls to the bottom (clicking `load_more_selector` if it is
+    visible) and then polls the card count, the last DOM mutation and the
+    number of network resources. As soon as new cards appear and the DOM has
+    been quiet for `settle_window`, the next round starts. If no new cards
+    appear and both DOM and network stay quiet for `quiet_window`, scrolling
+    stops. `stop_when(driver)` is checked after every round that produced
+    cards and ends scrolling early when it returns True. Returns metrics:
+    cards reached, rounds, load-more clicks, seconds, whether stop_when fired.
+    """
+    started = time.time()
+    deadline = started + max_seconds
+    driver.execute_script(_INSTALL_OBSERVER_JS)
+    cards, _, resources = driver.execute_script(_PROBE_JS, card_selector)
+    rounds = 0
+    clicks = 0
+    stopped_early = False
+
+    while rounds < max_rounds and time.time() < deadline:
+        rounds += 1
+        if driver.execute_script(_SCROLL_JS, load_more_selector):
+            clicks += 1
+
+        previous_cards = cards
+        last_network = time.time()
+        while time.time() < deadline:
+            time.sleep(poll_interval)
+            cards, idle_ms, new_resources = driver.execute_script(_PROBE_JS, card_selector)
+            now = time.time()
+            if new_resources != resources:
+                resources = new_resources
+                last_network = now
+            if cards > previous_cards:
+                if idle_ms >= settle_window * 1000:
+                    break
+                continue
+            last_activity = max(now - idle_ms / 1000.0, last_network)
+            if now - last_activity >= quiet_window:
+                break
+
+        if cards <= previous_cards:
+            break
+        if stop_when and stop_when(driver):
+            stopped_early = True
+            break
+
+    return {
+        "cards": cards, "rounds": rounds, "load_more_clicks": clicks,
+        "seconds": round(time.time() - started, 2), "stopped_early": stopped_early,
+    }
+
+
+_CARD_ATTRIBUTES_JS = """
+var attribute = arguments[1];
+return Array.from(document.querySelectorAll(arguments[0]), function (el) { return el.getAttribute(attribute) || ''; });
+"""
+
+
+def card_attributes(driver, selector, attribute):
+    """Read one attribute from every card currently in the DOM, without transferring page_source."""
+    return driver.execute_script(_CARD_ATTRIBUTES_JS, selector, attribute)
@@ -0,0 +1,141 @@
+"""
+Wire and file formats for events.
+
+`dumps` / `loads` use orjson when it is installed (several times faster than
+the standard library on large event lists) and fall back to `json` with the
+same compact, UTF-8 output otherwise. EventRecords serialise as plain objects
+either way. `packb` emits MessagePack when `msgpack` is installed, and
+`compress` applies gzip or, if the `brotli` package is available, br.
+
+Event lists written to disk (the cache snapshot and the direct-run output
+file) use a columnar layout: one array per field instead of one object per
+event, with the low-cardinality labels dictionary-encoded, so field names
+and repeated values are stored once per file rather than once per event:
+
+    {"format": "columnar", "version": 1, "count": 2,
+     "columns": {"title": ["A", "B"], "source": {"values": ["Devpost"], "codes": [0, 0]}, ...}}
+"""
+import gzip
+import json
+import os
+
+from utils.event_record import FIELDS, INTERNED_FIELDS, EventRecord, as_record
+from utils.normalize import normalize_event
+
+try:
+    import orjson
+except ImportError: # optional: pip install orjson
+    orjson = None
+
+try:
+    import msgpack
+except ImportError: # optional: pip install msgpack
+    msgpack = None
+
+try:
+    import brotli
+except ImportError: # optional: pip install brotli
+    brotli = None
+
+COLUMNAR_FORMAT = "columnar"
+COLUMNAR_VERSION = 1
+GZIP_LEVEL = 5 # responses are compressed per request; level 5 keeps most of the ratio at a fraction of level 9's cost
+BROTLI_QUALITY = 5
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+
+def _default(value):
+    if isinstance(value, EventRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value, sort_keys=False):
+    """Compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(value, default=_default, sort_keys=sort_keys, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def packb(value):
+    """MessagePack bytes; raises RuntimeError when msgpack is not installed."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(value, default=_default, use_bin_type=True)
+
+
+def compress(body, encoding):
+    """`body` encoded with one of ENCODINGS."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported content encoding {encoding!r}")
+
+
+def to_columns(events):
+    """Columnar form of a list of events (records or dicts)."""
+    names = list(FIELDS)
+    seen = set(names)
+    for event in events:
+        for name in event.keys():
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+    columns = {}
+    for name in names:
+        values = [event.get(name) for event in events]
+        if all(value is None for value in values):
+            continue
+        if name in INTERNED_FIELDS:
+            dictionary = {}
+            codes = [None if value is None else dictionary.setdefault(value, len(dictionary)) for value in values]
+            columns[name] = {"values": list(dictionary), "codes": codes}
+        else:
+            columns[name] = values
+    return {"format": COLUMNAR_FORMAT, "version": COLUMNAR_VERSION, "count": len(events), "columns": columns}
+
+
+def from_columns(snapshot):
+    """EventRecords back from `to_columns` output."""
+    count = snapshot["count"]
+    columns = []
+    for name, column in snapshot["columns"].items():
+        if isinstance(column, dict):
+            values = column["values"]
+            column = [None if code is None else values[code] for code in column["codes"]]
+        if len(column) != count:
+            raise ValueError(f"Column {name!r} has {len(column)} values, expected {count}")
+        columns.append((name, column))
+    return [EventRecord(**{name: column[row] for name, column in columns if column[row] is not None})
+            for row in range(count)]
+
+
+def is_columnar(value):
+    return isinstance(value, dict) and value.get("format") == COLUMNAR_FORMAT
+
+
+def events_from(value):
+    """Events from either a columnar block or a plain list of event objects (older files)."""
+    if is_columnar(value):
+        if value.get("version") != COLUMNAR_VERSION:
+            raise ValueError(f"Unsupported columnar version {value.get('version')!r}")
+        return from_columns(value)
+    return [as_record(normalize_event(event)) for event in value]
+
+
+def write_events(path, events):
+    """Write `events` to `path` in the columnar format, atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(to_columns(events)))
+    os.replace(tmp_path, path)
+
+
+def read_events(path):
+    with open(path, 'rb') as f:
+        return events_from(loads(f.read()))
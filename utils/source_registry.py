@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """
+    Everything the orchestrator needs to scrape one listing site.
+
+    The browser path is navigate → wait → scroll → parse: open
+    `base_url + listing_path`, wait for `ready_selectors` and then
+    `wait_selector`, scroll with `scroll_until_settled` until `card_selector`
+    stops growing (clicking `load_more_selector` if set), and hand the page
+    source to the parser for the active backend in `extractors`.
+    `direct_fetch(fetcher, base_url)`, when set, is tried first and the browser
+    is only the fallback. `browser_extractor`, a (script, build) pair, reads
+    the cards inside the page instead of shipping page_source (see
+    browser_extractors.py); the parser stays the fallback.
+    `detail_parser(html)`, when set, reads placeholder fields from an
+    event's own page (see utils.enrichment).
+
+    `browser_cost` and `http_cost` are relative weights (roughly seconds of
+    work per refresh) used to run cheap sources first.
+    """
+
+    name: str
+    base_url: str
+    listing_path: str
+    wait_selector: str
+    card_selector: str
+    extractors: dict # parser backend name -> callable(html_content, base_url, on_event) -> events
+    browser_extractor: tuple | None = None # (script returning a JSON string, build(rows, base_url, on_event) -> events)
+    wait_for_visible: bool = True # False only waits for the cards to be present in the DOM
+    ready_selectors: tuple = ()
+    load_more_selector: str | None = None
+    max_scroll_rounds: int = 8
+    # Incremental scraping: read `known_card_attribute` from `known_card_selector`
+    # and map it to an event key with `card_key(value, base_url)`.
+    known_card_selector: str | None = None
+    known_card_attribute: str | None = None
+    card_key: Callable | None = None
+    blocked_markers: tuple = () # page-source or title substrings that mean a bot challenge was served
+    direct_fetch: Callable | None = None
+    detail_parser: Callable | None = None
+    browser_cost: float = 10
+    http_cost: float = 1
+    timeout: float | None = None # per-source deadline; None uses the orchestrator default
+    enabled: bool = True
+
+    def cost(self, use_direct=True):
+        return self.http_cost if use_direct and self.direct_fetch else self.browser_cost
+
+
+class SourceRegistry:
+    """Ordered collection of source specs, keyed by name."""
+
+    def __init__(self):
+        self._specs = {}
+
+    def register(self, spec):
+        if spec.name in self._specs:
+            raise ValueError(f"Source {spec.name!r} is already registered")
+        self._specs[spec.name] = spec
+        return spec
+
+    def get(self, name):
+        return self._specs[name]
+
+    def names(self):
+        return tuple(name for name, spec in self._specs.items() if spec.enabled)
+
+    def select(self, names=None):
+        """Enabled specs in registration order, optionally limited to `names` (case-insensitive)."""
+        wanted = {name.lower() for name in names} if names else None
+        return [spec for spec in self._specs.values() if spec.enabled and (wanted is None or spec.name.lower() in wanted)]
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(self.select())
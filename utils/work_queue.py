@@ -0,0 +1,284 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from utils.instrumentation import get_logger
+from utils.serialization import dumps, events_from, loads, to_columns
+
+log = get_logger(__name__)
+
+STATUSES = ("queued", "leased", "done", "failed")
+
+
+class SQLiteWorkQueue:
+    """
+    Scrape tasks shared between the API and `python -m worker` processes on one box.
+
+    One task scrapes one source. Workers lease a task for `lease_seconds` and
+    must heartbeat before the lease runs out; a lease that expires (the
+    worker crashed, hung or was killed) puts the task back in the queue after
+    `retry_base * 2 ** (attempts - 1)` seconds, capped at `max_backoff`,
+    until it has been tried `max_attempts` times. Only the worker holding the
+    lease can write the result back.
+
+    `lease` honours per-source concurrency caps, so however many workers
+    share the queue, at most `caps[source]` (or `default_cap`) scrapes of one
+    site run at once. Queued tasks are leased lowest `priority` first, then
+    oldest first. Enqueueing a source that already has a queued or leased
+    task returns that task instead of adding another.
+    """
+
+    def __init__(self, path="work_queue.db", max_attempts=3, retry_base=30, max_backoff=600, result_ttl=3600):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.max_backoff = max_backoff
+        self.result_ttl = result_ttl
+        self._lock = threading.Lock()
+        # Autocommit mode: every write below opens its own BEGIN IMMEDIATE so leases are atomic across processes.
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " id TEXT PRIMARY KEY, source TEXT NOT NULL, status TEXT NOT NULL, priority REAL NOT NULL,"
+                " attempts INTEGER NOT NULL, max_attempts INTEGER NOT NULL, available_at REAL NOT NULL,"
+                " lease_owner TEXT, lease_expires REAL, created REAL NOT NULL, started REAL, finished REAL,"
+                " result TEXT, error TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status_available ON tasks (status, available_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_source_status ON tasks (source, status, finished)")
+
+    def _transaction(self):
+        return _Transaction(self._conn, self._lock)
+
+    def enqueue(self, source, priority=0):
+        """Return (task_id, coalesced)."""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM tasks WHERE source = ? AND status IN ('queued', 'leased') ORDER BY created LIMIT 1",
+                (source,),
+            ).fetchone()
+            if row:
+                return row[0], True
+            task_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO tasks (id, source, status, priority, attempts, max_attempts, available_at, created)"
+                " VALUES (?, ?, 'queued', ?, 0, ?, ?, ?)",
+                (task_id, source, priority, self.max_attempts, now, now),
+            )
+            conn.execute("DELETE FROM tasks WHERE status IN ('done', 'failed') AND finished < ?", (now - self.result_ttl,))
+        return task_id, False
+
+    def lease(self, worker_id, lease_seconds=60, caps=None, default_cap=1, sources=None):
+        """
+        Claim the next runnable task for `worker_id`, or None. A task is runnable once
+        its retry delay has passed and its source is below its concurrency cap.
+        """
+        now = time.time()
+        caps = caps or {}
+        with self._transaction() as conn:
+            self._reclaim_expired(conn, now)
+            running = dict(conn.execute("SELECT source, COUNT(*) FROM tasks WHERE status = 'leased' GROUP BY source"))
+            candidates = conn.execute(
+                "SELECT id, source FROM tasks WHERE status = 'queued' AND available_at <= ? ORDER BY priority, created",
+                (now,),
+            ).fetchall()
+            for task_id, source in candidates:
+                if sources is not None and source not in sources:
+                    continue
+                if running.get(source, 0) >= caps.get(source, default_cap):
+                    continue
+                conn.execute(
+                    "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1,"
+                    " started = ? WHERE id = ?",
+                    (worker_id, now + lease_seconds, now, task_id),
+                )
+                return self._describe(conn, task_id)
+        return None
+
+    def heartbeat(self, task_id, worker_id, lease_seconds=60):
+        """Extend the lease; False when `worker_id` no longer holds it."""
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + lease_seconds, task_id, worker_id),
+            ).rowcount
+        return updated == 1
+
+    def complete(self, task_id, worker_id, result):
+        """Store a runscraper()-style result (events columnar) and mark the task done; False if the lease was lost."""
+        result = dict(result, events=to_columns(result.get('events', [])))
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET status = 'done', finished = ?, result = ?, error = NULL, lease_owner = NULL,"
+                " lease_expires = NULL WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), dumps(result).decode('utf-8'), task_id, worker_id),
+            ).rowcount
+        return updated == 1
+
+    def fail(self, task_id, worker_id, error):
+        """Give up this attempt: requeue with backoff, or mark failed once attempts run out."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM tasks WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (task_id, worker_id),
+            ).fetchone()
+            if row is None:
+                return False
+            self._retry_or_fail(conn, task_id, row[0], row[1], error, time.time())
+        return True
+
+    def get(self, task_id):
+        """The task with its decoded result, or None."""
+        with self._lock:
+            return self._describe(self._conn, task_id)
+
+    def stats(self):
+        with self._lock:
+            counts = dict.fromkeys(STATUSES, 0)
+            counts.update(self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+            return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _reclaim_expired(self, conn, now):
+        expired = conn.execute(
+            "SELECT id, source, lease_owner, attempts, max_attempts FROM tasks WHERE status = 'leased' AND lease_expires < ?",
+            (now,),
+        ).fetchall()
+        for task_id, source, owner, attempts, max_attempts in expired:
+            log.warning("Lease on %s task %s held by %s expired; requeueing.", source, task_id, owner, extra={"source": source})
+            self._retry_or_fail(conn, task_id, attempts, max_attempts, f"Lease expired (worker {owner} lost)", now)
+
+    def _retry_or_fail(self, conn, task_id, attempts, max_attempts, error, now):
+        if attempts >= max_attempts:
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', finished = ?, error = ?, lease_owner = NULL, lease_expires = NULL"
+                " WHERE id = ?",
+                (now, error, task_id),
+            )
+        else:
+            delay = min(self.retry_base * 2 ** (attempts - 1), self.max_backoff)
+            conn.execute(
+                "UPDATE tasks SET status = 'queued', available_at = ?, error = ?, lease_owner = NULL, lease_expires = NULL"
+                " WHERE id = ?",
+                (now + delay, error, task_id),
+            )
+
+    def _describe(self, conn, task_id):
+        row = conn.execute(
+            "SELECT id, source, status, attempts, max_attempts, lease_owner, lease_expires, created, started, finished,"
+            " result, error FROM tasks WHERE id = ?",
+            (task_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        task = dict(zip(("id", "source", "status", "attempts", "max_attempts", "lease_owner", "lease_expires",
+                         "created", "started", "finished", "result", "error"), row))
+        if task["result"] is not None:
+            result = loads(task["result"])
+            task["result"] = dict(result, events=events_from(result["events"]))
+        return task
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT under the in-process lock; rolls back if the block raises."""
+
+    def __init__(self, conn, lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class QueuedScraper:
+    """
+    runscraper()-compatible front for the API when scraping runs in workers:
+    enqueues one task per source and polls the queue until each has a
+    result. Events are handed to `on_event` per source as its task lands,
+    not one by one as they are parsed. With no `sources` it queues every
+    name in `source_names`, as runscraper() runs every registered source.
+    """
+
+    def __init__(self, work_queue, source_names=(), priorities=None, timeout=600, poll_interval=0.5):
+        self.queue = work_queue
+        self.source_names = list(source_names)
+        self.priorities = dict(priorities or {})
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def runscraper(self, sources, on_event=None, on_source_done=None, cancel=None, max_workers=None):
+        # max_workers is accepted for runscraper() compatibility; concurrency is set by the workers and their caps.
+        started = time.time()
+        pending = {}
+        for source in sources or self.source_names:
+            task_id, coalesced = self.queue.enqueue(source, self.priorities.get(source, 0))
+            log.debug("Queued %s as task %s%s", source, task_id, " (coalesced)" if coalesced else "", extra={"source": source})
+            pending[task_id] = source
+
+        events, source_timings = [], {}
+        deadline = started + self.timeout
+        while pending:
+            for task_id, source in list(pending.items()):
+                task = self.queue.get(task_id)
+                if task is None or task["status"] not in ("done", "failed"):
+                    continue
+                del pending[task_id]
+                result = task["result"] or {}
+                timing = result.get('timings', {}).get('sources', {}).get(source)
+                if task["status"] == "failed" or result.get('error') or timing is None:
+                    timing = {"status": "error", "events": 0, "seconds": round(time.time() - started, 2),
+                              "details": task["error"] or result.get('details') or result.get('error')}
+                timing = dict(timing, task_id=task_id, attempts=task["attempts"])
+                source_timings[source] = timing
+                source_events = result.get('events', [])
+                if on_event:
+                    for event in source_events:
+                        on_event(event)
+                else:
+                    events.extend(source_events)
+                if on_source_done:
+                    on_source_done(source, timing)
+            if pending and cancel is not None and cancel.is_set():
+                break # the tasks stay queued; a later request for the same sources coalesces with them
+            if pending and time.time() >= deadline:
+                for task_id, source in pending.items():
+                    source_timings[source] = {"status": "timeout", "events": 0, "seconds": round(time.time() - started, 2),
+                                              "task_id": task_id, "details": "No worker finished the task in time"}
+                    if on_source_done:
+                        on_source_done(source, source_timings[source])
+                break
+            if pending:
+                time.sleep(self.poll_interval)
+
+        total_events = sum(timing['events'] for timing in source_timings.values())
+        return {
+            "message": f"Scraping completed. Found {total_events} events.",
+            "total_events": total_events,
+            "events": events,
+            "timings": {"sources": source_timings, "total_seconds": round(time.time() - started, 2)},
+        }
@@ -0,0 +1,135 @@
+"""
+Scrape worker: leases source tasks from the shared work queue, runs them with
+master_scraper.runscraper() and writes the results back.
+
+    python -m worker --workers 3 --queue work_queue.db --cap Devfolio=1 --cap Devpost=2
+
+Each worker is its own process with its own WebDriver pool, so browsers scale
+with --workers (and with more boxes pointed at the same queue file). The API
+enqueues into the same file when started with SCRAPER_WORK_QUEUE set.
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+
+from utils.instrumentation import configure_logging, get_logger
+from utils.work_queue import SQLiteWorkQueue, worker_id
+
+log = get_logger(__name__)
+
+LEASE_SECONDS = int(os.environ.get("SCRAPER_WORKER_LEASE", 60))
+POLL_INTERVAL = float(os.environ.get("SCRAPER_WORKER_POLL", 1.0))
+DEFAULT_CAP = int(os.environ.get("SCRAPER_WORKER_SOURCE_CONCURRENCY", 1))
+
+
+def source_caps(names, overrides=()):
+    """Per-source concurrency caps from SCRAPER_WORKER_SOURCE_CONCURRENCY_<SOURCE>, then `overrides` ("Name=N")."""
+    caps = {
+        name: int(os.environ[f"SCRAPER_WORKER_SOURCE_CONCURRENCY_{name.upper()}"])
+        for name in names
+        if f"SCRAPER_WORKER_SOURCE_CONCURRENCY_{name.upper()}" in os.environ
+    }
+    by_lower = {name.lower(): name for name in names}
+    for override in overrides:
+        name, _, value = override.partition('=')
+        if name.strip().lower() not in by_lower:
+            raise ValueError(f"Unknown source {name.strip()!r} in cap {override!r}")
+        caps[by_lower[name.strip().lower()]] = int(value)
+    return caps
+
+
+def run_task(work_queue, task, owner, runscraper):
+    """Run one leased task while a background thread keeps its lease alive."""
+    source = task['source']
+    done = threading.Event()
+    lost = threading.Event()
+
+    def keep_alive():
+        while not done.wait(LEASE_SECONDS / 3):
+            if not work_queue.heartbeat(task['id'], owner, LEASE_SECONDS):
+                log.warning("Lost the lease on %s task %s; its result will be discarded.", source, task['id'],
+                            extra={"source": source})
+                lost.set()
+                return
+
+    heartbeat = threading.Thread(target=keep_alive, name=f"heartbeat-{task['id'][:8]}", daemon=True)
+    heartbeat.start()
+    log.info("Running %s task %s (attempt %d/%d)", source, task['id'], task['attempts'], task['max_attempts'],
+             extra={"source": source})
+    try:
+        result = runscraper(sources=[source])
+    except Exception as e:
+        log.exception("%s task %s failed: %s", source, task['id'], e, extra={"source": source})
+        work_queue.fail(task['id'], owner, str(e))
+        return
+    finally:
+        done.set()
+        heartbeat.join()
+    if not lost.is_set() and not work_queue.complete(task['id'], owner, result):
+        log.warning("%s task %s was reassigned before it finished; result discarded.", source, task['id'],
+                    extra={"source": source})
+
+
+def work(queue_path, caps, sources=None, stop=None):
+    """Lease and run tasks until `stop` is set (or the process is asked to terminate)."""
+    import master_scraper # imported here so each worker process builds its own driver pool
+
+    configure_logging()
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+    work_queue = SQLiteWorkQueue(queue_path)
+    owner = worker_id()
+    log.info("Worker %s polling %s", owner, queue_path)
+    try:
+        while not stop.is_set():
+            task = work_queue.lease(owner, LEASE_SECONDS, caps, DEFAULT_CAP, sources)
+            if task is None:
+                stop.wait(POLL_INTERVAL)
+                continue
+            run_task(work_queue, task, owner, master_scraper.runscraper)
+    finally:
+        work_queue.close()
+        master_scraper.DRIVER_POOL.shutdown()
+        log.info("Worker %s stopped", owner)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--queue', default=os.environ.get("SCRAPER_WORK_QUEUE", "work_queue.db"), help="Work queue file")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get("SCRAPER_WORKERS", 1)), help="Worker processes on this box")
+    parser.add_argument('--cap', action='append', default=[], metavar='SOURCE=N',
+                        help=f"Most tasks of one source running at once across all workers (default {DEFAULT_CAP})")
+    parser.add_argument('--sources', help="Comma-separated sources this box takes tasks for (default: all)")
+    args = parser.parse_args()
+
+    from sources import REGISTRY
+    names = REGISTRY.names()
+    caps = source_caps(names, args.cap)
+    sources = None
+    if args.sources:
+        wanted = {name.strip().lower() for name in args.sources.split(',')}
+        sources = [name for name in names if name.lower() in wanted]
+
+    if args.workers <= 1:
+        work(args.queue, caps, sources)
+        return
+    processes = [
+        multiprocessing.Process(target=work, args=(args.queue, caps, sources), name=f"worker-{index}")
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    # SIGINT reaches the whole process group; SIGTERM is forwarded so each worker finishes its current task.
+    signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()